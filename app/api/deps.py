@@ -1,10 +1,121 @@
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
 from app.services.ai_extractor import AIExtractor
+from app.services.http_pool import close_http_pool
+from app.services.job_queue import JobQueue
+from app.services.job_worker import JobProcessor, JobWorkerPool
 from app.services.validator import DocumentValidator
+from app.utils.exceptions import AIExtractorError
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.profiling import ProfileStore, admin_token_matches
+
+logger = get_logger(__name__)
+
+_ai_extractor: Optional[AIExtractor] = None
+_document_validator: Optional[DocumentValidator] = None
+_job_queue: Optional[JobQueue] = None
+_job_workers: Optional[JobWorkerPool] = None
+_profile_store: Optional[ProfileStore] = None
+
+
+async def init_services() -> None:
+    global _ai_extractor, _document_validator, _job_queue
+
+    _document_validator = DocumentValidator()
+    if settings.vessel_registry_reload_enabled:
+        await _document_validator.registry.start(settings.vessel_registry_poll_seconds)
+    try:
+        _ai_extractor = AIExtractor()
+    except AIExtractorError as e:
+        logger.error(f"AI extractor unavailable at startup: {str(e)}")
+    if _ai_extractor is not None and _ai_extractor.http_pool is not None and settings.ai_http_prewarm_connections > 0:
+        await _ai_extractor.http_pool.prewarm(str(_ai_extractor.client.base_url), settings.ai_http_prewarm_connections)
+    if settings.jobs_enabled:
+        _job_queue = JobQueue(
+            settings.jobs_file,
+            lease_seconds=settings.job_lease_seconds,
+            max_attempts=settings.job_max_attempts,
+        )
+    logger.info("Services initialized")
+
+
+async def start_job_workers(process: JobProcessor) -> None:
+    global _job_workers
+
+    if _job_queue is None or settings.job_workers <= 0:
+        return
+    _job_workers = JobWorkerPool(
+        _job_queue,
+        process,
+        concurrency=settings.job_workers,
+        poll_seconds=settings.job_poll_seconds,
+        retry_backoff_seconds=settings.job_retry_backoff_seconds,
+        retry_backoff_max_seconds=settings.job_retry_backoff_max_seconds,
+    )
+    await _job_workers.start()
+
+
+async def shutdown_services() -> None:
+    global _ai_extractor, _document_validator, _job_queue, _job_workers
+
+    if _job_workers is not None:
+        await _job_workers.stop()
+    if _job_queue is not None:
+        _job_queue.close()
+    if _ai_extractor is not None:
+        await _ai_extractor.aclose()
+    await close_http_pool()
+    if _document_validator is not None:
+        await _document_validator.registry.stop()
+    _ai_extractor = None
+    _document_validator = None
+    _job_queue = None
+    _job_workers = None
+    logger.info("Services shut down")
+
+
+async def get_ai_extractor() -> AIExtractor:
+    global _ai_extractor
+
+    if _ai_extractor is None:
+        try:
+            _ai_extractor = AIExtractor()
+        except AIExtractorError as e:
+            raise HTTPException(status_code=503, detail=f"AI service failed: {str(e)}")
+    return _ai_extractor
+
+
+async def get_document_validator() -> DocumentValidator:
+    global _document_validator
+
+    if _document_validator is None:
+        _document_validator = DocumentValidator()
+    return _document_validator
+
+
+async def get_job_queue() -> JobQueue:
+    if _job_queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not enabled")
+    return _job_queue
+
+
+def get_job_workers() -> Optional[JobWorkerPool]:
+    return _job_workers
+
 
+def get_profile_store() -> ProfileStore:
+    global _profile_store
 
-def get_ai_extractor() -> AIExtractor:
-    return AIExtractor()
+    if _profile_store is None:
+        _profile_store = ProfileStore(settings.profiles_dir, max_profiles=settings.profiling_max_profiles)
+    return _profile_store
 
 
-def get_document_validator() -> DocumentValidator:
-    return DocumentValidator()
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Admin API is not enabled")
+    if not admin_token_matches(settings.admin_token, x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import validation
+from app.api.v1.endpoints import validation, jobs, stats, admin
 
 api_router = APIRouter()
 api_router.include_router(validation.router, tags=["validation"])
+api_router.include_router(jobs.router, tags=["jobs"])
+api_router.include_router(stats.router, tags=["stats"])
+api_router.include_router(admin.router, tags=["admin"])
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse
+
+from app.core.profiling import ProfileStore
+from app.api.deps import get_profile_store, require_admin
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles(
+    store: ProfileStore = Depends(get_profile_store)
+) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(store.list)
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    store: ProfileStore = Depends(get_profile_store)
+) -> Dict[str, Any]:
+    summary = await asyncio.to_thread(store.get, profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return summary
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(
+    profile_id: str,
+    store: ProfileStore = Depends(get_profile_store)
+):
+    path = store.stats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+
+from app.models.schemas import DocumentRequest, JobResponse
+from app.services.ai_extractor import ExtractionContext
+from app.services.job_queue import JobQueue
+from app.api.deps import get_ai_extractor, get_document_validator, get_job_queue
+from app.api.v1.endpoints.validation import process_document, bypass_cache
+from app.utils.exceptions import JobProcessingError
+from app.core.logging import get_logger
+from app.core.metrics import IN_FLIGHT
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+async def run_job(document_text: str, use_cache: bool) -> Dict[str, Any]:
+    try:
+        with IN_FLIGHT.track("job"):
+            ai_extractor = await get_ai_extractor()
+            validator = await get_document_validator()
+            result = await process_document(
+                document_text, ai_extractor, validator, ExtractionContext(use_cache=use_cache)
+            )
+    except HTTPException as e:
+        retry_after = (e.headers or {}).get("Retry-After")
+        raise JobProcessingError(e.status_code, str(e.detail), float(retry_after) if retry_after else None)
+    return result.model_dump(mode="json")
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: DocumentRequest,
+    response: Response,
+    job_queue: JobQueue = Depends(get_job_queue),
+    x_cache_bypass: Optional[str] = Header(None)
+):
+    job_id = await asyncio.to_thread(
+        job_queue.enqueue, request.document_text, not bypass_cache(x_cache_bypass)
+    )
+    logger.info(f"Queued job {job_id}")
+    
+    response.headers["Location"] = f"/api/v1/jobs/{job_id}"
+    return _job_response(await asyncio.to_thread(job_queue.get, job_id))
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_response(job)
+
+
+def _job_response(job: Dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        id=job["id"],
+        status=job["status"],
+        attempts=job["attempts"],
+        created_at=datetime.fromtimestamp(job["created_at"], tz=timezone.utc),
+        updated_at=datetime.fromtimestamp(job["updated_at"], tz=timezone.utc),
+        result=job["result"],
+        error=job["error"]
+    )
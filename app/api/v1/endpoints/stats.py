@@ -0,0 +1,19 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.services.ai_extractor import AIExtractor
+from app.api.deps import get_ai_extractor, get_job_workers
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats(
+    ai_extractor: AIExtractor = Depends(get_ai_extractor)
+) -> Dict[str, Any]:
+    workers = get_job_workers()
+    return {
+        **ai_extractor.stats(),
+        "jobs": workers.stats() if workers is not None else None,
+    }
@@ -1,53 +1,334 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+import math
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
-from app.models.schemas import DocumentRequest, ValidationResponse, ExtractedData
-from app.services.ai_extractor import AIExtractor
-from app.services.validator import DocumentValidator
+from app.models.schemas import (
+    DocumentRequest,
+    ValidationResponse,
+    ExtractedData,
+    ValidationResult,
+    BatchValidationRequest,
+    BatchValidationResponse,
+    BatchItemResult,
+    BatchItemError,
+)
+from app.services.ai_extractor import AIExtractor, ExtractionContext
+from app.services.validator import RULE_FIELDS, DocumentValidator
 from app.api.deps import get_ai_extractor, get_document_validator
-from app.utils.exceptions import AIExtractorError
+from app.utils.exceptions import AIExtractorError, CircuitOpenError, UpstreamRateLimitError
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import IN_FLIGHT, OUTCOMES, RULE_RESULTS, STAGE_SECONDS
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
+TRUTHY_HEADER_VALUES = {"1", "true", "yes", "on"}
+
+SCHEMA_STAGE = STAGE_SECONDS.labels("schema")
+VALIDATE_STAGE = STAGE_SECONDS.labels("validate")
+SERIALIZE_STAGE = STAGE_SECONDS.labels("serialize")
+ERROR_OUTCOMES = OUTCOMES.labels("error")
+
+
+def bypass_cache(header_value: Optional[str]) -> bool:
+    return (header_value or "").strip().lower() in TRUTHY_HEADER_VALUES
+
+
+async def process_document(
+    document_text: str,
+    ai_extractor: AIExtractor,
+    validator: DocumentValidator,
+    context: ExtractionContext
+) -> ValidationResponse:
+    try:
+        try:
+            raw_data = await ai_extractor.extract(document_text, context=context)
+        except UpstreamRateLimitError as e:
+            raise _rate_limited(e)
+        except CircuitOpenError as e:
+            raise _circuit_open(e)
+        except AIExtractorError as e:
+            logger.error(f"Extraction failed: {str(e)}")
+            raise HTTPException(status_code=503, detail=f"AI service failed: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+        return _build_response(raw_data, validator)
+    except HTTPException:
+        ERROR_OUTCOMES.inc()
+        raise
+
+
+def _record_results(validation_results: List[ValidationResult]) -> int:
+    passed = 0
+    for result in validation_results:
+        RULE_RESULTS.labels(result.rule, result.status).inc()
+        passed += result.status == "PASS"
+    OUTCOMES.labels("passed" if passed == len(validation_results) else "failed").inc()
+    return passed
+
+
+def _rate_limited(error: UpstreamRateLimitError) -> HTTPException:
+    logger.warning(f"Rate limited: {str(error)}")
+    return HTTPException(
+        status_code=429,
+        detail=f"AI service rate limited: {str(error)}",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+def _circuit_open(error: CircuitOpenError) -> HTTPException:
+    logger.warning(f"Failing fast: {str(error)}")
+    return HTTPException(
+        status_code=503,
+        detail=f"AI service failed: {str(error)}",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+def _build_response(raw_data: Dict[str, Any], validator: DocumentValidator) -> ValidationResponse:
+    try:
+        with SCHEMA_STAGE.time():
+            extracted_data = ExtractedData(**raw_data)
+    except ValidationError as e:
+        logger.error(f"Invalid data schema: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
+
+    snapshot = validator.snapshot()
+    try:
+        with VALIDATE_STAGE.time():
+            validation_results = validator.validate(extracted_data, snapshot)
+    except Exception as e:
+        logger.error(f"Validation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Validation error: {str(e)}")
+
+    passed = _record_results(validation_results)
+    logger.info(
+        f"Validation complete: {passed}/{len(validation_results)} passed "
+        f"(registry version {snapshot.version})"
+    )
+    
+    return ValidationResponse(
+        extracted_data=extracted_data,
+        validation_results=validation_results,
+        registry_version=snapshot.version
+    )
+
 
 @router.post("/validate", response_model=ValidationResponse)
 async def validate_document(
     request: DocumentRequest,
     ai_extractor: AIExtractor = Depends(get_ai_extractor),
-    validator: DocumentValidator = Depends(get_document_validator)
+    validator: DocumentValidator = Depends(get_document_validator),
+    x_cache_bypass: Optional[str] = Header(None)
 ):
     logger.info("Processing validation request")
     
+    with IN_FLIGHT.track("validate"):
+        context = ExtractionContext(use_cache=not bypass_cache(x_cache_bypass))
+        result = await process_document(request.document_text, ai_extractor, validator, context)
+        
+        headers = {}
+        if context.cache_status:
+            headers["X-Cache"] = context.cache_status
+        if context.path:
+            headers["X-Extraction-Path"] = context.path
+        if context.completion_budget_unused is not None:
+            headers["X-Completion-Budget-Unused"] = str(context.completion_budget_unused)
+        if result.registry_version:
+            headers["X-Vessel-Registry-Version"] = result.registry_version
+        
+        with SERIALIZE_STAGE.time():
+            body = result.model_dump_json()
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/validate/stream")
+async def validate_document_stream(
+    request: DocumentRequest,
+    ai_extractor: AIExtractor = Depends(get_ai_extractor),
+    validator: DocumentValidator = Depends(get_document_validator),
+    x_cache_bypass: Optional[str] = Header(None)
+):
+    logger.info("Processing streaming validation request")
+    
+    context = ExtractionContext(use_cache=not bypass_cache(x_cache_bypass))
+    return StreamingResponse(
+        _tracked_stream(request.document_text, ai_extractor, validator, context),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _tracked_stream(
+    document_text: str,
+    ai_extractor: AIExtractor,
+    validator: DocumentValidator,
+    context: ExtractionContext
+) -> AsyncIterator[str]:
+    with IN_FLIGHT.track("stream"):
+        async for event in _stream_validation(document_text, ai_extractor, validator, context):
+            yield event
+
+
+async def _stream_validation(
+    document_text: str,
+    ai_extractor: AIExtractor,
+    validator: DocumentValidator,
+    context: ExtractionContext
+) -> AsyncIterator[str]:
+    snapshot = validator.snapshot()
+    extracted: Dict[str, Any] = {}
+    results: Dict[str, Any] = {}
+    
     try:
-        raw_data = await ai_extractor.extract(request.document_text)
+        async for field, value in ai_extractor.extract_stream(document_text, context=context):
+            extracted[field] = value
+            yield _sse("field", {"field": field, "value": value})
+            
+            for rule, inputs in RULE_FIELDS.items():
+                if rule in results or not all(name in extracted for name in inputs):
+                    continue
+                partial = ExtractedData(**{name: extracted[name] for name in inputs})
+                with VALIDATE_STAGE.time():
+                    results[rule] = validator.validate_rule(rule, partial, snapshot)
+                yield _sse("rule", results[rule].model_dump(mode="json"))
+        
+        result = ValidationResponse(
+            extracted_data=ExtractedData(**extracted),
+            validation_results=[results[rule] for rule in RULE_FIELDS],
+            registry_version=snapshot.version
+        )
+    except UpstreamRateLimitError as e:
+        yield _sse_error(_rate_limited(e))
+        return
+    except CircuitOpenError as e:
+        yield _sse_error(_circuit_open(e))
+        return
     except AIExtractorError as e:
         logger.error(f"Extraction failed: {str(e)}")
-        raise HTTPException(status_code=503, detail=f"AI service failed: {str(e)}")
+        yield _sse_error(HTTPException(status_code=503, detail=f"AI service failed: {str(e)}"))
+        return
+    except ValidationError as e:
+        logger.error(f"Invalid data schema: {str(e)}")
+        yield _sse_error(HTTPException(status_code=400, detail=f"Invalid data: {str(e)}"))
+        return
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+        yield _sse_error(HTTPException(status_code=500, detail=f"Internal error: {str(e)}"))
+        return
+    
+    passed = _record_results(result.validation_results)
+    logger.info(f"Streaming validation complete: {passed}/{len(result.validation_results)} passed")
+    yield _sse("result", {
+        **result.model_dump(mode="json"),
+        "cache_status": context.cache_status,
+        "extraction_path": context.path,
+        "completion_budget_unused": context.completion_budget_unused
+    })
 
-    try:
-        extracted_data = ExtractedData(**raw_data)
-    except ValidationError as e:
-        logger.error(f"Invalid data schema: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
 
-    try:
-        validation_results = validator.validate(extracted_data)
-    except Exception as e:
-        logger.error(f"Validation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Validation error: {str(e)}")
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    response = ValidationResponse(
-        extracted_data=extracted_data,
-        validation_results=validation_results
+
+def _sse_error(error: HTTPException) -> str:
+    ERROR_OUTCOMES.inc()
+    return _sse("error", {"status_code": error.status_code, "detail": str(error.detail)})
+
+
+@router.post("/validate/batch", response_model=BatchValidationResponse)
+async def validate_batch(
+    request: BatchValidationRequest,
+    ai_extractor: AIExtractor = Depends(get_ai_extractor),
+    validator: DocumentValidator = Depends(get_document_validator),
+    x_cache_bypass: Optional[str] = Header(None)
+):
+    if len(request.documents) > settings.batch_max_documents:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.documents)} documents (limit {settings.batch_max_documents})"
+        )
+    
+    logger.info(f"Processing batch of {len(request.documents)} documents")
+    
+    use_cache = not bypass_cache(x_cache_bypass)
+    with IN_FLIGHT.track("batch"):
+        if settings.ai_packing_enabled:
+            results = await _validate_packed(request.documents, ai_extractor, validator, use_cache)
+        else:
+            results = await _validate_concurrently(request.documents, ai_extractor, validator, use_cache)
+    
+    failed = sum(1 for item in results if item.error is not None)
+    logger.info(f"Batch complete: {len(results) - failed}/{len(results)} succeeded")
+    
+    return BatchValidationResponse(
+        results=results,
+        succeeded=len(results) - failed,
+        failed=failed
     )
+
+
+async def _validate_concurrently(
+    documents: List[DocumentRequest],
+    ai_extractor: AIExtractor,
+    validator: DocumentValidator,
+    use_cache: bool
+) -> List[BatchItemResult]:
+    slots = asyncio.Semaphore(settings.batch_max_concurrency)
     
-    passed = sum(1 for r in validation_results if r.status == "PASS")
-    logger.info(f"Validation complete: {passed}/{len(validation_results)} passed")
+    async def process_item(index: int, document: DocumentRequest) -> BatchItemResult:
+        async with slots:
+            try:
+                result = await process_document(
+                    document.document_text, ai_extractor, validator, ExtractionContext(use_cache=use_cache)
+                )
+            except HTTPException as e:
+                return _item_error(index, e)
+        return BatchItemResult(index=index, result=result)
     
-    return response
+    return await asyncio.gather(
+        *(process_item(index, document) for index, document in enumerate(documents))
+    )
+
+
+async def _validate_packed(
+    documents: List[DocumentRequest],
+    ai_extractor: AIExtractor,
+    validator: DocumentValidator,
+    use_cache: bool
+) -> List[BatchItemResult]:
+    contexts = [ExtractionContext(use_cache=use_cache) for _ in documents]
+    raw_results = await ai_extractor.extract_many(
+        [document.document_text for document in documents], contexts
+    )
+    
+    results = []
+    for index, raw_data in enumerate(raw_results):
+        try:
+            if isinstance(raw_data, UpstreamRateLimitError):
+                raise _rate_limited(raw_data)
+            if isinstance(raw_data, CircuitOpenError):
+                raise _circuit_open(raw_data)
+            if isinstance(raw_data, AIExtractorError):
+                raise HTTPException(status_code=503, detail=f"AI service failed: {str(raw_data)}")
+            results.append(BatchItemResult(index=index, result=_build_response(raw_data, validator)))
+        except HTTPException as e:
+            ERROR_OUTCOMES.inc()
+            results.append(_item_error(index, e))
+    return results
+
+
+def _item_error(index: int, error: HTTPException) -> BatchItemResult:
+    return BatchItemResult(
+        index=index,
+        error=BatchItemError(status_code=error.status_code, detail=str(error.detail))
+    )
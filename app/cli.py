@@ -0,0 +1,111 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.compact_registry import MappedVesselIndex, compile_registry, load_names
+from app.services.disk_cache import DiskExtractionCache
+
+
+def _open_disk_cache(args: argparse.Namespace) -> DiskExtractionCache:
+    return DiskExtractionCache(
+        path=args.path,
+        max_bytes=settings.disk_cache_max_bytes,
+        ttl_seconds=settings.disk_cache_ttl_seconds,
+    )
+
+
+def cache_stats(args: argparse.Namespace) -> int:
+    cache = _open_disk_cache(args)
+    print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+def cache_list(args: argparse.Namespace) -> int:
+    cache = _open_disk_cache(args)
+    for entry in cache.entries(limit=args.limit):
+        print(json.dumps(entry))
+    return 0
+
+
+def cache_prune(args: argparse.Namespace) -> int:
+    cache = _open_disk_cache(args)
+    older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+    removed = cache.prune(
+        max_bytes=args.max_bytes,
+        older_than=older_than,
+        model=args.model,
+        prompt_version=args.prompt_version,
+    )
+    print(f"Removed {removed} entries")
+    return 0
+
+
+def cache_clear(args: argparse.Namespace) -> int:
+    cache = _open_disk_cache(args)
+    removed = cache.clear()
+    print(f"Removed {removed} entries")
+    return 0
+
+
+def registry_compile(args: argparse.Namespace) -> int:
+    names = load_names(args.input)
+    version = compile_registry(names, args.output)
+    print(f"Compiled {len(names)} names to {args.output} (registry version {version})")
+    return 0
+
+
+def registry_lookup(args: argparse.Namespace) -> int:
+    index = MappedVesselIndex(args.path, max_edit_distance=settings.vessel_max_edit_distance)
+    match = index.lookup(args.name)
+    print(json.dumps({"canonical": match.canonical, "score": match.score, "exact": match.exact}))
+    return 0 if match.canonical else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=settings.app_name)
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    cache = commands.add_parser("cache", help="Inspect or prune the persistent extraction cache")
+    cache.add_argument("--path", default=settings.disk_cache_file, help="Cache database file")
+    cache_commands = cache.add_subparsers(dest="cache_command", required=True)
+    
+    cache_commands.add_parser("stats", help="Show entry count and size").set_defaults(func=cache_stats)
+    
+    list_parser = cache_commands.add_parser("list", help="Show most recently used entries")
+    list_parser.add_argument("--limit", type=int, default=20)
+    list_parser.set_defaults(func=cache_list)
+    
+    prune_parser = cache_commands.add_parser("prune", help="Remove entries")
+    prune_parser.add_argument("--max-bytes", type=int, help="Evict least recently used entries down to this size")
+    prune_parser.add_argument("--older-than-days", type=float, help="Remove entries not used for this many days")
+    prune_parser.add_argument("--model", help="Remove entries produced by this model")
+    prune_parser.add_argument("--prompt-version", help="Remove entries produced by this prompt version")
+    prune_parser.set_defaults(func=cache_prune)
+    
+    cache_commands.add_parser("clear", help="Remove all entries").set_defaults(func=cache_clear)
+    
+    registry = commands.add_parser("registry", help="Build or query compiled vessel registries")
+    registry_commands = registry.add_subparsers(dest="registry_command", required=True)
+    
+    compile_parser = registry_commands.add_parser("compile", help="Compile a JSON or CSV vessel list")
+    compile_parser.add_argument("input", help="Vessel list (.json array of names or .csv with a name column)")
+    compile_parser.add_argument("output", help="Compiled registry file (.vreg)")
+    compile_parser.set_defaults(func=registry_compile)
+    
+    lookup_parser = registry_commands.add_parser("lookup", help="Look up a name in a compiled registry")
+    lookup_parser.add_argument("path", help="Compiled registry file (.vreg)")
+    lookup_parser.add_argument("name")
+    lookup_parser.set_defaults(func=registry_lookup)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,15 +15,102 @@ class Settings(BaseSettings):
     port: int = 8000
     
     groq_api_key: str = os.getenv("GROQ_API_KEY", "")
+    groq_base_url: str = ""
     ai_model: str = "llama-3.3-70b-versatile"
     ai_temperature: float = 0.1
     ai_max_tokens: int = 500
+    ai_max_concurrency: int = 16
+    ai_coalesce_enabled: bool = True
+    ai_early_stop_enabled: bool = True
+    ai_early_stop_drain_seconds: float = 0.25
+    ai_early_stop_drain_bytes: int = 64 * 1024
+    ai_structured_output_enabled: bool = False
+    
+    ai_cascade_enabled: bool = False
+    ai_cascade_models: str = "llama-3.1-8b-instant"
+    ai_cascade_min_score: float = 0.8
+    
+    ai_requests_per_minute: int = 0
+    ai_tokens_per_minute: int = 0
+    ai_rate_limit_max_queue: int = 256
+    ai_rate_limit_max_retries: int = 3
+    ai_rate_limit_default_retry_after: float = 1.0
+    
+    ai_http_pool_enabled: bool = True
+    ai_http_max_connections: int = 100
+    ai_http_max_keepalive_connections: int = 50
+    ai_http_keepalive_expiry_seconds: float = 60.0
+    ai_http_connect_timeout_seconds: float = 5.0
+    ai_http_read_timeout_seconds: float = 60.0
+    ai_http2_enabled: bool = False
+    ai_http_prewarm_connections: int = 0
+    
+    ai_attempt_timeout_seconds: float = 20.0
+    ai_max_retries: int = 2
+    ai_retry_backoff_seconds: float = 0.5
+    ai_retry_backoff_max_seconds: float = 8.0
+    ai_hedging_enabled: bool = False
+    ai_hedge_percentile: float = 0.95
+    ai_hedge_min_samples: int = 20
+    ai_circuit_breaker_enabled: bool = True
+    ai_circuit_failure_threshold: int = 5
+    ai_circuit_reset_seconds: float = 30.0
+    
+    preprocess_enabled: bool = True
+    ai_prompt_token_budget: int = 3000
+    
+    ai_chunking_enabled: bool = True
+    ai_chunk_threshold_tokens: int = 6000
+    ai_chunk_tokens: int = 3000
+    ai_chunk_overlap_tokens: int = 200
+    ai_chunk_merge_policy: str = "vote"
+    
+    rules_enabled: bool = True
+    rules_min_confidence: float = 0.9
+    
+    ai_packing_enabled: bool = False
+    ai_packing_token_budget: int = 6000
+    ai_packing_max_documents: int = 8
+    ai_packing_output_tokens_per_document: int = 150
+    
+    extraction_cache_enabled: bool = True
+    extraction_cache_max_entries: int = 10000
+    extraction_cache_max_bytes: int = 64 * 1024 * 1024
+    extraction_cache_ttl_seconds: float = 24 * 60 * 60
+    
+    batch_max_documents: int = 1000
+    batch_max_concurrency: int = 8
+    
+    jobs_enabled: bool = True
+    job_workers: int = 4
+    job_lease_seconds: float = 60.0
+    job_max_attempts: int = 3
+    job_poll_seconds: float = 0.5
+    job_retry_backoff_seconds: float = 2.0
+    job_retry_backoff_max_seconds: float = 60.0
+    
+    disk_cache_enabled: bool = True
+    disk_cache_max_bytes: int = 512 * 1024 * 1024
+    disk_cache_ttl_seconds: float = 24 * 60 * 60
+    
+    vessel_max_edit_distance: int = 2
+    vessel_fuzzy_auto_accept: bool = False
+    vessel_registry_reload_enabled: bool = True
+    vessel_registry_poll_seconds: float = 2.0
     
     log_level: str = "INFO"
     
+    admin_token: str = ""
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_max_profiles: int = 50
+    
     base_dir: Path = Path(__file__).parent.parent.parent
     data_dir: Path = base_dir / "data"
     valid_vessels_file: Path = data_dir / "valid_vessels.json"
+    disk_cache_file: Path = data_dir / "cache" / "extractions.sqlite3"
+    jobs_file: Path = data_dir / "jobs" / "jobs.sqlite3"
+    profiles_dir: Path = data_dir / "profiles"
     
     class Config:
         env_file = ".env"
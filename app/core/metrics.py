@@ -0,0 +1,291 @@
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+_breakdown: ContextVar[Optional[Dict[str, float]]] = ContextVar("metrics_breakdown", default=None)
+
+
+@contextmanager
+def capture_breakdown() -> Iterator[Dict[str, float]]:
+    breakdown: Dict[str, float] = {}
+    token = _breakdown.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _breakdown.reset(token)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List["Metric"] = []
+
+    def register(self, metric: "Metric") -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: MetricsRegistry = registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        registry.register(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child(values)
+        return child
+
+    def reset(self) -> None:
+        for child in self._children.values():
+            child.reset()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def _new_child(self, values: Tuple[str, ...]):
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+
+class _Tracker:
+    __slots__ = ("_gauge",)
+
+    def __init__(self, gauge: _Value):
+        self._gauge = gauge
+
+    def __enter__(self) -> None:
+        self._gauge.value += 1
+
+    def __exit__(self, *exc_info) -> None:
+        self._gauge.value -= 1
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in self._children.items()
+        ]
+
+    def _new_child(self, values: Tuple[str, ...]) -> _Value:
+        return _Value()
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def track(self, *values: str) -> _Tracker:
+        return _Tracker(self.labels(*values))
+
+    def total(self) -> float:
+        return sum(child.value for child in self._children.values())
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in self._children.items()
+        ]
+
+    def _new_child(self, values: Tuple[str, ...]) -> _Value:
+        return _Value()
+
+
+class _HistogramChild:
+    __slots__ = ("key", "buckets", "counts", "sum", "count")
+
+    def __init__(self, key: str, buckets: Tuple[float, ...]):
+        self.key = key
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown[self.key] = breakdown.get(self.key, 0.0) + value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Timer:
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._child.observe(time.perf_counter() - self._started)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: MetricsRegistry = registry,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self, *values: str) -> _Timer:
+        return _Timer(self.labels(*values))
+
+    def samples(self) -> List[str]:
+        lines = []
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+    def _new_child(self, values: Tuple[str, ...]) -> _HistogramChild:
+        return _HistogramChild(",".join(values) or self.name, self.buckets)
+
+
+STAGE_SECONDS = Histogram(
+    "validation_stage_seconds",
+    "Time spent in each stage of document validation.",
+    labelnames=["stage"],
+)
+OUTCOMES = Counter(
+    "validation_outcomes",
+    "Validated documents by outcome (passed, failed or error).",
+    labelnames=["outcome"],
+)
+RULE_RESULTS = Counter(
+    "validation_rule_results",
+    "Validation rule results by rule name and status.",
+    labelnames=["rule", "status"],
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors",
+    "Errors returned by the LLM provider, by exception type.",
+    labelnames=["type"],
+)
+IN_FLIGHT = Gauge(
+    "validation_requests_in_flight",
+    "Validation requests currently being processed, by endpoint.",
+    labelnames=["endpoint"],
+)
+MODEL_SECONDS = Histogram(
+    "llm_model_seconds",
+    "Wall time of an extraction attempt on each cascade tier, including retries.",
+    labelnames=["model"],
+)
+CASCADE_DECISIONS = Counter(
+    "llm_cascade_decisions",
+    "Cascade results by model tier (accepted or escalated).",
+    labelnames=["model", "decision"],
+)
+CASCADE_LATENCY_SAVED = Gauge(
+    "llm_cascade_latency_saved_seconds",
+    "Estimated latency saved by the cascade, net of time spent on escalated attempts.",
+)
+PARSE_RESULTS = Counter(
+    "llm_parse_results",
+    "Completion parses by output mode (text or json) and result (parsed, repaired or failed).",
+    labelnames=["mode", "result"],
+)
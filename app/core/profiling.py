@@ -0,0 +1,148 @@
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import secrets
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+from app.core.metrics import IN_FLIGHT, capture_breakdown
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{14}-[0-9a-f]{8}$")
+TOP_FUNCTIONS = 25
+
+
+def admin_token_matches(expected: str, supplied: Optional[str]) -> bool:
+    return bool(expected) and supplied is not None and secrets.compare_digest(expected, supplied)
+
+
+class ProfileStore:
+    def __init__(self, directory: Path, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def new_id(self) -> str:
+        return f"{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, profile: cProfile.Profile, summary: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(self.directory / f"{profile_id}.prof")
+
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        summary = {"id": profile_id, **summary, "top_functions": output.getvalue()}
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(summary, indent=2))
+        self._prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                summary = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            summary.pop("top_functions", None)
+            summaries.append(summary)
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, ".json")
+        if path is None:
+            return None
+        return json.loads(path.read_text())
+
+    def stats_path(self, profile_id: str) -> Optional[Path]:
+        return self._path(profile_id, ".prof")
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.is_file() else None
+
+    def _prune(self) -> None:
+        summaries = sorted(self.directory.glob("*.json"))
+        for path in summaries[:max(0, len(summaries) - self.max_profiles)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, store: ProfileStore, admin_token: str = "", sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.active = False
+        self.profiled = 0
+        self.skipped = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if self.active:
+            self.skipped += 1
+            logger.info(f"Profiler busy, not profiling {scope['method']} {scope['path']}")
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status = {"code": None}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profile = cProfile.Profile()
+        self.active = True
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        concurrent = IN_FLIGHT.total()
+        try:
+            with capture_breakdown() as stages:
+                profile.enable()
+                try:
+                    await self.app(scope, receive, send_with_id)
+                finally:
+                    profile.disable()
+        finally:
+            self.active = False
+            summary = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status["code"],
+                "created_at": time.time(),
+                "wall_seconds": round(time.perf_counter() - started, 6),
+                "cpu_seconds": round(time.process_time() - cpu_started, 6),
+                "concurrent_requests": int(max(concurrent, IN_FLIGHT.total())),
+                "stages": {stage: round(seconds, 6) for stage, seconds in stages.items()},
+            }
+            self.profiled += 1
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, profile, summary)
+                logger.info(f"Stored profile {profile_id} for {scope['method']} {scope['path']}")
+            except OSError as e:
+                logger.warning(f"Could not store profile {profile_id}: {str(e)}")
+
+    def _should_profile(self, scope) -> bool:
+        if self.admin_token:
+            headers = dict(scope.get("headers") or [])
+            requested = headers.get(PROFILE_HEADER.encode(), b"").decode().strip().lower()
+            if requested in {"1", "true", "yes", "on"}:
+                supplied = headers.get(ADMIN_TOKEN_HEADER.encode())
+                return admin_token_matches(self.admin_token, supplied.decode() if supplied else None)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
@@ -1,20 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.profiling import ProfilingMiddleware
 from app.api.v1.api import api_router
+from app.api.deps import get_profile_store, init_services, shutdown_services, start_job_workers
+from app.api.v1.endpoints.jobs import run_job
 from app.models.schemas import HealthResponse
 
 setup_logging()
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_services()
+    await start_job_workers(run_job)
+    yield
+    await shutdown_services()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="Insurance document validation API",
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -25,6 +41,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=get_profile_store(),
+        admin_token=settings.admin_token,
+        sample_rate=settings.profiling_sample_rate
+    )
+
 app.include_router(api_router, prefix="/api/v1")
 
 
@@ -37,6 +61,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "validate": "/api/v1/validate",
+            "jobs": "/api/v1/jobs",
+            "metrics": "/metrics",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -52,6 +78,11 @@ async def health_check():
     )
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=settings.host, port=settings.port)
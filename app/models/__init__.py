@@ -3,6 +3,11 @@ from app.models.schemas import (
     ExtractedData,
     ValidationResult,
     ValidationResponse,
+    BatchValidationRequest,
+    BatchItemError,
+    BatchItemResult,
+    BatchValidationResponse,
+    JobResponse,
     HealthResponse,
 )
 
@@ -11,5 +16,10 @@ __all__ = [
     "ExtractedData",
     "ValidationResult",
     "ValidationResponse",
+    "BatchValidationRequest",
+    "BatchItemError",
+    "BatchItemResult",
+    "BatchValidationResponse",
+    "JobResponse",
     "HealthResponse",
 ]
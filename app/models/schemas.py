@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
 
 class DocumentRequest(BaseModel):
@@ -19,11 +19,44 @@ class ValidationResult(BaseModel):
     rule: str
     status: str
     message: str
+    details: Optional[Dict[str, Any]] = None
 
 
 class ValidationResponse(BaseModel):
     extracted_data: ExtractedData
     validation_results: List[ValidationResult]
+    registry_version: Optional[str] = None
+
+
+class BatchValidationRequest(BaseModel):
+    documents: List[DocumentRequest] = Field(..., min_length=1, description="Documents to validate")
+
+
+class BatchItemError(BaseModel):
+    status_code: int
+    detail: str
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[ValidationResponse] = None
+    error: Optional[BatchItemError] = None
+
+
+class BatchValidationResponse(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    attempts: int = 0
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[ValidationResponse] = None
+    error: Optional[BatchItemError] = None
 
 
 class HealthResponse(BaseModel):
@@ -1,50 +1,497 @@
+import asyncio
 import json
-from typing import Dict, Any
-from groq import Groq
+import time
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, AsyncGenerator, AsyncIterator, Iterator, List, Optional, Set, Tuple, Union
+from groq import AsyncGroq, APIConnectionError, InternalServerError, RateLimitError
 
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.utils.exceptions import AIExtractorError
+from app.core.metrics import (
+    CASCADE_DECISIONS,
+    CASCADE_LATENCY_SAVED,
+    MODEL_SECONDS,
+    PARSE_RESULTS,
+    STAGE_SECONDS,
+    UPSTREAM_ERRORS,
+)
+from app.services.cache import ExtractionCache, make_cache_key
+from app.services.cascade import parse_tiers, score_extraction
+from app.services.chunking import merge_chunk_results, split_into_chunks
+from app.services.disk_cache import DiskExtractionCache
+from app.services.http_pool import LLMConnectionPool, drain_stream, get_http_pool
+from app.services.json_repair import repair_json
+from app.services.json_stream import IncrementalJSONParser
+from app.services.preprocessor import DocumentPreprocessor
+from app.services.rate_limiter import RateLimitScheduler
+from app.services.resilience import CircuitBreaker, LatencyTracker, jittered_backoff
+from app.services.rule_extractor import RuleBasedExtractor
+from app.services.singleflight import SingleFlight
+from app.services.structured_output import RESPONSE_FORMAT, max_output_tokens, system_prompt
+from app.utils.exceptions import AIExtractorError, CircuitOpenError, UpstreamRateLimitError
+from app.utils.tokens import estimate_tokens
 
 logger = get_logger(__name__)
 
+PROMPT_STAGE = STAGE_SECONDS.labels("prompt_build")
+LLM_STAGE = STAGE_SECONDS.labels("llm")
+PARSE_STAGE = STAGE_SECONDS.labels("parse")
+
+PROMPT_VERSION = "2"
+
+SYSTEM_PROMPT = "Extract structured data from documents. Return only valid JSON."
+
+REQUIRED_FIELDS = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
+
+FIELD_DESCRIPTIONS = {
+    "policy_number": "string or null",
+    "vessel_name": "string or null",
+    "policy_start_date": "YYYY-MM-DD or null",
+    "policy_end_date": "YYYY-MM-DD or null",
+    "insured_value": "integer or null",
+}
+
+EXTRACTION_PATHS = ["cache", "rules", "hybrid", "llm", "chunked"]
+PARSE_MODES = ["text", "json"]
+PARSE_OUTCOMES = ["parsed", "repaired", "failed"]
+
+PACKED_DOCUMENT_OVERHEAD_TOKENS = 20
+
+TRANSIENT_ERRORS = (APIConnectionError, InternalServerError, asyncio.TimeoutError)
+UPSTREAM_COUNTERS = ["attempts", "retries", "timeouts", "hedges", "hedge_wins"]
+
+_extraction_slots = asyncio.Semaphore(settings.ai_max_concurrency)
+_repairs: ContextVar[Optional[List[str]]] = ContextVar("parse_repairs", default=None)
+
+
+@contextmanager
+def track_repairs() -> Iterator[List[str]]:
+    repairs: List[str] = []
+    token = _repairs.set(repairs)
+    try:
+        yield repairs
+    finally:
+        _repairs.reset(token)
+
+
+class ExtractionContext:
+    def __init__(self, use_cache: bool = True):
+        self.use_cache = use_cache
+        self.cache_status: Optional[str] = None
+        self.path: Optional[str] = None
+        self.provenance: Optional[Dict[str, Dict[str, Any]]] = None
+        self.completion_budget_unused: Optional[int] = None
+
+
+class ExtractionOutcome:
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        path: str,
+        provenance: Optional[Dict[str, Dict[str, Any]]] = None,
+        completion_budget_unused: Optional[int] = None,
+        repaired: bool = False
+    ):
+        self.data = data
+        self.path = path
+        self.provenance = provenance
+        self.completion_budget_unused = completion_budget_unused
+        self.repaired = repaired
+
 
 class AIExtractor:
     def __init__(self):
         if not settings.groq_api_key:
             raise AIExtractorError("GROQ_API_KEY not configured")
         
-        self.client = Groq(api_key=settings.groq_api_key)
+        self.http_pool: Optional[LLMConnectionPool] = get_http_pool() if settings.ai_http_pool_enabled else None
+        self.client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            base_url=settings.groq_base_url or None,
+            max_retries=0,
+            http_client=self.http_pool.client if self.http_pool is not None else None,
+        )
         self.model = settings.ai_model
+        self.tiers = parse_tiers(settings.ai_cascade_models, self.model) if settings.ai_cascade_enabled else [self.model]
+        self.model_key = ">".join(self.tiers)
         self.temperature = settings.ai_temperature
         self.max_tokens = settings.ai_max_tokens
+        self.structured_output = settings.ai_structured_output_enabled
+        self.cache: Optional[ExtractionCache] = None
+        if settings.extraction_cache_enabled:
+            self.cache = ExtractionCache(
+                max_entries=settings.extraction_cache_max_entries,
+                max_bytes=settings.extraction_cache_max_bytes,
+                ttl_seconds=settings.extraction_cache_ttl_seconds,
+            )
+        self.disk_cache: Optional[DiskExtractionCache] = None
+        if settings.disk_cache_enabled:
+            try:
+                self.disk_cache = DiskExtractionCache(
+                    path=settings.disk_cache_file,
+                    max_bytes=settings.disk_cache_max_bytes,
+                    ttl_seconds=settings.disk_cache_ttl_seconds,
+                )
+            except Exception as e:
+                logger.error(f"Disk cache unavailable: {str(e)}")
+        self.inflight: Optional[SingleFlight] = SingleFlight() if settings.ai_coalesce_enabled else None
+        self.rule_extractor: Optional[RuleBasedExtractor] = RuleBasedExtractor() if settings.rules_enabled else None
+        self.preprocessor: Optional[DocumentPreprocessor] = None
+        if settings.preprocess_enabled:
+            self.preprocessor = DocumentPreprocessor(token_budget=settings.ai_prompt_token_budget)
+        self.scheduler = RateLimitScheduler(
+            requests_per_minute=settings.ai_requests_per_minute,
+            tokens_per_minute=settings.ai_tokens_per_minute,
+            max_queue=settings.ai_rate_limit_max_queue,
+        )
+        self.latency = LatencyTracker(min_samples=settings.ai_hedge_min_samples)
+        self.breaker: Optional[CircuitBreaker] = None
+        if settings.ai_circuit_breaker_enabled:
+            self.breaker = CircuitBreaker(
+                failure_threshold=settings.ai_circuit_failure_threshold,
+                reset_seconds=settings.ai_circuit_reset_seconds,
+            )
+        self.upstream_counts: Dict[str, int] = {name: 0 for name in UPSTREAM_COUNTERS}
+        self.path_counts: Dict[str, int] = {path: 0 for path in EXTRACTION_PATHS}
+        self.llm_fields_requested = 0
+        self.chunk_calls = 0
+        self.early_stops = 0
+        self.early_stop_drains = {"drained": 0, "discarded": 0}
+        self._drains: Set[asyncio.Task] = set()
+        self.completion_budget_unused = 0
+        self.parse_counts: Dict[str, Dict[str, int]] = {
+            mode: {result: 0 for result in PARSE_OUTCOMES} for mode in PARSE_MODES
+        }
+        self.tier_latency = {model: LatencyTracker(min_samples=1) for model in self.tiers}
+        self.cascade_counts: Dict[str, Any] = {
+            "documents": 0,
+            "escalated": 0,
+            "accepted": {model: 0 for model in self.tiers},
+        }
+        self.cascade_latency_saved = 0.0
     
-    async def extract(self, document_text: str) -> Dict[str, Any]:
+    async def aclose(self) -> None:
+        await asyncio.gather(*self._drains, return_exceptions=True)
+        if self.http_pool is None:
+            await self.client.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+    
+    async def extract(self, document_text: str, context: Optional[ExtractionContext] = None) -> Dict[str, Any]:
+        context = context or ExtractionContext()
+        cache_key, cached = await self._lookup(document_text, context)
+        if cached is not None:
+            self._record_path(context, "cache")
+            return cached
+        
+        outcome = await self._extract_coalesced(document_text, cache_key)
+        self._record_path(context, outcome.path)
+        context.provenance = outcome.provenance
+        context.completion_budget_unused = outcome.completion_budget_unused
+        return outcome.data
+    
+    async def extract_stream(
+        self,
+        document_text: str,
+        context: Optional[ExtractionContext] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        context = context or ExtractionContext()
+        cache_key, cached = await self._lookup(document_text, context)
+        if cached is not None:
+            self._record_path(context, "cache")
+            for field in REQUIRED_FIELDS:
+                yield field, cached.get(field)
+            return
+        
+        fields = REQUIRED_FIELDS
+        rule_data: Dict[str, Any] = {}
+        if self.rule_extractor is not None:
+            rules = self.rule_extractor.extract(document_text)
+            fields = rules.missing_fields(settings.rules_min_confidence)
+            rule_data = {field: value for field, value in rules.data.items() if field not in fields}
+            for field, value in rule_data.items():
+                yield field, value
+        
+        if not fields:
+            logger.info("All fields resolved by rule-based extractor")
+            self._record_path(context, "rules")
+            await self._cache_set(cache_key, rule_data)
+            return
+        
+        prepared_text = self._clean_text(document_text)
+        if settings.ai_chunking_enabled and estimate_tokens(prepared_text) > settings.ai_chunk_threshold_tokens:
+            outcome = await self._extract_coalesced(document_text, cache_key)
+            for field in fields:
+                yield field, outcome.data[field]
+            self._record_path(context, outcome.path)
+            context.provenance = outcome.provenance
+            return
+        
+        prepared_text = self._window_text(document_text, prepared_text)
+        self.llm_fields_requested += len(fields)
+        logger.info(f"Streaming {len(fields)} fields from document")
+        
+        parser = IncrementalJSONParser(fields)
         try:
-            prompt = self._build_prompt(document_text)
-            
-            logger.info("Extracting data from document")
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Extract structured data from documents. Return only valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            async for field, value in self._stream_fields(self._build_prompt(prepared_text, fields), parser):
+                yield field, value
+        except AIExtractorError:
+            raise
+        except Exception as e:
+            logger.error(f"Streaming extraction failed: {str(e)}")
+            raise AIExtractorError(f"AI service error: {str(e)}")
+        
+        if not parser.done:
+            self._record_parse("text", "failed")
+            logger.error(f"Invalid JSON: {parser.text}")
+            raise AIExtractorError("Invalid JSON response: no complete object found")
+        self._record_parse("text", "parsed")
+        
+        for field in fields:
+            if field not in parser.values:
+                yield field, None
+        
+        context.completion_budget_unused = self._completion_budget_unused(parser)
+        extracted_data = parser.result()
+        extracted_data.update(rule_data)
+        extracted_data = {field: extracted_data[field] for field in REQUIRED_FIELDS}
+        self._record_path(context, "hybrid" if rule_data else "llm")
+        await self._cache_set(cache_key, extracted_data)
+    
+    async def extract_many(
+        self,
+        document_texts: List[str],
+        contexts: Optional[List[ExtractionContext]] = None
+    ) -> List[Union[Dict[str, Any], AIExtractorError]]:
+        contexts = contexts or [ExtractionContext() for _ in document_texts]
+        results: List[Union[Dict[str, Any], AIExtractorError, None]] = [None] * len(document_texts)
+        cache_keys: List[str] = []
+        rule_data: Dict[int, Dict[str, Any]] = {}
+        pending: List[int] = []
+        
+        for index, (document_text, context) in enumerate(zip(document_texts, contexts)):
+            cache_key, cached = await self._lookup(document_text, context)
+            cache_keys.append(cache_key)
+            if cached is not None:
+                results[index] = cached
+                self._record_path(context, "cache")
+                continue
             
-            response_text = chat_completion.choices[0].message.content.strip()
-            extracted_data = self._parse_response(response_text)
+            fields, rule_data[index], _ = self._split_rule_fields(document_text)
+            if not fields:
+                logger.info("All fields resolved by rule-based extractor")
+                results[index] = rule_data[index]
+                self._record_path(context, "rules")
+                await self._cache_set(cache_key, rule_data[index])
+                continue
+            
+            pending.append(index)
+        
+        if settings.ai_packing_enabled:
+            groups = self._pack(pending, document_texts)
+        else:
+            groups = [[index] for index in pending]
+        
+        slots = asyncio.Semaphore(settings.batch_max_concurrency)
+        
+        async def run_group(group: List[int]) -> None:
+            async with slots:
+                await extract_group(group)
+        
+        async def extract_group(group: List[int]) -> None:
+            packed: List[Optional[Dict[str, Any]]] = [None]
+            repaired = False
+            if len(group) > 1:
+                try:
+                    with track_repairs() as repairs:
+                        packed = await self._extract_packed([document_texts[index] for index in group])
+                except (UpstreamRateLimitError, CircuitOpenError) as e:
+                    for index in group:
+                        results[index] = e
+                    return
+                repaired = bool(repairs)
+            
+            for index, extracted_data in zip(group, packed):
+                if extracted_data is None:
+                    try:
+                        outcome = await self._extract_coalesced(document_texts[index], cache_keys[index])
+                    except AIExtractorError as e:
+                        results[index] = e
+                        continue
+                    results[index] = outcome.data
+                    self._record_path(contexts[index], outcome.path)
+                    contexts[index].provenance = outcome.provenance
+                    continue
+                extracted_data.update(rule_data[index])
+                results[index] = extracted_data
+                self._record_path(contexts[index], "hybrid" if rule_data[index] else "llm")
+                if not repaired:
+                    await self._cache_set(cache_keys[index], extracted_data)
+        
+        await asyncio.gather(*(run_group(group) for group in groups))
+        return results
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "extraction_cache": self.cache.stats() if self.cache is not None else None,
+            "disk_cache": self.disk_cache.stats() if self.disk_cache is not None else None,
+            "singleflight": self.inflight.stats() if self.inflight is not None else None,
+            "rate_limiter": self.scheduler.stats(),
+            "http_pool": self.http_pool.stats() if self.http_pool is not None else None,
+            "upstream": {
+                **self.upstream_counts,
+                "latency": self.latency.stats(),
+                "circuit_breaker": self.breaker.stats() if self.breaker is not None else None,
+            },
+            "extraction_paths": dict(self.path_counts),
+            "llm_fields_requested": self.llm_fields_requested,
+            "chunk_calls": self.chunk_calls,
+            "early_stops": self.early_stops,
+            "early_stop_drains": dict(self.early_stop_drains),
+            "completion_budget_unused": self.completion_budget_unused,
+            "cascade": self._cascade_stats() if len(self.tiers) > 1 else None,
+            "parse": self._parse_stats(),
+        }
+    
+    def _parse_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"structured_output": self.structured_output}
+        for mode, counts in self.parse_counts.items():
+            total = sum(counts.values())
+            stats[mode] = {
+                **counts,
+                "failure_rate": round(counts["failed"] / total, 4) if total else None,
+                "repair_rate": round(counts["repaired"] / total, 4) if total else None,
+            }
+        return stats
+    
+    def _cascade_stats(self) -> Dict[str, Any]:
+        documents = self.cascade_counts["documents"]
+        return {
+            "tiers": self.tiers,
+            **self.cascade_counts,
+            "accepted": dict(self.cascade_counts["accepted"]),
+            "escalation_rate": round(self.cascade_counts["escalated"] / documents, 4) if documents else None,
+            "latency_saved_seconds": round(self.cascade_latency_saved, 3),
+            "latency": {model: tracker.stats() for model, tracker in self.tier_latency.items()},
+        }
+    
+    def _record_path(self, context: ExtractionContext, path: str) -> None:
+        context.path = path
+        self.path_counts[path] += 1
+    
+    async def _lookup(
+        self,
+        document_text: str,
+        context: ExtractionContext
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        cache_key = make_cache_key(document_text, self.model_key, self.temperature, PROMPT_VERSION)
+        if self.cache is None and self.disk_cache is None:
+            return cache_key, None
+        
+        if not context.use_cache:
+            context.cache_status = "BYPASS"
+            return cache_key, None
+        
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            context.cache_status = "HIT"
+            logger.info("Extraction cache hit")
+            return cache_key, cached
+        
+        context.cache_status = "MISS"
+        return cache_key, None
+    
+    async def _cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if self.disk_cache is not None:
+            try:
+                cached = await asyncio.to_thread(self.disk_cache.get, cache_key)
+            except Exception as e:
+                logger.warning(f"Disk cache read failed: {str(e)}")
+                return None
+            if cached is not None and self.cache is not None:
+                self.cache.set(cache_key, cached)
+            return cached
+        return None
+    
+    async def _cache_set(self, cache_key: str, extracted_data: Dict[str, Any]) -> None:
+        if self.cache is not None:
+            self.cache.set(cache_key, extracted_data)
+        
+        if self.disk_cache is not None:
+            try:
+                await asyncio.to_thread(
+                    self.disk_cache.set, cache_key, extracted_data, self.model_key, PROMPT_VERSION
+                )
+            except Exception as e:
+                logger.warning(f"Disk cache write failed: {str(e)}")
+    
+    async def _extract_coalesced(self, document_text: str, cache_key: str) -> ExtractionOutcome:
+        async def run() -> ExtractionOutcome:
+            outcome = await self._extract_uncached(document_text)
+            if outcome.repaired:
+                logger.info("Not caching an extraction that needed JSON repair")
+            else:
+                await self._cache_set(cache_key, outcome.data)
+            return outcome
+        
+        if self.inflight is None:
+            return await run()
+        outcome = await self.inflight.do(cache_key, run)
+        return ExtractionOutcome(
+            dict(outcome.data), outcome.path, outcome.provenance, outcome.completion_budget_unused, outcome.repaired
+        )
+    
+    def _split_rule_fields(
+        self,
+        document_text: str
+    ) -> Tuple[List[str], Dict[str, Any], Optional[Dict[str, Any]]]:
+        if self.rule_extractor is None:
+            return REQUIRED_FIELDS, {}, None
+        rules = self.rule_extractor.extract(document_text)
+        fields = rules.missing_fields(settings.rules_min_confidence)
+        rule_data = {field: value for field, value in rules.data.items() if field not in fields}
+        return fields, rule_data, rules.data
+    
+    async def _extract_uncached(self, document_text: str) -> ExtractionOutcome:
+        try:
+            fields, rule_data, hints = self._split_rule_fields(document_text)
+            if not fields:
+                logger.info("All fields resolved by rule-based extractor")
+                return ExtractionOutcome(rule_data, "rules")
+            
+            prepared_text = self._clean_text(document_text)
+            self.llm_fields_requested += len(fields)
+            provenance = None
+            budget_unused = None
+            
+            with track_repairs() as repairs:
+                if settings.ai_chunking_enabled and estimate_tokens(prepared_text) > settings.ai_chunk_threshold_tokens:
+                    if self.preprocessor is not None:
+                        self.preprocessor.log_reduction(document_text, prepared_text)
+                    extracted_data, provenance = await self._extract_chunked(prepared_text, fields)
+                    path = "chunked"
+                else:
+                    prepared_text = self._window_text(document_text, prepared_text)
+                    prompt = self._build_prompt(prepared_text, fields)
+                    
+                    logger.info(f"Extracting {len(fields)} fields from document")
+                    if len(self.tiers) > 1:
+                        extracted_data, budget_unused = await self._extract_cascade(prompt, fields, hints)
+                    else:
+                        extracted_data, budget_unused = await self._extract_with_model(prompt, fields, self.model)
+                    path = "hybrid" if rule_data else "llm"
+            
+            extracted_data.update(rule_data)
+            extracted_data = {field: extracted_data[field] for field in REQUIRED_FIELDS}
             
             logger.info(f"Extracted: {extracted_data}")
-            return extracted_data
+            return ExtractionOutcome(extracted_data, path, provenance, budget_unused, bool(repairs))
             
         except Exception as e:
             logger.error(f"Extraction failed: {str(e)}")
@@ -52,13 +499,444 @@ class AIExtractor:
                 raise
             raise AIExtractorError(f"AI service error: {str(e)}")
     
-    def _build_prompt(self, document_text: str) -> str:
+    async def _extract_packed(self, document_texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        try:
+            prompt = self._build_packed_prompt([self._prepare_text(text) for text in document_texts])
+            max_tokens = settings.ai_packing_output_tokens_per_document * len(document_texts)
+            
+            logger.info(f"Extracting data from {len(document_texts)} packed documents")
+            response_text = await self._complete(prompt, max_tokens)
+            return self._parse_packed_response(response_text, len(document_texts))
+        except (UpstreamRateLimitError, CircuitOpenError):
+            raise
+        except Exception as e:
+            logger.warning(f"Packed extraction failed, falling back to single calls: {str(e)}")
+            return [None] * len(document_texts)
+    
+    async def _extract_chunked(
+        self,
+        document_text: str,
+        fields: List[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        chunks = split_into_chunks(
+            document_text, settings.ai_chunk_tokens, settings.ai_chunk_overlap_tokens
+        )
+        logger.info(f"Extracting {len(fields)} fields from {len(chunks)} chunks")
+        self.chunk_calls += len(chunks)
+        
+        async def extract_chunk(chunk: str) -> Dict[str, Any]:
+            prompt = self._build_prompt(chunk, fields)
+            if self.structured_output:
+                return await self._complete_structured(prompt, fields)
+            response_text = await self._complete(prompt, self.max_tokens)
+            return self._parse_response(response_text, fields)
+        
+        chunk_results = await asyncio.gather(
+            *(extract_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+        
+        errors = [result for result in chunk_results if isinstance(result, Exception)]
+        if len(errors) == len(chunk_results):
+            raise errors[0]
+        if errors:
+            logger.warning(f"{len(errors)}/{len(chunks)} chunk extractions failed")
+        
+        merged, provenance = merge_chunk_results(
+            [None if isinstance(result, Exception) else result for result in chunk_results],
+            fields,
+            settings.ai_chunk_merge_policy,
+        )
+        logger.info(f"Chunk provenance: {provenance}")
+        return merged, provenance
+    
+    def _prepare_text(self, document_text: str) -> str:
+        if self.preprocessor is None:
+            return document_text
+        return self.preprocessor.process(document_text)
+    
+    def _clean_text(self, document_text: str) -> str:
+        if self.preprocessor is None:
+            return document_text
+        return self.preprocessor.clean(document_text)
+    
+    def _window_text(self, document_text: str, cleaned_text: str) -> str:
+        if self.preprocessor is None:
+            return cleaned_text
+        windowed = self.preprocessor.window(cleaned_text)
+        self.preprocessor.log_reduction(document_text, windowed)
+        return windowed
+    
+    async def _extract_with_model(
+        self,
+        prompt: str,
+        fields: List[str],
+        model: str
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        if self.structured_output:
+            return await self._complete_structured(prompt, fields, model), None
+        if not settings.ai_hedging_enabled:
+            return await self._complete_fields(prompt, fields, model)
+        response_text = await self._complete(prompt, self.max_tokens, model)
+        return self._parse_response(response_text, fields), None
+    
+    async def _extract_cascade(
+        self,
+        prompt: str,
+        fields: List[str],
+        hints: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        self.cascade_counts["documents"] += 1
+        final_model = self.tiers[-1]
+        
+        for model in self.tiers[:-1]:
+            started = time.monotonic()
+            try:
+                extracted_data, budget_unused = await self._extract_with_model(prompt, fields, model)
+            except (AIExtractorError,) + TRANSIENT_ERRORS as e:
+                self._record_tier(model, "escalated", time.monotonic() - started)
+                logger.warning(f"{model} failed, escalating: {str(e) or type(e).__name__}")
+                continue
+            
+            elapsed = time.monotonic() - started
+            result = score_extraction(extracted_data, fields, hints)
+            if result.score >= settings.ai_cascade_min_score:
+                self._record_tier(model, "accepted", elapsed)
+                return extracted_data, budget_unused
+            self._record_tier(model, "escalated", elapsed)
+            logger.info(f"{model} scored {result.score:.2f}, escalating: {'; '.join(result.reasons)}")
+        
+        self.cascade_counts["escalated"] += 1
+        started = time.monotonic()
+        extracted_data, budget_unused = await self._extract_with_model(prompt, fields, final_model)
+        self._record_tier(final_model, "accepted", time.monotonic() - started)
+        return extracted_data, budget_unused
+    
+    def _record_tier(self, model: str, decision: str, elapsed: float) -> None:
+        MODEL_SECONDS.labels(model).observe(elapsed)
+        CASCADE_DECISIONS.labels(model, decision).inc()
+        
+        final_model = self.tiers[-1]
+        if decision == "escalated":
+            saved = -elapsed
+        elif model != final_model and self.tier_latency[final_model].percentile(0.5) is not None:
+            saved = self.tier_latency[final_model].percentile(0.5) - elapsed
+        else:
+            saved = 0.0
+        self.tier_latency[model].record(elapsed)
+        if decision == "accepted":
+            self.cascade_counts["accepted"][model] += 1
+        self.cascade_latency_saved += saved
+        CASCADE_LATENCY_SAVED.inc(saved)
+    
+    def _completion_request(
+        self,
+        prompt: str,
+        max_tokens: int,
+        model: Optional[str] = None,
+        structured_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        system = SYSTEM_PROMPT if structured_fields is None else system_prompt(SYSTEM_PROMPT, structured_fields)
+        request = {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "model": model or self.model,
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+        }
+        if structured_fields is not None:
+            request["response_format"] = RESPONSE_FORMAT
+        return request
+    
+    async def _complete(
+        self,
+        prompt: str,
+        max_tokens: int,
+        model: Optional[str] = None,
+        structured_fields: Optional[List[str]] = None
+    ) -> str:
+        request = self._completion_request(prompt, max_tokens, model, structured_fields)
+        estimated_tokens = estimate_tokens(request["messages"][0]["content"]) + estimate_tokens(prompt) + max_tokens
+        attempts = {"rate_limited": 0, "failures": 0}
+        
+        while True:
+            if self.breaker is not None:
+                self.breaker.check()
+            await self.scheduler.acquire(estimated_tokens)
+            try:
+                chat_completion = await self._send_hedged(request, estimated_tokens)
+            except (RateLimitError,) + TRANSIENT_ERRORS as e:
+                await self._backoff_or_raise(e, attempts)
+                continue
+            
+            if self.breaker is not None:
+                self.breaker.record_success()
+            usage = getattr(chat_completion, "usage", None)
+            self.scheduler.settle(estimated_tokens, getattr(usage, "total_tokens", None))
+            return chat_completion.choices[0].message.content.strip()
+    
+    async def _complete_structured(
+        self,
+        prompt: str,
+        fields: List[str],
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        response_text = await self._complete(prompt, max_output_tokens(fields), model, fields)
+        return self._parse_response(response_text, fields, mode="json")
+    
+    async def _complete_fields(
+        self,
+        prompt: str,
+        fields: List[str],
+        model: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        parser = IncrementalJSONParser(fields)
+        async for _ in self._stream_fields(prompt, parser, model, restartable=True):
+            pass
+        if not parser.done:
+            # Cut off or malformed part way: only the full parse and its guarded repair can vouch for it.
+            return self._parse_response(parser.text, fields), None
+        self._record_parse("text", "parsed")
+        return parser.result(), self._completion_budget_unused(parser)
+    
+    async def _stream_fields(
+        self,
+        prompt: str,
+        parser: IncrementalJSONParser,
+        model: Optional[str] = None,
+        restartable: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        parse_seconds = 0.0
+        async with aclosing(self._stream_completion(prompt, self.max_tokens, model, restartable)) as deltas:
+            async for delta in deltas:
+                if delta is None:
+                    parser.reset()
+                    continue
+                started = time.perf_counter()
+                completed = parser.feed(delta)
+                parse_seconds += time.perf_counter() - started
+                for field, value in completed:
+                    yield field, value
+                if parser.done and settings.ai_early_stop_enabled:
+                    parser.stop()
+                    try:
+                        await deltas.asend(True)
+                    except StopAsyncIteration:
+                        pass
+                    break
+        PARSE_STAGE.observe(parse_seconds)
+        
+        unused = self._completion_budget_unused(parser)
+        if unused is not None:
+            self.early_stops += 1
+            self.completion_budget_unused += unused
+            logger.info(f"Stopped generation after all fields were read, ~{unused} tokens of max_tokens left unused")
+    
+    def _completion_budget_unused(self, parser: IncrementalJSONParser) -> Optional[int]:
+        if not parser.stopped_early:
+            return None
+        return max(0, self.max_tokens - estimate_tokens(parser.text))
+    
+    async def _stream_completion(
+        self,
+        prompt: str,
+        max_tokens: int,
+        model: Optional[str] = None,
+        restartable: bool = False
+    ) -> AsyncGenerator[Optional[str], Optional[bool]]:
+        # With restartable set, a stream that fails part way is retried and None is yielded first
+        # so the consumer can drop what it has read; otherwise a mid-stream failure is fatal.
+        # Sending True in place of the next read stops the stream: the slot is released at once and the
+        # rest of the body is drained in the background, within a small budget, so the connection can be reused.
+        request = self._completion_request(prompt, max_tokens, model)
+        request["stream"] = True
+        estimated_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt) + max_tokens
+        attempts = {"rate_limited": 0, "failures": 0}
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            if self.breaker is not None:
+                self.breaker.check()
+            await self.scheduler.acquire(estimated_tokens)
+            async with _extraction_slots:
+                self.upstream_counts["attempts"] += 1
+                started = time.perf_counter()
+                deadline = loop.time() + settings.ai_attempt_timeout_seconds
+                stream = None
+                received = False
+                detached = False
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        stream = await self.client.chat.completions.create(**request)
+                    if self.breaker is not None:
+                        self.breaker.record_success()
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            async with asyncio.timeout_at(deadline):
+                                chunk = await chunks.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            received = True
+                            if (yield delta):
+                                self._drain_in_background(stream, deadline - loop.time())
+                                detached = True
+                                return
+                    await drain_stream(stream.response)
+                    return
+                except (RateLimitError,) + TRANSIENT_ERRORS as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        self.upstream_counts["timeouts"] += 1
+                    if received and not restartable:
+                        UPSTREAM_ERRORS.labels(type(e).__name__).inc()
+                        if self.breaker is not None:
+                            self.breaker.record_failure()
+                        raise AIExtractorError(f"AI service error: {str(e) or type(e).__name__}")
+                    error = e
+                finally:
+                    if stream is not None:
+                        if not detached:
+                            await stream.close()
+                        LLM_STAGE.observe(time.perf_counter() - started)
+            
+            await self._backoff_or_raise(error, attempts)
+            if received:
+                yield None
+    
+    def _drain_in_background(self, stream: Any, remaining: float) -> None:
+        task = asyncio.create_task(self._drain_stopped_stream(stream, remaining))
+        self._drains.add(task)
+        task.add_done_callback(self._drains.discard)
+    
+    async def _drain_stopped_stream(self, stream: Any, remaining: float) -> None:
+        timeout = max(0.0, min(settings.ai_early_stop_drain_seconds, remaining))
+        try:
+            drained = await drain_stream(stream.response, settings.ai_early_stop_drain_bytes, timeout)
+            self.early_stop_drains["drained" if drained else "discarded"] += 1
+        finally:
+            await stream.close()
+    
+    async def _backoff_or_raise(self, error: Exception, attempts: Dict[str, int]) -> None:
+        UPSTREAM_ERRORS.labels(type(error).__name__).inc()
+        if isinstance(error, RateLimitError):
+            retry_after = self._retry_after(error)
+            self.scheduler.penalize(retry_after)
+            attempts["rate_limited"] += 1
+            if attempts["rate_limited"] > settings.ai_rate_limit_max_retries:
+                raise UpstreamRateLimitError(f"Upstream rate limit exceeded: {str(error)}", retry_after=retry_after)
+            return
+        
+        if self.breaker is not None:
+            self.breaker.record_failure()
+        attempts["failures"] += 1
+        if attempts["failures"] > settings.ai_max_retries:
+            if isinstance(error, asyncio.TimeoutError):
+                raise AIExtractorError(f"AI service timed out after {attempts['failures']} attempts")
+            raise error
+        
+        self.upstream_counts["retries"] += 1
+        delay = jittered_backoff(
+            attempts["failures"] - 1, settings.ai_retry_backoff_seconds, settings.ai_retry_backoff_max_seconds
+        )
+        logger.warning(f"Transient upstream error, retrying in {delay:.2f}s: {str(error) or type(error).__name__}")
+        await asyncio.sleep(delay)
+    
+    async def _send(self, request: Dict[str, Any]) -> Any:
+        async with _extraction_slots:
+            self.upstream_counts["attempts"] += 1
+            started = time.monotonic()
+            try:
+                chat_completion = await asyncio.wait_for(
+                    self.client.chat.completions.create(**request),
+                    timeout=settings.ai_attempt_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                self.upstream_counts["timeouts"] += 1
+                raise
+            elapsed = time.monotonic() - started
+            self.latency.record(elapsed)
+            LLM_STAGE.observe(elapsed)
+            return chat_completion
+    
+    async def _send_hedged(self, request: Dict[str, Any], estimated_tokens: int) -> Any:
+        hedge_after = self.latency.percentile(settings.ai_hedge_percentile) if settings.ai_hedging_enabled else None
+        if hedge_after is None:
+            return await self._send(request)
+        
+        primary = asyncio.ensure_future(self._send(request))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done and self.scheduler.try_acquire(estimated_tokens):
+                self.upstream_counts["hedges"] += 1
+                logger.info(f"No response after {hedge_after:.2f}s, sending hedged request")
+                attempts.append(asyncio.ensure_future(self._send(request)))
+            
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not primary:
+                            self.upstream_counts["hedge_wins"] += 1
+                        return attempt.result()
+            return primary.result()
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+                elif not attempt.cancelled():
+                    attempt.exception()
+    
+    def _retry_after(self, error: RateLimitError) -> float:
+        try:
+            return max(0.0, float(error.response.headers.get("retry-after")))
+        except (AttributeError, TypeError, ValueError):
+            return settings.ai_rate_limit_default_retry_after
+    
+    def _pack(self, indexes: List[int], document_texts: List[str]) -> List[List[int]]:
+        budget = settings.ai_packing_token_budget
+        groups: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        
+        for index in indexes:
+            tokens = estimate_tokens(document_texts[index]) + PACKED_DOCUMENT_OVERHEAD_TOKENS
+            if tokens > budget:
+                groups.append([index])
+                continue
+            
+            if current and (
+                current_tokens + tokens > budget or len(current) >= settings.ai_packing_max_documents
+            ):
+                groups.append(current)
+                current, current_tokens = [], 0
+            
+            current.append(index)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _build_prompt(self, document_text: str, fields: Optional[List[str]] = None) -> str:
+        with PROMPT_STAGE.time():
+            return self._render_prompt(document_text, fields or REQUIRED_FIELDS)
+    
+    def _render_prompt(self, document_text: str, fields: List[str]) -> str:
+        field_list = "\n".join(f"- {field} ({FIELD_DESCRIPTIONS[field]})" for field in fields)
+        json_format = json.dumps({field: None for field in fields})
         return f"""Extract these fields from the insurance document as JSON:
-- policy_number (string or null)
-- vessel_name (string or null)  
-- policy_start_date (YYYY-MM-DD or null)
-- policy_end_date (YYYY-MM-DD or null)
-- insured_value (integer or null)
+{field_list}
 
 Rules:
 - Dates must be in YYYY-MM-DD format
@@ -72,10 +950,75 @@ Document:
 ---
 
 JSON format:
-{{"policy_number": null, "vessel_name": null, "policy_start_date": null, "policy_end_date": null, "insured_value": null}}
+{json_format}
+"""
+    
+    def _build_packed_prompt(self, document_texts: List[str]) -> str:
+        documents = "\n\n".join(
+            f"Document id={index}:\n---\n{document_text}\n---"
+            for index, document_text in enumerate(document_texts)
+        )
+        return f"""Extract these fields from each insurance document below:
+- policy_number (string or null)
+- vessel_name (string or null)
+- policy_start_date (YYYY-MM-DD or null)
+- policy_end_date (YYYY-MM-DD or null)
+- insured_value (integer or null)
+
+Rules:
+- Dates must be in YYYY-MM-DD format
+- Remove currency symbols from insured_value
+- Preserve negative values
+- Extract each document independently
+- Return only a JSON array with one object per document, no markdown or explanations
+
+{documents}
+
+JSON format:
+[{{"id": 0, "policy_number": null, "vessel_name": null, "policy_start_date": null, "policy_end_date": null, "insured_value": null}}]
 """
     
-    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+    def _parse_response(
+        self,
+        response_text: str,
+        fields: Optional[List[str]] = None,
+        mode: str = "text"
+    ) -> Dict[str, Any]:
+        extracted_data = self._load_json(response_text, mode, fields or REQUIRED_FIELDS)
+        if not isinstance(extracted_data, dict):
+            raise AIExtractorError("Invalid JSON response: expected an object")
+        
+        for field in fields or REQUIRED_FIELDS:
+            if field not in extracted_data:
+                extracted_data[field] = None
+        
+        return extracted_data
+    
+    def _parse_packed_response(self, response_text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+        items = self._load_json(response_text, fields=REQUIRED_FIELDS)
+        if not isinstance(items, list):
+            raise AIExtractorError("Invalid JSON response: expected an array")
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * count
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop("id"))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= index < count or results[index] is not None:
+                continue
+            if not all(field in item for field in REQUIRED_FIELDS):
+                continue
+            results[index] = {field: item[field] for field in REQUIRED_FIELDS}
+        
+        missing = sum(1 for item in results if item is None)
+        if missing:
+            logger.warning(f"Packed response missing {missing}/{count} documents")
+        return results
+    
+    def _load_json(self, response_text: str, mode: str = "text", fields: Optional[List[str]] = None) -> Any:
         if response_text.startswith("```json"):
             response_text = response_text[7:]
         elif response_text.startswith("```"):
@@ -86,15 +1029,35 @@ JSON format:
         
         response_text = response_text.strip()
         
-        try:
-            extracted_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON: {response_text}")
-            raise AIExtractorError(f"Invalid JSON response: {str(e)}")
-        
-        required_fields = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
-        for field in required_fields:
-            if field not in extracted_data:
-                extracted_data[field] = None
+        with PARSE_STAGE.time():
+            try:
+                parsed = json.loads(response_text)
+            except json.JSONDecodeError as e:
+                error = e
+            else:
+                self._record_parse(mode, "parsed")
+                return parsed
+            
+            repaired = repair_json(response_text)
+        if repaired is not None and not self._repair_drops_fields(repaired, fields):
+            self._record_parse(mode, "repaired")
+            repairs = _repairs.get()
+            if repairs is not None:
+                repairs.append(mode)
+            logger.warning(f"Repaired invalid JSON response: {str(error)}")
+            return repaired
         
-        return extracted_data
+        self._record_parse(mode, "failed")
+        logger.error(f"Invalid JSON: {response_text}")
+        raise AIExtractorError(f"Invalid JSON response: {str(error)}")
+    
+    def _repair_drops_fields(self, repaired: Any, fields: Optional[List[str]]) -> bool:
+        # A repair that lost a requested field would read as that field being absent from the document.
+        if fields is None:
+            return False
+        items = repaired if isinstance(repaired, list) else [repaired]
+        return any(isinstance(item, dict) and any(field not in item for field in fields) for item in items)
+    
+    def _record_parse(self, mode: str, result: str) -> None:
+        self.parse_counts[mode][result] += 1
+        PARSE_RESULTS.labels(mode, result).inc()
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_document(document_text: str) -> str:
+    return " ".join(document_text.split())
+
+
+def make_cache_key(document_text: str, model: str, temperature: float, prompt_version: str) -> str:
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, repr(temperature), normalize_document(document_text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(value)
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        size = self._estimate_size(key, value)
+        if size > self.max_bytes:
+            logger.warning(f"Skipping cache entry of {size} bytes (limit {self.max_bytes})")
+            return
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, dict(value))
+        self._bytes += size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _estimate_size(self, key: str, value: Dict[str, Any]) -> int:
+        return len(key) + len(json.dumps(value, default=str))
@@ -0,0 +1,80 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.models.schemas import ExtractedData
+from app.services.vessel_index import normalize_vessel_name
+
+EARLIEST_PLAUSIBLE_DATE = date(1950, 1, 1)
+LATEST_PLAUSIBLE_DATE = date(2100, 12, 31)
+
+
+class CascadeScore:
+    def __init__(self, score: float, reasons: List[str]):
+        self.score = score
+        self.reasons = reasons
+
+
+def parse_tiers(models: str, final_model: str) -> List[str]:
+    tiers = [model.strip() for model in models.split(",") if model.strip() and model.strip() != final_model]
+    return tiers + [final_model]
+
+
+def score_extraction(
+    data: Dict[str, Any],
+    fields: List[str],
+    hints: Optional[Dict[str, Any]] = None
+) -> CascadeScore:
+    try:
+        extracted = ExtractedData(**{field: data.get(field) for field in fields})
+    except ValidationError as e:
+        return CascadeScore(0.0, [f"schema: {e.error_count()} invalid fields"])
+
+    reasons = []
+    missing = [field for field in fields if getattr(extracted, field) is None]
+    completeness = 1 - len(missing) / len(fields) if fields else 1.0
+    if missing:
+        reasons.append(f"missing: {', '.join(missing)}")
+
+    dates = 1.0
+    # Reversed dates are a property of the document, which the validator reports; another tier reads the same.
+    for value in (extracted.policy_start_date, extracted.policy_end_date):
+        if value is not None and not EARLIEST_PLAUSIBLE_DATE <= value <= LATEST_PLAUSIBLE_DATE:
+            dates = 0.0
+            reasons.append(f"implausible date: {value.isoformat()}")
+
+    agreement = 1.0
+    compared = _compare_hints(extracted, fields, hints or {})
+    if compared:
+        disagreeing = [field for field, agrees in compared.items() if not agrees]
+        agreement = 1 - len(disagreeing) / len(compared)
+        if disagreeing:
+            reasons.append(f"disagrees with local parse: {', '.join(disagreeing)}")
+
+    return CascadeScore(completeness * dates * agreement, reasons)
+
+
+def _compare_hints(extracted: ExtractedData, fields: List[str], hints: Dict[str, Any]) -> Dict[str, bool]:
+    try:
+        expected = ExtractedData(**{field: value for field, value in hints.items() if value is not None})
+    except ValidationError:
+        return {}
+
+    compared = {}
+    for field in fields:
+        hint = getattr(expected, field, None)
+        if hint is None:
+            continue
+        compared[field] = _normalize(field, getattr(extracted, field)) == _normalize(field, hint)
+    return compared
+
+
+def _normalize(field: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if field == "vessel_name":
+        return normalize_vessel_name(value)
+    if field == "policy_number":
+        return value.strip().casefold()
+    return value
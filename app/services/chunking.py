@@ -0,0 +1,81 @@
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.tokens import CHARS_PER_TOKEN
+
+MERGE_POLICIES = ("vote", "first")
+
+WHITESPACE_PATTERN = re.compile(r"\s")
+
+
+def split_into_chunks(document_text: str, chunk_tokens: int, overlap_tokens: int) -> List[str]:
+    chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    overlap_chars = min(overlap_tokens * CHARS_PER_TOKEN, chunk_chars // 2)
+    if len(document_text) <= chunk_chars:
+        return [document_text]
+    
+    chunks = []
+    start = 0
+    while start < len(document_text):
+        end = min(len(document_text), start + chunk_chars)
+        if end < len(document_text):
+            boundary = max(
+                document_text.rfind("\n", start + chunk_chars // 2, end),
+                document_text.rfind(" ", start + chunk_chars // 2, end),
+            )
+            if boundary > start:
+                end = boundary
+        chunks.append(document_text[start:end].strip())
+        if end >= len(document_text):
+            break
+        next_start = end - overlap_chars
+        boundary = WHITESPACE_PATTERN.search(document_text, next_start, end)
+        if boundary:
+            next_start = boundary.end()
+        start = max(next_start, start + 1)
+    
+    return [chunk for chunk in chunks if chunk]
+
+
+def merge_chunk_results(
+    chunk_results: List[Optional[Dict[str, Any]]],
+    fields: List[str],
+    policy: str = "vote",
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy: {policy}")
+    
+    merged: Dict[str, Any] = {}
+    provenance: Dict[str, Dict[str, Any]] = {}
+    
+    for field in fields:
+        candidates = [
+            (index, result[field])
+            for index, result in enumerate(chunk_results)
+            if result is not None and result.get(field) is not None
+        ]
+        if not candidates:
+            merged[field] = None
+            provenance[field] = {"chunks": [], "candidates": 0}
+            continue
+        
+        keys = [_candidate_key(value) for _, value in candidates]
+        if policy == "first":
+            winner = keys[0]
+        else:
+            counts = Counter(keys)
+            best = max(counts.values())
+            winner = next(key for key in keys if counts[key] == best)
+        
+        chunks = [index for (index, _), key in zip(candidates, keys) if key == winner]
+        merged[field] = next(value for (_, value), key in zip(candidates, keys) if key == winner)
+        provenance[field] = {"chunks": chunks, "candidates": len(set(keys))}
+    
+    return merged, provenance
+
+
+def _candidate_key(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    return value
@@ -0,0 +1,168 @@
+import bisect
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.logging import get_logger
+from app.services.vessel_index import VesselMatch, bounded_levenshtein, normalize_vessel_name
+
+logger = get_logger(__name__)
+
+MAGIC = b"VREG\x00\x00\x00\x01"
+HEADER = struct.Struct("<8sII16s")
+OFFSET = struct.Struct("<I")
+SEPARATOR = b"\x00"
+
+COMPACT_SUFFIX = ".vreg"
+NEIGHBOR_SCAN = 32
+
+
+def load_names(path: Path) -> List[str]:
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            return []
+        header = [cell.strip().lower() for cell in rows[0]]
+        for column_name in ("vessel_name", "name", "vessel"):
+            if column_name in header:
+                column = header.index(column_name)
+                return [row[column].strip() for row in rows[1:] if len(row) > column and row[column].strip()]
+        return [row[0].strip() for row in rows if row and row[0].strip()]
+
+    with open(path, encoding="utf-8") as f:
+        names = json.load(f)
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError("Vessels JSON must be a list of names")
+    return names
+
+
+def compile_registry(names: List[str], output_path: Path) -> str:
+    entries = {}
+    for name in names:
+        key = normalize_vessel_name(name)
+        if key and key not in entries:
+            entries[key] = name
+
+    records = [
+        key.encode("utf-8") + SEPARATOR + entries[key].encode("utf-8")
+        for key in sorted(entries)
+    ]
+    data = b"".join(records)
+
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    version = hashlib.sha256(data).hexdigest()[:12]
+    header = HEADER.pack(MAGIC, len(records), 0, version.encode("ascii").ljust(16, b"\x00"))
+    table = b"".join(OFFSET.pack(offset) for offset in offsets)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header + table + data)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    logger.info(f"Compiled {len(records)} vessels to {output_path} (registry version {version})")
+    return version
+
+
+def read_version(path: Path) -> str:
+    with open(path, "rb") as f:
+        magic, _, _, version = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"Not a compiled vessel registry: {path}")
+    return version.rstrip(b"\x00").decode("ascii")
+
+
+class _Keys:
+    def __init__(self, index: "MappedVesselIndex"):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, position: int) -> str:
+        return self._index._key(position)
+
+
+class MappedVesselIndex:
+    def __init__(self, path: Path, max_edit_distance: int = 2):
+        self.path = Path(path)
+        self.max_edit_distance = max_edit_distance
+        with open(self.path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count, _, version = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a compiled vessel registry: {self.path}")
+        self.version = version.rstrip(b"\x00").decode("ascii")
+        self._table_start = HEADER.size
+        self._data_start = self._table_start + (self._count + 1) * OFFSET.size
+        self._names: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def names(self) -> List[str]:
+        if self._names is None:
+            self._names = [self._record(position)[1] for position in range(self._count)]
+        return self._names
+
+    def lookup(self, name: str) -> VesselMatch:
+        key = normalize_vessel_name(name)
+        if not key or not self._count:
+            return VesselMatch(None, 0.0, False)
+
+        position = bisect.bisect_left(_Keys(self), key)
+        if position < self._count:
+            found_key, canonical = self._record(position)
+            if found_key == key:
+                return VesselMatch(canonical, 1.0, True)
+
+        best = None
+        best_distance = self.max_edit_distance + 1
+        start = max(0, position - NEIGHBOR_SCAN)
+        end = min(self._count, position + NEIGHBOR_SCAN)
+        for candidate in range(start, end):
+            candidate_key, canonical = self._record(candidate)
+            distance = bounded_levenshtein(key, candidate_key, min(best_distance - 1, self.max_edit_distance))
+            if distance is not None and distance < best_distance:
+                best, best_distance = (candidate_key, canonical), distance
+
+        if best is None:
+            return VesselMatch(None, 0.0, False)
+
+        score = 1.0 - best_distance / max(len(key), len(best[0]))
+        return VesselMatch(best[1], round(score, 4), False)
+
+    def _offset(self, position: int) -> int:
+        return OFFSET.unpack_from(self._buffer, self._table_start + position * OFFSET.size)[0]
+
+    def _raw(self, position: int) -> bytes:
+        start = self._data_start + self._offset(position)
+        end = self._data_start + self._offset(position + 1)
+        return self._buffer[start:end]
+
+    def _key(self, position: int) -> str:
+        raw = self._raw(position)
+        return raw[:raw.index(SEPARATOR)].decode("utf-8")
+
+    def _record(self, position: int):
+        key, canonical = self._raw(position).split(SEPARATOR, 1)
+        return key.decode("utf-8"), canonical.decode("utf-8")
@@ -0,0 +1,224 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('total_bytes', 0);
+CREATE TRIGGER IF NOT EXISTS entries_after_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'total_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_after_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'total_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_after_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'total_bytes';
+END;
+"""
+
+TOUCH_INTERVAL_SECONDS = 60.0
+EVICTION_BATCH_SIZE = 256
+
+
+class DiskExtractionCache:
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int,
+        ttl_seconds: Optional[float] = None,
+        busy_timeout_ms: int = 5000
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect().executescript(SCHEMA)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, created_at, accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None:
+            self._count("misses")
+            return None
+        
+        value, created_at, accessed_at = row
+        now = time.time()
+        if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+            conn.execute("DELETE FROM entries WHERE key = ? AND created_at = ?", (key, created_at))
+            self._count("expirations")
+            self._count("misses")
+            return None
+        if now - accessed_at > TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        
+        self._count("hits")
+        return json.loads(value)
+    
+    def set(self, key: str, value: Dict[str, Any], model: str, prompt_version: str) -> None:
+        payload = json.dumps(value, default=str)
+        size = len(key) + len(payload)
+        if size > self.max_bytes:
+            logger.warning(f"Skipping disk cache entry of {size} bytes (limit {self.max_bytes})")
+            return
+        
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            """
+            INSERT INTO entries (key, value, size, model, prompt_version, created_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = excluded.value,
+                size = excluded.size,
+                model = excluded.model,
+                prompt_version = excluded.prompt_version,
+                created_at = excluded.created_at,
+                accessed_at = excluded.accessed_at
+            """,
+            (key, payload, size, model, prompt_version, now, now),
+        )
+        
+        if self.total_bytes() > self.max_bytes:
+            evicted = self.prune(max_bytes=int(self.max_bytes * 0.9))
+            with self._stats_lock:
+                self.evictions += evicted
+    
+    def total_bytes(self) -> int:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE name = 'total_bytes'"
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def prune(
+        self,
+        max_bytes: Optional[int] = None,
+        older_than: Optional[float] = None,
+        model: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+    ) -> int:
+        conn = self._connect()
+        removed = 0
+        
+        if self.ttl_seconds is not None:
+            expired = conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self._count("expirations", expired)
+            removed += expired
+        if older_than is not None:
+            removed += conn.execute(
+                "DELETE FROM entries WHERE accessed_at < ?", (time.time() - older_than,)
+            ).rowcount
+        if model is not None:
+            removed += conn.execute("DELETE FROM entries WHERE model = ?", (model,)).rowcount
+        if prompt_version is not None:
+            removed += conn.execute(
+                "DELETE FROM entries WHERE prompt_version = ?", (prompt_version,)
+            ).rowcount
+        
+        if max_bytes is not None:
+            while self.total_bytes() > max_bytes:
+                deleted = conn.execute(
+                    """
+                    DELETE FROM entries WHERE key IN (
+                        SELECT key FROM entries ORDER BY accessed_at LIMIT ?
+                    )
+                    """,
+                    (EVICTION_BATCH_SIZE,),
+                ).rowcount
+                if deleted == 0:
+                    break
+                removed += deleted
+        
+        if removed:
+            logger.info(f"Pruned {removed} disk cache entries")
+        return removed
+    
+    def clear(self) -> int:
+        return self._connect().execute("DELETE FROM entries").rowcount
+    
+    def entries(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            """
+            SELECT key, size, model, prompt_version, created_at, accessed_at
+            FROM entries ORDER BY accessed_at DESC LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+        columns = ["key", "size", "model", "prompt_version", "created_at", "accessed_at"]
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def stats(self) -> Dict[str, Any]:
+        count = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": count,
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+    
+    def close(self) -> None:
+        with self._stats_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            with self._stats_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
@@ -0,0 +1,135 @@
+import asyncio
+import importlib.util
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONNECTION_OPENED_EVENT = "connection.connect_tcp.complete"
+TLS_HANDSHAKE_EVENT = "connection.start_tls.complete"
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMConnectionPool:
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        connect_timeout: float,
+        read_timeout: float,
+        http2: bool = False,
+    ):
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested for LLM traffic but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=self.limits,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            event_hooks={"request": [self._on_request]},
+        )
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.prewarmed = 0
+
+    async def prewarm(self, base_url: str, connections: int) -> int:
+        async def touch() -> bool:
+            try:
+                await self.client.head(base_url)
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not pre-warm connection to {base_url}: {str(e) or type(e).__name__}")
+                return False
+
+        warmed = sum(await asyncio.gather(*(touch() for _ in range(connections))))
+        self.prewarmed += warmed
+        logger.info(f"Pre-warmed {warmed} connections to {base_url}")
+        return warmed
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_seconds": self.limits.keepalive_expiry,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused_requests": reused,
+            "reuse_rate": round(reused / self.requests, 4) if self.requests else None,
+            "prewarmed": self.prewarmed,
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == CONNECTION_OPENED_EVENT:
+            self.connections_opened += 1
+        elif event == TLS_HANDSHAKE_EVENT:
+            self.tls_handshakes += 1
+
+
+async def drain_stream(
+    response: httpx.Response,
+    max_bytes: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> bool:
+    # The SDK stops reading at the [DONE] event, before the end of the chunked body,
+    # and closing a response mid-body discards its connection instead of keeping it alive.
+    received = 0
+    try:
+        async with asyncio.timeout(timeout):
+            async for chunk in response.stream:
+                received += len(chunk)
+                if max_bytes is not None and received > max_bytes:
+                    return False
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        return False
+    return True
+
+
+_pool: Optional[LLMConnectionPool] = None
+
+
+def get_http_pool() -> LLMConnectionPool:
+    global _pool
+
+    if _pool is None:
+        _pool = LLMConnectionPool(
+            max_connections=settings.ai_http_max_connections,
+            max_keepalive_connections=settings.ai_http_max_keepalive_connections,
+            keepalive_expiry=settings.ai_http_keepalive_expiry_seconds,
+            connect_timeout=settings.ai_http_connect_timeout_seconds,
+            read_timeout=settings.ai_http_read_timeout_seconds,
+            http2=settings.ai_http2_enabled,
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    global _pool
+
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
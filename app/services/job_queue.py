@@ -0,0 +1,203 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+JOB_STATUSES = [QUEUED, RUNNING, SUCCEEDED, FAILED]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    document_text TEXT NOT NULL,
+    use_cache INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, created_at);
+"""
+
+JOB_COLUMNS = ["id", "status", "document_text", "use_cache", "result", "error", "attempts", "created_at", "updated_at"]
+
+
+class JobQueue:
+    def __init__(self, path: Path, lease_seconds: float, max_attempts: int, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "available_at" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN available_at REAL NOT NULL DEFAULT 0")
+
+    def enqueue(self, document_text: str, use_cache: bool = True) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            """
+            INSERT INTO jobs (id, status, document_text, use_cache, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (job_id, QUEUED, document_text, int(use_cache), now, now),
+        )
+        return job_id
+
+    def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        now = time.time()
+        expired = conn.execute(
+            """
+            UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE status = ? AND lease_expires_at < ? AND attempts >= ?
+            """,
+            (FAILED, json.dumps({"status_code": 500, "detail": "Job lease expired too many times"}),
+             now, RUNNING, now, self.max_attempts),
+        ).rowcount
+        if expired:
+            logger.warning(f"Failed {expired} jobs whose leases expired {self.max_attempts} times")
+
+        row = conn.execute(
+            f"""
+            UPDATE jobs SET status = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1, updated_at = ?
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?)
+                ORDER BY created_at LIMIT 1
+            )
+            RETURNING {", ".join(JOB_COLUMNS)}
+            """,
+            (RUNNING, owner, now + self.lease_seconds, now, QUEUED, now, RUNNING, now),
+        ).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def renew(self, job_id: str, owner: str) -> bool:
+        now = time.time()
+        return self._connect().execute(
+            """
+            UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+            WHERE id = ? AND status = ? AND lease_owner = ?
+            """,
+            (now + self.lease_seconds, now, job_id, RUNNING, owner),
+        ).rowcount == 1
+
+    def complete(self, job_id: str, owner: str, result: Dict[str, Any]) -> bool:
+        return self._finish(job_id, owner, SUCCEEDED, result=json.dumps(result))
+
+    def fail(
+        self,
+        job_id: str,
+        owner: str,
+        status_code: int,
+        detail: str,
+        retry: bool = False,
+        delay_seconds: float = 0.0
+    ) -> bool:
+        error = json.dumps({"status_code": status_code, "detail": detail})
+        if retry:
+            now = time.time()
+            requeued = self._connect().execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    available_at = ?, updated_at = ?
+                WHERE id = ? AND status = ? AND lease_owner = ? AND attempts < ?
+                """,
+                (QUEUED, error, now + delay_seconds, now, job_id, RUNNING, owner, self.max_attempts),
+            ).rowcount
+            if requeued:
+                return True
+        return self._finish(job_id, owner, FAILED, error=error)
+
+    def release(self, job_id: str, owner: str) -> bool:
+        return self._connect().execute(
+            """
+            UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = ?
+            WHERE id = ? AND status = ? AND lease_owner = ?
+            """,
+            (QUEUED, time.time(), job_id, RUNNING, owner),
+        ).rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status: 0 for status in JOB_STATUSES}
+        conn = self._connect()
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        delayed = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ? AND available_at > ?", (QUEUED, time.time())
+        ).fetchone()[0]
+        return {"path": str(self.path), **counts, "delayed": delayed}
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _finish(self, job_id: str, owner: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        finished = self._connect().execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = ?
+            WHERE id = ? AND status = ? AND lease_owner = ?
+            """,
+            (status, result, error, time.time(), job_id, RUNNING, owner),
+        ).rowcount == 1
+        if not finished:
+            logger.warning(f"Lost the lease on job {job_id}, discarding its outcome")
+        return finished
+
+    def _to_job(self, row: tuple) -> Dict[str, Any]:
+        job = dict(zip(JOB_COLUMNS, row))
+        job["use_cache"] = bool(job["use_cache"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["error"] = json.loads(job["error"]) if job["error"] else None
+        return job
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
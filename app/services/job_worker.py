@@ -0,0 +1,132 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.logging import get_logger
+from app.services.job_queue import JobQueue
+from app.services.resilience import jittered_backoff
+from app.utils.exceptions import JobProcessingError
+
+logger = get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 503}
+
+
+JobProcessor = Callable[[str, bool], Awaitable[Dict[str, Any]]]
+
+
+class JobWorkerPool:
+    def __init__(
+        self,
+        queue: JobQueue,
+        process: JobProcessor,
+        concurrency: int,
+        poll_seconds: float,
+        retry_backoff_seconds: float = 2.0,
+        retry_backoff_max_seconds: float = 60.0
+    ):
+        self.queue = queue
+        self.process = process
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_backoff_max_seconds = retry_backoff_max_seconds
+        self.owner_prefix = uuid.uuid4().hex[:8]
+        self._tasks: List[asyncio.Task] = []
+        self._calls: Set[asyncio.Future] = set()
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(f"{self.owner_prefix}-{slot}")) for slot in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} job workers")
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Cancelling a task does not stop its thread; wait so the queue is not closed under it.
+        await asyncio.gather(*self._calls, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "busy": self.busy,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            **self.queue.stats(),
+        }
+
+    async def _work(self, owner: str) -> None:
+        while True:
+            try:
+                job = await self._call(self.queue.claim, owner)
+            except Exception as e:
+                logger.error(f"Job claim failed: {str(e)}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            await self._run(job, owner)
+
+    async def _run(self, job: Dict[str, Any], owner: str) -> None:
+        job_id = job["id"]
+        logger.info(f"Processing job {job_id} (attempt {job['attempts']})")
+        self.busy += 1
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, owner))
+        try:
+            result = await self.process(job["document_text"], job["use_cache"])
+        except asyncio.CancelledError:
+            await self._call(self.queue.release, job_id, owner)
+            raise
+        except JobProcessingError as e:
+            retry = e.status_code in RETRYABLE_STATUS_CODES
+            delay = self._retry_delay(job["attempts"], e.retry_after) if retry else 0.0
+            await self._call(self.queue.fail, job_id, owner, e.status_code, e.detail, retry, delay)
+            if retry:
+                self.retried += 1
+                logger.warning(f"Job {job_id} failed with {e.status_code}, retrying in {delay:.1f}s: {e.detail}")
+            else:
+                self.failed += 1
+                logger.warning(f"Job {job_id} failed with {e.status_code}: {e.detail}")
+        except Exception as e:
+            await self._call(self.queue.fail, job_id, owner, 500, f"Internal error: {str(e)}")
+            self.failed += 1
+            logger.error(f"Job {job_id} failed: {str(e)}")
+        else:
+            await self._call(self.queue.complete, job_id, owner, result)
+            self.processed += 1
+            logger.info(f"Job {job_id} succeeded")
+        finally:
+            heartbeat.cancel()
+            self.busy -= 1
+
+    async def _heartbeat(self, job_id: str, owner: str, interval: Optional[float] = None) -> None:
+        interval = interval or self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await self._call(self.queue.renew, job_id, owner):
+                logger.warning(f"Could not renew lease on job {job_id}")
+                return
+
+    def _retry_delay(self, attempts: int, retry_after: Optional[float]) -> float:
+        backoff = self.retry_backoff_seconds + jittered_backoff(
+            attempts - 1, self.retry_backoff_seconds, self.retry_backoff_max_seconds
+        )
+        return max(min(backoff, self.retry_backoff_max_seconds), retry_after or 0.0)
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        call = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._calls.add(call)
+        call.add_done_callback(self._calls.discard)
+        return await asyncio.shield(call)
@@ -0,0 +1,107 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+FENCED_BLOCK_PATTERN = re.compile(r"```[\w-]*[ \t]*\n?(.*?)(?:```|$)", re.DOTALL)
+KEY_SEPARATOR_PATTERN = re.compile(r"\s*:")
+PYTHON_LITERALS = {"None": "null", "True": "true", "False": "false"}
+CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> Optional[Any]:
+    fenced = FENCED_BLOCK_PATTERN.search(text)
+    if fenced is not None:
+        text = fenced.group(1)
+
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        return None
+
+    repaired = _rebalance(text[min(starts):])
+    if repaired is None:
+        return None
+    try:
+        return json.loads(repaired)
+    except json.JSONDecodeError:
+        return None
+
+
+def _rebalance(text: str) -> Optional[str]:
+    out: List[str] = []
+    stack: List[str] = []
+    checkpoint: Optional[Tuple[int, List[str]]] = None
+    quote: Optional[str] = None
+    escaped = False
+    index = 0
+
+    while index < len(text):
+        char = text[index]
+        index += 1
+
+        if quote is not None:
+            if escaped:
+                escaped = False
+                if char == "'":
+                    out[-1] = char
+                else:
+                    out.append(char)
+            elif char == "\\":
+                escaped = True
+                out.append(char)
+            elif char == quote:
+                quote = None
+                out.append('"')
+            elif char == '"':
+                out.append('\\"')
+            else:
+                out.append(char)
+            continue
+
+        if char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+            out.append(char)
+            checkpoint = (len(out), list(stack))
+        elif char in "}]":
+            if not stack or stack[-1] != char:
+                return None
+            _strip_trailing_comma(out)
+            stack.pop()
+            out.append(char)
+            if not stack:
+                return "".join(out)
+        elif char == ",":
+            out.append(char)
+            checkpoint = (len(out), list(stack))
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < len(text) and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[index - 1:end]
+            if KEY_SEPARATOR_PATTERN.match(text, end):
+                out.append(f'"{word}"')
+            else:
+                out.append(PYTHON_LITERALS.get(word, word))
+            index = end
+        else:
+            out.append(char)
+
+    # Truncated output: close what is still open, unless that would drop a member that was cut off.
+    if checkpoint is None:
+        return None
+    length, stack = checkpoint
+    if "".join(out[length:]).strip():
+        return None
+    del out[length:]
+    _strip_trailing_comma(out)
+    return "".join(out) + "".join(reversed(stack))
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    end = len(out)
+    while end and out[end - 1].isspace():
+        end -= 1
+    if end and out[end - 1] == ",":
+        del out[end - 1:]
@@ -0,0 +1,77 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+LEADING_FENCE_PATTERN = re.compile(r"\s*```[\w-]*[ \t]*\n?")
+FIRST_KEY_PATTERN = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+KEY_PATTERN = re.compile(r'\s*,\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+OBJECT_END_PATTERN = re.compile(r"\s*,?\s*}")
+
+
+class IncrementalJSONParser:
+    def __init__(self, fields: List[str]):
+        self.fields = list(fields)
+        self._decoder = json.JSONDecoder()
+        self.reset()
+
+    def reset(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.text = ""
+        self.started = False
+        self.closed = False
+        self.stopped_early = False
+        self._position: Optional[int] = None
+        self._members = 0
+
+    @property
+    def done(self) -> bool:
+        return self.closed or all(field in self.values for field in self.fields)
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        self.text += delta
+        if self.closed:
+            return []
+        if self._position is None and not self._find_object_start():
+            return []
+
+        completed = []
+        while not self.closed:
+            if OBJECT_END_PATTERN.match(self.text, self._position):
+                self.closed = True
+                break
+
+            key_match = (KEY_PATTERN if self._members else FIRST_KEY_PATTERN).match(self.text, self._position)
+            if key_match is None:
+                break
+            try:
+                value, end = self._decoder.raw_decode(self.text, key_match.end())
+            except json.JSONDecodeError:
+                break
+            if end >= len(self.text):
+                break
+
+            self._position = end
+            self._members += 1
+            key = json.loads(f'"{key_match.group(1)}"')
+            if key in self.fields and key not in self.values:
+                self.values[key] = value
+                completed.append((key, value))
+        return completed
+
+    def stop(self) -> None:
+        self.stopped_early = True
+
+    def result(self) -> Dict[str, Any]:
+        return {field: self.values.get(field) for field in self.fields}
+
+    def _find_object_start(self) -> bool:
+        fence = LEADING_FENCE_PATTERN.match(self.text)
+        if fence is not None and not fence.group(0).endswith("\n") and fence.end() == len(self.text):
+            return False
+
+        start = self.text.find("{", fence.end() if fence is not None else 0)
+        if start < 0:
+            return False
+        self.started = True
+        self._position = start + 1
+        return True
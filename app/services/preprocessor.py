@@ -0,0 +1,147 @@
+import re
+from typing import List
+
+from app.core.logging import get_logger
+from app.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+logger = get_logger(__name__)
+
+EMAIL_HEADER_PATTERN = re.compile(
+    r"^(?:to|cc|bcc|from|sent|date|reply-to|received|message-id|mime-version|content-type|x-[\w-]+)\s*:",
+    re.IGNORECASE,
+)
+SIGNATURE_DELIMITER_PATTERN = re.compile(r"^(?:--|__+|-{3,})\s*$")
+VALEDICTION_PATTERN = re.compile(
+    r"^(?:thanks|thank you|regards|best regards|kind regards|best|sincerely|cheers)[,!.]?\s*$",
+    re.IGNORECASE,
+)
+BOILERPLATE_PATTERN = re.compile(
+    r"confidential|intended (?:solely )?for the (?:use of the )?(?:named )?(?:addressee|recipient)|"
+    r"disclaimer|unsubscribe|subject to the terms and conditions|"
+    r"if you have received this (?:e-?mail|message) in error|do not (?:print|reply)|"
+    r"all rights reserved|privileged",
+    re.IGNORECASE,
+)
+FIELD_SIGNAL_PATTERN = re.compile(
+    r"polic(?:y|ies)|reference|vessel|ship|\bmv\b|m/v|insured|sum|value|\$|usd|premium|"
+    r"effective|start|inception|commenc|expir|end date|until|coverage|period|term|"
+    r"\b\d{4}\b|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec",
+    re.IGNORECASE,
+)
+HORIZONTAL_WHITESPACE_PATTERN = re.compile(r"[ \t\f\v\u00a0]+")
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?;])\s+")
+FIELD_VALUE_PATTERN = re.compile(r"\d|['\"‘’“”]|\bvessel\b", re.IGNORECASE)
+
+SIGNATURE_MAX_LINES = 6
+WINDOW_SEGMENT_CHARS = 400
+WINDOW_CONTEXT_LINES = 1
+WINDOW_GAP_MARKER = "..."
+
+
+class DocumentPreprocessor:
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+
+    def process(self, document_text: str, window: bool = True) -> str:
+        processed = self.clean(document_text)
+        if window:
+            processed = self.window(processed)
+        self.log_reduction(document_text, processed)
+        return processed
+
+    def log_reduction(self, document_text: str, processed: str) -> None:
+        before = estimate_tokens(document_text)
+        after = estimate_tokens(processed)
+        logger.info(f"Preprocessed document: {before} -> {after} estimated tokens")
+
+    def clean(self, document_text: str) -> str:
+        lines = self._normalize_lines(document_text)
+        lines = self._strip_email_headers(lines)
+        lines = self._strip_signature(lines)
+        lines = self._strip_boilerplate(lines)
+        return "\n".join(lines).strip()
+
+    def window(self, document_text: str) -> str:
+        if estimate_tokens(document_text) <= self.token_budget:
+            return document_text
+
+        lines = self._segment(document_text)
+        scores = [len(FIELD_SIGNAL_PATTERN.findall(line)) for line in lines]
+        ranked = sorted(
+            (index for index, score in enumerate(scores) if score > 0),
+            key=lambda index: (-scores[index], index),
+        )
+
+        budget_chars = self.token_budget * CHARS_PER_TOKEN
+        selected = set()
+        used = 0
+        for index in ranked:
+            start = max(0, index - WINDOW_CONTEXT_LINES)
+            end = min(len(lines), index + WINDOW_CONTEXT_LINES + 1)
+            added = [i for i in range(start, end) if i not in selected]
+            cost = sum(len(lines[i]) + 1 for i in added)
+            if used + cost > budget_chars:
+                continue
+            selected.update(added)
+            used += cost
+
+        if not selected:
+            return document_text[:budget_chars]
+
+        windowed: List[str] = []
+        previous = -1
+        for index in sorted(selected):
+            if previous >= 0 and index != previous + 1:
+                windowed.append(WINDOW_GAP_MARKER)
+            windowed.append(lines[index])
+            previous = index
+        return "\n".join(windowed)
+
+    def _segment(self, document_text: str) -> List[str]:
+        segments = []
+        for line in document_text.split("\n"):
+            if len(line) > WINDOW_SEGMENT_CHARS:
+                segments.extend(SENTENCE_BREAK_PATTERN.split(line))
+            else:
+                segments.append(line)
+        return segments
+
+    def _normalize_lines(self, document_text: str) -> List[str]:
+        lines = []
+        blank = False
+        for raw_line in document_text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+            line = HORIZONTAL_WHITESPACE_PATTERN.sub(" ", raw_line).strip()
+            if not line:
+                if not blank and lines:
+                    lines.append("")
+                blank = True
+                continue
+            lines.append(line)
+            blank = False
+        return lines
+
+    def _strip_email_headers(self, lines: List[str]) -> List[str]:
+        index = 0
+        while index < len(lines) and EMAIL_HEADER_PATTERN.match(lines[index]):
+            index += 1
+        return lines[index:]
+
+    def _strip_signature(self, lines: List[str]) -> List[str]:
+        tail_start = max(0, len(lines) - SIGNATURE_MAX_LINES)
+        for index in range(len(lines) - 1, tail_start - 1, -1):
+            line = lines[index]
+            if SIGNATURE_DELIMITER_PATTERN.match(line) or VALEDICTION_PATTERN.match(line):
+                if not any(self._has_field_value(rest) for rest in lines[index + 1:]):
+                    return lines[:index]
+        return lines
+
+    def _strip_boilerplate(self, lines: List[str]) -> List[str]:
+        kept = []
+        for line in lines:
+            if BOILERPLATE_PATTERN.search(line) and not self._has_field_value(line):
+                continue
+            kept.append(line)
+        return kept
+
+    def _has_field_value(self, line: str) -> bool:
+        return bool(FIELD_VALUE_PATTERN.search(line))
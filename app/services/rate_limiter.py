@@ -0,0 +1,137 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.logging import get_logger
+from app.utils.exceptions import UpstreamRateLimitError
+
+logger = get_logger(__name__)
+
+SECONDS_PER_MINUTE = 60.0
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_per_second = per_minute / SECONDS_PER_MINUTE
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def wait_time(self, amount: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+    def drain(self) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+
+class RateLimitScheduler:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_queue: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_queue = max_queue
+        self._turn = asyncio.Lock()
+        self._blocked_until = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise UpstreamRateLimitError(
+                f"Upstream queue full ({self.queue_depth} waiting)", retry_after=self._suggested_retry_after()
+            )
+
+        started = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._turn:
+                while True:
+                    wait = max(
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(estimated_tokens),
+                        self._blocked_until - time.monotonic(),
+                    )
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        if waited > 0.001:
+            self.delayed += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def try_acquire(self, estimated_tokens: int) -> bool:
+        if self.queue_depth or time.monotonic() < self._blocked_until:
+            return False
+        if self.requests.wait_time(1) > 0 or self.tokens.wait_time(estimated_tokens) > 0:
+            return False
+        self.requests.consume(1)
+        self.tokens.consume(estimated_tokens)
+        self.admitted += 1
+        return True
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        if actual_tokens is not None and not self.tokens.unlimited:
+            self.tokens.adjust(actual_tokens - min(estimated_tokens, self.tokens.capacity))
+
+    def penalize(self, retry_after: float) -> None:
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self.requests.drain()
+        self.tokens.drain()
+        logger.warning(f"Upstream rate limited, pausing LLM calls for {retry_after:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "average_wait_seconds": round(self.total_wait_seconds / self.admitted, 4) if self.admitted else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+        }
+
+    def _suggested_retry_after(self) -> float:
+        return max(1.0, self._blocked_until - time.monotonic())
@@ -0,0 +1,93 @@
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.core.logging import get_logger
+from app.utils.exceptions import CircuitOpenError
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def jittered_backoff(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    return random.uniform(0, min(max_seconds, base_seconds * 2 ** attempt))
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        p99 = self.percentile(0.99)
+        return {
+            "samples": len(self._samples),
+            "p50_seconds": round(p50, 4) if p50 is not None else None,
+            "p95_seconds": round(p95, 4) if p95 is not None else None,
+            "p99_seconds": round(p99, 4) if p99 is not None else None,
+        }
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+
+    def check(self) -> None:
+        if self.state == CLOSED:
+            return
+
+        remaining = self._opened_at + self.reset_seconds - time.monotonic()
+        if remaining > 0:
+            self.rejected += 1
+            raise CircuitOpenError("AI service unavailable, circuit breaker open", retry_after=remaining)
+
+        self.state = HALF_OPEN
+        self._opened_at = time.monotonic()
+        logger.info("Circuit breaker half-open, sending probe request")
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit breaker closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                logger.warning(
+                    f"Circuit breaker open after {self.consecutive_failures} failures, "
+                    f"failing fast for {self.reset_seconds}s"
+                )
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
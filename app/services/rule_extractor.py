@@ -0,0 +1,167 @@
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+FIELDS = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
+
+LABELED_CONFIDENCE = 0.95
+UNLABELED_CONFIDENCE = 0.7
+AMBIGUOUS_CONFIDENCE = 0.3
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_MONTH = r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(?P<year>\d{4})"
+
+DATE_PATTERNS = [
+    re.compile(r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})"),
+    re.compile(_MONTH + r"\s+" + _DAY + r",?\s+" + _YEAR, re.IGNORECASE),
+    re.compile(_DAY + r"(?:\s+of)?\s+" + _MONTH + r",?\s+" + _YEAR, re.IGNORECASE),
+]
+
+DATE_TEXT = r"(?:\d{4}-\d{1,2}-\d{1,2}|[A-Za-z]{3,9}\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}|\d{1,2}(?:st|nd|rd|th)?(?:\s+of)?\s+[A-Za-z]{3,9}\.?,?\s+\d{4})"
+
+POLICY_NUMBER_PATTERN = re.compile(
+    r"\b(?:policy\s*(?:number|no\.?|#|id|ref(?:erence)?)|reference\s+(?:number|no\.?))"
+    r"(?:\s+is)?\s*[:#]?\s*(?P<value>[A-Z0-9][A-Z0-9/-]{3,}[A-Z0-9])\b",
+    re.IGNORECASE,
+)
+
+VESSEL_QUOTED_PATTERN = re.compile(
+    r"\bvessel(?:\s+(?:named|name|called))?\s*:?\s*['\"‘“](?P<value>[^'\"’”\n]{2,60})['\"’”]",
+    re.IGNORECASE,
+)
+VESSEL_LABEL_PATTERN = re.compile(
+    r"^[\s*-]*vessel(?:\s+name)?\s*:\s*(?P<value>[A-Za-z0-9][\w .'/-]{1,60}?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+START_DATE_PATTERN = re.compile(
+    r"\b(?:effective\s+date|start\s+date|inception\s+date|commencement\s+date|"
+    r"effective\s+from|coverage\s+from|period\s+from|commenc(?:es|ing)\s+on)"
+    r"\s*[:\-]?\s*(?:on\s+)?(?P<value>" + DATE_TEXT + r")",
+    re.IGNORECASE,
+)
+END_DATE_PATTERN = re.compile(
+    r"\b(?:expiration\s+date|expiry\s+date|end\s+date|termination\s+date|"
+    r"expires?\s+on|expiring\s+on|valid\s+until)"
+    r"\s*[:\-]?\s*(?P<value>" + DATE_TEXT + r")",
+    re.IGNORECASE,
+)
+
+AMOUNT_TEXT = r"-?\s*\$?\s*-?\d[\d,]*(?:\.\d+)?(?:\s*(?:million|m)\b)?"
+
+INSURED_VALUE_PATTERN = re.compile(
+    r"\b(?:insured\s+value|sum\s+insured|insured\s+amount|total\s+insured)"
+    r"(?:\s+(?:of|is|as))?\s*:?\s*(?P<value>" + AMOUNT_TEXT + r")",
+    re.IGNORECASE,
+)
+DOLLAR_AMOUNT_PATTERN = re.compile(r"(?P<value>-?\s*\$\s*-?\d[\d,]*(?:\.\d+)?(?:\s*(?:million|m)\b)?)", re.IGNORECASE)
+
+
+def parse_date(text: str) -> Optional[date]:
+    for pattern in DATE_PATTERNS:
+        match = pattern.fullmatch(text.strip())
+        if not match:
+            continue
+        month = match.group("month")
+        month_number = int(month) if month.isdigit() else MONTHS.get(month.lower()[:3])
+        try:
+            return date(int(match.group("year")), month_number, int(match.group("day")))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def parse_amount(text: str) -> Optional[int]:
+    negative = "-" in text
+    multiplier = 1_000_000 if re.search(r"(million|m)\s*$", text, re.IGNORECASE) else 1
+    digits = re.search(r"\d[\d,]*(?:\.\d+)?", text)
+    if not digits:
+        return None
+    try:
+        value = float(digits.group(0).replace(",", ""))
+    except ValueError:
+        return None
+    value = int(round(value * multiplier))
+    return -value if negative else value
+
+
+class RuleExtractionResult:
+    def __init__(self):
+        self.data: Dict[str, Any] = {field: None for field in FIELDS}
+        self.confidence: Dict[str, float] = {field: 0.0 for field in FIELDS}
+
+    def set(self, field: str, value: Any, confidence: float) -> None:
+        self.data[field] = value
+        self.confidence[field] = confidence
+
+    def missing_fields(self, min_confidence: float) -> List[str]:
+        return [field for field in FIELDS if self.confidence[field] < min_confidence]
+
+
+class RuleBasedExtractor:
+    def extract(self, document_text: str) -> RuleExtractionResult:
+        result = RuleExtractionResult()
+
+        self._extract_field(result, "policy_number", [POLICY_NUMBER_PATTERN], document_text, self._policy_number)
+        self._extract_field(
+            result, "vessel_name", [VESSEL_QUOTED_PATTERN, VESSEL_LABEL_PATTERN], document_text, self._vessel_name
+        )
+        self._extract_field(result, "policy_start_date", [START_DATE_PATTERN], document_text, self._date)
+        self._extract_field(result, "policy_end_date", [END_DATE_PATTERN], document_text, self._date)
+        self._extract_field(result, "insured_value", [INSURED_VALUE_PATTERN], document_text, parse_amount)
+
+        if result.data["insured_value"] is None:
+            amounts = self._distinct(
+                parse_amount(match.group("value")) for match in DOLLAR_AMOUNT_PATTERN.finditer(document_text)
+            )
+            if len(amounts) == 1:
+                result.set("insured_value", amounts[0], UNLABELED_CONFIDENCE)
+
+        logger.debug(f"Rule-based confidence: {result.confidence}")
+        return result
+
+    def _extract_field(
+        self,
+        result: RuleExtractionResult,
+        field: str,
+        patterns: List[re.Pattern],
+        document_text: str,
+        convert: Callable[[str], Any],
+    ) -> None:
+        for pattern in patterns:
+            values = self._distinct(convert(match.group("value")) for match in pattern.finditer(document_text))
+            if len(values) == 1:
+                result.set(field, values[0], LABELED_CONFIDENCE)
+                return
+            if len(values) > 1:
+                result.set(field, None, AMBIGUOUS_CONFIDENCE)
+                return
+
+    def _distinct(self, values) -> List[Any]:
+        distinct = []
+        for value in values:
+            if value is not None and value not in distinct:
+                distinct.append(value)
+        return distinct
+
+    def _policy_number(self, text: str) -> Optional[str]:
+        value = text.strip()
+        return value if any(char.isdigit() for char in value) else None
+
+    def _vessel_name(self, text: str) -> Optional[str]:
+        value = text.strip().rstrip(".,")
+        return value or None
+
+    def _date(self, text: str) -> Optional[str]:
+        parsed = parse_date(" ".join(text.split()))
+        return parsed.isoformat() if parsed else None
@@ -0,0 +1,58 @@
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from app.models.schemas import ExtractedData
+from app.utils.tokens import CHARS_PER_TOKEN
+
+RESPONSE_FORMAT = {"type": "json_object"}
+
+# Widest value the model should ever need to write for each JSON schema type.
+STRING_VALUE_CHARS = 80
+DATE_VALUE_CHARS = 10
+INTEGER_VALUE_CHARS = 19
+OUTPUT_TOKEN_MARGIN = 1.5
+OUTPUT_TOKEN_OVERHEAD = 16
+
+
+def field_schema(fields: List[str]) -> Dict[str, Any]:
+    properties = _schema_properties()
+    return {
+        "type": "object",
+        "properties": {field: _strip_titles(properties[field]) for field in fields},
+        "required": list(fields),
+        "additionalProperties": False,
+    }
+
+
+def system_prompt(base_prompt: str, fields: List[str]) -> str:
+    schema = json.dumps(field_schema(fields), separators=(",", ":"))
+    return f"{base_prompt} Respond with one JSON object matching this JSON schema: {schema}"
+
+
+def max_output_tokens(fields: List[str]) -> int:
+    properties = field_schema(fields)["properties"]
+    widest = {field: _widest_value(schema) for field, schema in properties.items()}
+    chars = len(json.dumps(widest, indent=2))
+    return math.ceil(chars / CHARS_PER_TOKEN * OUTPUT_TOKEN_MARGIN) + OUTPUT_TOKEN_OVERHEAD
+
+
+@lru_cache(maxsize=1)
+def _schema_properties() -> Dict[str, Any]:
+    return ExtractedData.model_json_schema()["properties"]
+
+
+def _widest_value(schema: Dict[str, Any]) -> Any:
+    candidates = [None]
+    for option in schema.get("anyOf", [schema]):
+        if option.get("type") == "string":
+            width = DATE_VALUE_CHARS if option.get("format") == "date" else option.get("maxLength", STRING_VALUE_CHARS)
+            candidates.append("x" * width)
+        elif option.get("type") == "integer":
+            candidates.append(int("9" * INTEGER_VALUE_CHARS))
+    return max(candidates, key=lambda value: len(json.dumps(value)))
+
+
+def _strip_titles(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in schema.items() if key not in ("title", "default")}
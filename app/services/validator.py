@@ -1,25 +1,62 @@
-import json
-from typing import List
-from pathlib import Path
+from typing import List, Optional
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.models.schemas import ExtractedData, ValidationResult
+from app.services.vessel_index import VesselIndex
+from app.services.vessel_registry import RegistrySnapshot, VesselRegistry
 
 logger = get_logger(__name__)
 
+RULE_FIELDS = {
+    "Date Consistency": ["policy_start_date", "policy_end_date"],
+    "Value Check": ["insured_value"],
+    "Vessel Name Match": ["vessel_name"],
+    "Completeness Check": ["policy_number"],
+}
+
 
 class DocumentValidator:
-    def __init__(self):
-        self.valid_vessels = self._load_valid_vessels()
+    def __init__(self, registry: Optional[VesselRegistry] = None):
+        self.registry = registry or VesselRegistry(
+            settings.valid_vessels_file, max_edit_distance=settings.vessel_max_edit_distance
+        )
+    
+    @property
+    def valid_vessels(self) -> List[str]:
+        return self.registry.snapshot.names
+    
+    @property
+    def vessel_index(self) -> VesselIndex:
+        return self.registry.snapshot.index
     
-    def validate(self, extracted_data: ExtractedData) -> List[ValidationResult]:
-        results = []
-        results.append(self._validate_dates(extracted_data))
-        results.append(self._validate_value(extracted_data))
-        results.append(self._validate_vessel(extracted_data))
-        results.append(self._validate_policy_number(extracted_data))
-        return results
+    def snapshot(self) -> RegistrySnapshot:
+        return self.registry.snapshot
+    
+    def validate(
+        self,
+        extracted_data: ExtractedData,
+        snapshot: Optional[RegistrySnapshot] = None
+    ) -> List[ValidationResult]:
+        snapshot = snapshot or self.registry.snapshot
+        return [self.validate_rule(rule, extracted_data, snapshot) for rule in RULE_FIELDS]
+    
+    def validate_rule(
+        self,
+        rule: str,
+        extracted_data: ExtractedData,
+        snapshot: Optional[RegistrySnapshot] = None
+    ) -> ValidationResult:
+        if rule == "Date Consistency":
+            return self._validate_dates(extracted_data)
+        if rule == "Value Check":
+            return self._validate_value(extracted_data)
+        if rule == "Vessel Name Match":
+            snapshot = snapshot or self.registry.snapshot
+            return self._validate_vessel(extracted_data, snapshot.index)
+        if rule == "Completeness Check":
+            return self._validate_policy_number(extracted_data)
+        raise ValueError(f"Unknown rule: {rule}")
     
     def _validate_dates(self, data: ExtractedData) -> ValidationResult:
         if data.policy_start_date is None or data.policy_end_date is None:
@@ -63,7 +100,7 @@ class DocumentValidator:
             message="Insured value must be a positive number."
         )
     
-    def _validate_vessel(self, data: ExtractedData) -> ValidationResult:
+    def _validate_vessel(self, data: ExtractedData, index: Optional[VesselIndex] = None) -> ValidationResult:
         if not data.vessel_name or data.vessel_name.strip() == "":
             return ValidationResult(
                 rule="Vessel Name Match",
@@ -71,17 +108,29 @@ class DocumentValidator:
                 message="Vessel name is missing."
             )
         
-        if data.vessel_name in self.valid_vessels:
+        match = (index or self.vessel_index).lookup(data.vessel_name)
+        details = {"matched_name": match.canonical, "similarity": match.score}
+        
+        if match.exact or (match.canonical and settings.vessel_fuzzy_auto_accept):
+            if match.canonical == data.vessel_name:
+                message = f"Vessel '{data.vessel_name}' is on the approved list."
+            else:
+                message = f"Vessel '{data.vessel_name}' matches approved vessel '{match.canonical}'."
             return ValidationResult(
                 rule="Vessel Name Match",
                 status="PASS",
-                message=f"Vessel '{data.vessel_name}' is on the approved list."
+                message=message,
+                details=details
             )
         
+        message = f"Vessel '{data.vessel_name}' is not on the approved list."
+        if match.canonical:
+            message += f" Closest match: '{match.canonical}' (similarity {match.score:.2f})."
         return ValidationResult(
             rule="Vessel Name Match",
             status="FAIL",
-            message=f"Vessel '{data.vessel_name}' is not on the approved list."
+            message=message,
+            details=details
         )
     
     def _validate_policy_number(self, data: ExtractedData) -> ValidationResult:
@@ -97,16 +146,3 @@ class DocumentValidator:
             status="PASS",
             message="Policy number is present."
         )
-    
-    def _load_valid_vessels(self) -> List[str]:
-        try:
-            with open(settings.valid_vessels_file, 'r') as f:
-                vessels = json.load(f)
-                logger.info(f"Loaded {len(vessels)} valid vessels")
-                return vessels
-        except FileNotFoundError:
-            logger.error(f"Vessels file not found: {settings.valid_vessels_file}")
-            return []
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid vessels JSON: {e}")
-            return []
@@ -0,0 +1,105 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+VESSEL_PREFIX_PATTERN = re.compile(r"^(?:m\s*[/.]?\s*[vst]|s\s*[/.]?\s*s)\b\.?\s*", re.IGNORECASE)
+NON_ALNUM_PATTERN = re.compile(r"[^0-9a-z]+")
+
+MAX_CANDIDATES = 50
+COMMON_TRIGRAM_MIN_POSTINGS = 1000
+COMMON_TRIGRAM_RATIO = 0.05
+
+
+def normalize_vessel_name(name: str) -> str:
+    value = name.strip().casefold()
+    value = VESSEL_PREFIX_PATTERN.sub("", value)
+    return NON_ALNUM_PATTERN.sub(" ", value).strip()
+
+
+def trigrams(key: str) -> List[str]:
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(a) + 1))
+    for j, char_b in enumerate(b, start=1):
+        current = [j] + [0] * len(a)
+        row_min = current[0]
+        for i, char_a in enumerate(a, start=1):
+            current[i] = min(
+                previous[i] + 1,
+                current[i - 1] + 1,
+                previous[i - 1] + (char_a != char_b),
+            )
+            row_min = min(row_min, current[i])
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class VesselMatch:
+    def __init__(self, canonical: Optional[str], score: float, exact: bool):
+        self.canonical = canonical
+        self.score = score
+        self.exact = exact
+
+
+class VesselIndex:
+    def __init__(self, names: List[str], max_edit_distance: int = 2):
+        self.names = names
+        self.max_edit_distance = max_edit_distance
+        self._exact: Dict[str, str] = {}
+        for name in names:
+            key = normalize_vessel_name(name)
+            if key and key not in self._exact:
+                self._exact[key] = name
+
+        self._keys = list(self._exact)
+        self._postings: Dict[str, List[int]] = {}
+        for position, key in enumerate(self._keys):
+            for gram in set(trigrams(key)):
+                self._postings.setdefault(gram, []).append(position)
+
+        self._common_limit = max(COMMON_TRIGRAM_MIN_POSTINGS, int(len(self._keys) * COMMON_TRIGRAM_RATIO))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, name: str) -> VesselMatch:
+        key = normalize_vessel_name(name)
+        if not key:
+            return VesselMatch(None, 0.0, False)
+
+        canonical = self._exact.get(key)
+        if canonical is not None:
+            return VesselMatch(canonical, 1.0, True)
+
+        best_key = None
+        best_distance = self.max_edit_distance + 1
+        for position in self._candidates(key):
+            candidate = self._keys[position]
+            distance = bounded_levenshtein(key, candidate, min(best_distance - 1, self.max_edit_distance))
+            if distance is not None and distance < best_distance:
+                best_key, best_distance = candidate, distance
+
+        if best_key is None:
+            return VesselMatch(None, 0.0, False)
+
+        score = 1.0 - best_distance / max(len(key), len(best_key))
+        return VesselMatch(self._exact[best_key], round(score, 4), False)
+
+    def _candidates(self, key: str) -> List[int]:
+        counts: Counter = Counter()
+        for gram in set(trigrams(key)):
+            postings = self._postings.get(gram)
+            if postings and len(postings) <= self._common_limit:
+                counts.update(postings)
+        return [position for position, _ in counts.most_common(MAX_CANDIDATES)]
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from app.core.logging import get_logger
+from app.services.compact_registry import COMPACT_SUFFIX, MappedVesselIndex, read_version
+from app.services.vessel_index import VesselIndex
+
+logger = get_logger(__name__)
+
+EMPTY_VERSION = "empty"
+MISSING_STAMP = (-1, -1)
+
+
+class RegistrySnapshot:
+    def __init__(self, index: Union[VesselIndex, MappedVesselIndex], version: str):
+        self.index = index
+        self.version = version
+
+    @property
+    def names(self) -> List[str]:
+        return self.index.names
+
+
+class VesselRegistry:
+    def __init__(self, path: Path, max_edit_distance: int = 2):
+        self.path = Path(path)
+        self.max_edit_distance = max_edit_distance
+        self.loads = 0
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.compact = self.path.suffix.lower() == COMPACT_SUFFIX
+        self._snapshot = RegistrySnapshot(VesselIndex([], max_edit_distance=max_edit_distance), EMPTY_VERSION)
+        self.reload_if_changed()
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._stamp != MISSING_STAMP:
+                logger.error(f"Vessels file not found: {self.path}")
+            self._stamp = MISSING_STAMP
+            return False
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+
+        if self.compact:
+            return self._reload_compact(stamp)
+
+        try:
+            raw = self.path.read_bytes()
+        except OSError as e:
+            logger.error(f"Could not read vessels file: {e}")
+            return False
+
+        self._stamp = stamp
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        if version == self._snapshot.version:
+            return False
+
+        try:
+            names = self._parse(raw)
+        except ValueError as e:
+            logger.error(f"Invalid vessels file, keeping registry version {self._snapshot.version}: {e}")
+            return False
+
+        self._snapshot = RegistrySnapshot(VesselIndex(names, max_edit_distance=self.max_edit_distance), version)
+        self.loads += 1
+        logger.info(f"Loaded {len(names)} valid vessels (registry version {version})")
+        return True
+
+    def _reload_compact(self, stamp: Tuple[int, int]) -> bool:
+        try:
+            version = read_version(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Invalid compiled vessels file, keeping registry version {self._snapshot.version}: {e}")
+            return False
+
+        self._stamp = stamp
+        if version == self._snapshot.version:
+            return False
+
+        try:
+            index = MappedVesselIndex(self.path, max_edit_distance=self.max_edit_distance)
+        except (OSError, ValueError) as e:
+            logger.error(f"Invalid compiled vessels file, keeping registry version {self._snapshot.version}: {e}")
+            return False
+
+        self._snapshot = RegistrySnapshot(index, index.version)
+        self.loads += 1
+        logger.info(f"Mapped {len(index)} valid vessels from {self.path} (registry version {index.version})")
+        return True
+
+    async def start(self, poll_seconds: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch(poll_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self, poll_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(poll_seconds)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                logger.error(f"Vessel registry reload failed: {e}")
+
+    def _parse(self, raw: bytes) -> List[str]:
+        try:
+            vessels = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid vessels JSON: {e}")
+        if not isinstance(vessels, list) or not all(isinstance(name, str) for name in vessels):
+            raise ValueError("Vessels JSON must be a list of names")
+        return vessels
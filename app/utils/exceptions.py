@@ -1,7 +1,30 @@
+from typing import Optional
+
+
 class AIExtractorError(Exception):
     pass
 
 
+class UpstreamRateLimitError(AIExtractorError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(AIExtractorError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class JobProcessingError(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
 class ValidationError(Exception):
     pass
 
@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+from benchmarks.stub_llm import LATENCY_DISTRIBUTIONS
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_DOCUMENTS = [ROOT_DIR / "data" / "sample_document_pass.txt", ROOT_DIR / "data" / "sample_document_fail.txt"]
+VALIDATE_PATH = "/api/v1/validate"
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(latencies: List[float], outcomes: List[str], paths: List[str], duration: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    errors = sum(1 for outcome in outcomes if outcome != "200")
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "requests": len(outcomes),
+        "duration_seconds": round(duration, 3),
+        "throughput_rps": round(len(outcomes) / duration, 2) if duration > 0 else None,
+        "error_rate": round(errors / len(outcomes), 4) if outcomes else None,
+        "status_codes": dict(Counter(outcomes)),
+        "extraction_paths": dict(Counter(path for path in paths if path)),
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 0.50)),
+            "p95": ms(percentile(ordered, 0.95)),
+            "p99": ms(percentile(ordered, 0.99)),
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    documents: List[str],
+    concurrency: int,
+    total: int,
+    bypass_cache: bool = True,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    outcomes: List[str] = []
+    paths: List[str] = []
+    headers = {"X-Cache-Bypass": "true"} if bypass_cache else {}
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while issued < total:
+            document = documents[issued % len(documents)]
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(VALIDATE_PATH, json={"document_text": document}, headers=headers)
+            except httpx.HTTPError as e:
+                outcomes.append(f"error:{type(e).__name__}")
+                continue
+            latencies.append(time.perf_counter() - started)
+            outcomes.append(str(response.status_code))
+            paths.append(response.headers.get("x-extraction-path", ""))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, total)))))
+    return {"concurrency": concurrency, **summarize(latencies, outcomes, paths, time.perf_counter() - started)}
+
+
+def load_documents(paths: Sequence[Path]) -> List[str]:
+    files: List[Path] = []
+    for path in paths:
+        files.extend(sorted(path.glob("*.txt")) if path.is_dir() else [path])
+    documents = [file.read_text() for file in files]
+    if not documents:
+        raise ValueError("No documents to send")
+    return documents
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+
+@contextmanager
+def spawn_services(args: argparse.Namespace) -> Iterator[Dict[str, Any]]:
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    stub_command = [
+        sys.executable, "-m", "benchmarks.stub_llm",
+        "--port", str(args.stub_port),
+        "--latency", args.stub_latency,
+        "--latency-ms", str(args.stub_latency_ms),
+        "--latency-spread", str(args.stub_latency_spread),
+        "--error-rate", str(args.stub_error_rate),
+        "--rate-limit-rate", str(args.stub_rate_limit_rate),
+    ]
+    if args.stub_responses is not None:
+        stub_command += ["--responses", str(args.stub_responses)]
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as data_dir:
+        env = {
+            **os.environ,
+            "GROQ_API_KEY": "stub",
+            "GROQ_BASE_URL": stub_url,
+            "DISK_CACHE_FILE": str(Path(data_dir) / "extractions.sqlite3"),
+            "JOBS_FILE": str(Path(data_dir) / "jobs.sqlite3"),
+            "LOG_LEVEL": "WARNING",
+        }
+        for assignment in args.app_env:
+            key, _, value = assignment.partition("=")
+            env[key] = value
+        app_command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.app_port),
+            "--workers", str(args.workers),
+            "--log-level", "warning",
+        ]
+
+        processes = [subprocess.Popen(stub_command, cwd=ROOT_DIR)]
+        try:
+            wait_until_ready(f"{stub_url}/stats")
+            processes.append(subprocess.Popen(app_command, cwd=ROOT_DIR, env=env))
+            wait_until_ready(f"http://127.0.0.1:{args.app_port}/health")
+            yield {"url": f"http://127.0.0.1:{args.app_port}", "stub_url": stub_url}
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+async def benchmark(url: str, args: argparse.Namespace, documents: List[str]) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup:
+            await run_load(client, documents, min(args.concurrency), args.warmup, not args.use_cache)
+
+        runs = []
+        for concurrency in args.concurrency:
+            result = await run_load(client, documents, concurrency, args.requests, not args.use_cache)
+            print(
+                f"concurrency={concurrency} rps={result['throughput_rps']} "
+                f"p50={result['latency_ms']['p50']}ms p95={result['latency_ms']['p95']}ms "
+                f"p99={result['latency_ms']['p99']}ms errors={result['error_rate']}",
+                file=sys.stderr,
+            )
+            runs.append(result)
+
+        try:
+            app_stats = (await client.get("/api/v1/stats")).json()
+        except (httpx.HTTPError, ValueError):
+            app_stats = None
+    return {"runs": runs, "app_stats": app_stats}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load", description="Load test /api/v1/validate and write a JSON report"
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Benchmark an already running server")
+    target.add_argument("--spawn", action="store_true", help="Start the stub LLM and the app for this run")
+
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Concurrency levels to sweep")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=10, help="Requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--documents", type=Path, nargs="+", default=DEFAULT_DOCUMENTS,
+                        help="Document files or directories of .txt files")
+    parser.add_argument("--use-cache", action="store_true", help="Do not send X-Cache-Bypass")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-report.json"))
+    parser.add_argument("--label", help="Free-form label stored in the report, e.g. a branch name")
+
+    spawn = parser.add_argument_group("spawned services")
+    spawn.add_argument("--workers", type=int, default=1, help="Uvicorn worker processes")
+    spawn.add_argument("--app-port", type=int, default=8100)
+    spawn.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                       help="Extra app settings, e.g. RULES_ENABLED=false")
+    spawn.add_argument("--stub-port", type=int, default=9100)
+    spawn.add_argument("--stub-latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    spawn.add_argument("--stub-latency-ms", type=float, default=400.0)
+    spawn.add_argument("--stub-latency-spread", type=float, default=0.5)
+    spawn.add_argument("--stub-error-rate", type=float, default=0.0)
+    spawn.add_argument("--stub-rate-limit-rate", type=float, default=0.0)
+    spawn.add_argument("--stub-responses", type=Path)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    documents = load_documents(args.documents)
+    report: Dict[str, Any] = {
+        "label": args.label,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "documents": len(documents),
+        "requests_per_level": args.requests,
+        "cache_bypass": not args.use_cache,
+    }
+
+    if args.spawn:
+        report["target"] = {
+            "spawned": True,
+            "workers": args.workers,
+            "app_env": args.app_env,
+            "stub": {
+                "latency": args.stub_latency,
+                "latency_ms": args.stub_latency_ms,
+                "latency_spread": args.stub_latency_spread,
+                "error_rate": args.stub_error_rate,
+                "rate_limit_rate": args.stub_rate_limit_rate,
+                "responses": str(args.stub_responses) if args.stub_responses else None,
+            },
+        }
+        with spawn_services(args) as services:
+            report.update(asyncio.run(benchmark(services["url"], args, documents)))
+            report["stub_stats"] = httpx.get(f"{services['stub_url']}/stats").json()
+    else:
+        report["target"] = {"spawned": False, "url": args.url}
+        report.update(asyncio.run(benchmark(args.url, args, documents)))
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "exponential", "lognormal"]
+
+DEFAULT_RESPONSES = [
+    {
+        "policy_number": "HM-2025-10-A4B",
+        "vessel_name": "MV Neptune",
+        "policy_start_date": "2025-11-01",
+        "policy_end_date": "2026-10-31",
+        "insured_value": 5000000,
+    },
+    {
+        "policy_number": "HM-2025-11-C7D",
+        "vessel_name": "Oceanic Voyager",
+        "policy_start_date": "2025-12-01",
+        "policy_end_date": "2026-11-30",
+        "insured_value": 12500000,
+    },
+    {
+        "policy_number": None,
+        "vessel_name": "The Wanderer",
+        "policy_start_date": "2026-01-01",
+        "policy_end_date": "2025-12-31",
+        "insured_value": -500,
+    },
+]
+
+
+@dataclass
+class StubConfig:
+    latency: str = "lognormal"
+    latency_ms: float = 400.0
+    latency_spread: float = 0.5
+    stream_chunk_chars: int = 16
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+    responses: List[Dict[str, Any]] = field(default_factory=lambda: list(DEFAULT_RESPONSES))
+
+
+class StubStats:
+    def __init__(self):
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+
+def sample_latency(config: StubConfig, rng: random.Random) -> float:
+    mean = config.latency_ms / 1000
+    if config.latency == "fixed":
+        return mean
+    if config.latency == "uniform":
+        spread = mean * config.latency_spread
+        return max(0.0, rng.uniform(mean - spread, mean + spread))
+    if config.latency == "exponential":
+        return rng.expovariate(1 / mean) if mean > 0 else 0.0
+    if config.latency == "lognormal":
+        sigma = config.latency_spread
+        # Pick mu so that the distribution's mean equals latency_ms.
+        return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma) if mean > 0 else 0.0
+    raise ValueError(f"Unknown latency distribution: {config.latency}")
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    stats = StubStats()
+    app = FastAPI(title="Stub chat completions")
+    app.state.config = config
+    app.state.stats = stats
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            roll = rng.random()
+            if roll < config.rate_limit_rate:
+                stats.rate_limited += 1
+                return JSONResponse(
+                    status_code=429,
+                    content={"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_exceeded"}},
+                    headers={"retry-after": str(config.retry_after_seconds)},
+                )
+
+            await asyncio.sleep(sample_latency(config, rng))
+            if roll < config.rate_limit_rate + config.error_rate:
+                stats.errors += 1
+                return JSONResponse(
+                    status_code=500,
+                    content={"error": {"message": "Internal server error (stub)", "type": "internal_server_error"}},
+                )
+
+            content = json.dumps(rng.choice(config.responses))
+            prompt_tokens = sum(len(message.get("content") or "") for message in body.get("messages", [])) // 4
+            completion_tokens = len(content) // 4
+            if body.get("stream"):
+                stats.streamed += 1
+                return StreamingResponse(
+                    _stream(content, body.get("model", "stub"), config.stream_chunk_chars),
+                    media_type="text/event-stream",
+                )
+            return _completion(content, body.get("model", "stub"), prompt_tokens, completion_tokens)
+        finally:
+            stats.in_flight -= 1
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, Any]:
+        return {"config": {**asdict(config), "responses": len(config.responses)}, **vars(stats)}
+
+    return app
+
+
+def _completion(content: str, model: str, prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "system_fingerprint": "stub",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+            "logprobs": None,
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+async def _stream(content: str, model: str, chunk_chars: int) -> AsyncIterator[str]:
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str]) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "system_fingerprint": "stub",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""}, None)
+    for start in range(0, len(content), max(1, chunk_chars)):
+        yield chunk({"content": content[start:start + chunk_chars]}, None)
+        await asyncio.sleep(0)
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+def load_responses(path: Path) -> List[Dict[str, Any]]:
+    responses = json.loads(Path(path).read_text())
+    if not isinstance(responses, list) or not all(isinstance(item, dict) for item in responses):
+        raise ValueError(f"{path} must contain a JSON array of objects")
+    return responses
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.stub_llm", description="Local stand-in for the Groq chat completions API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Mean completion latency")
+    parser.add_argument(
+        "--latency-spread", type=float, default=0.5,
+        help="Sigma for lognormal, relative half-width for uniform"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429 responses")
+    parser.add_argument("--responses", type=Path, help="JSON array of canned extraction results")
+    parser.add_argument("--seed", type=int)
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    config = StubConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    if args.responses is not None:
+        config.responses = load_responses(args.responses)
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    uvicorn.run(create_stub_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Tests for the batch validation endpoint.
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.api.deps import get_ai_extractor
+from app.core.config import settings
+from app.main import app
+from app.utils.exceptions import AIExtractorError
+
+
+PASS_DATA = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "MV Neptune",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": "2026-10-31",
+    "insured_value": 5000000
+}
+
+
+class FakeExtractor:
+    """Test double that fails on request and records concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def extract(self, document_text, context=None):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if document_text == "upstream-error":
+                raise AIExtractorError("rate limited")
+            if document_text == "bad-schema":
+                return dict(PASS_DATA, insured_value="not-a-number")
+            return dict(PASS_DATA, policy_number=document_text)
+        finally:
+            self.in_flight -= 1
+
+    async def extract_many(self, document_texts, contexts=None):
+        self.packed_batches = getattr(self, "packed_batches", 0) + 1
+        results = []
+        for document_text in document_texts:
+            try:
+                results.append(await self.extract(document_text))
+            except AIExtractorError as e:
+                results.append(e)
+        return results
+
+
+@pytest.fixture
+def fake_extractor():
+    fake = FakeExtractor()
+    app.dependency_overrides[get_ai_extractor] = lambda: fake
+    yield fake
+    app.dependency_overrides.clear()
+
+
+def post_batch(texts):
+    return TestClient(app).post(
+        "/api/v1/validate/batch",
+        json={"documents": [{"document_text": text} for text in texts]}
+    )
+
+
+class TestBatchValidation:
+    """Tests for POST /api/v1/validate/batch."""
+
+    def test_results_in_input_order(self, fake_extractor):
+        """Test that every item comes back at its input position."""
+        texts = [f"POLICY-{i}" for i in range(20)]
+        response = post_batch(texts)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 20
+        assert [item["index"] for item in data["results"]] == list(range(20))
+        assert [item["result"]["extracted_data"]["policy_number"] for item in data["results"]] == texts
+
+    def test_bad_document_does_not_fail_batch(self, fake_extractor):
+        """Test that per-item failures are reported alongside successes."""
+        response = post_batch(["POLICY-1", "upstream-error", "bad-schema", "POLICY-2"])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 2
+        assert data["failed"] == 2
+        assert data["results"][1]["error"]["status_code"] == 503
+        assert data["results"][2]["error"]["status_code"] == 400
+        assert data["results"][3]["result"] is not None
+
+    def test_concurrency_limit(self, fake_extractor):
+        """Test that extraction runs concurrently but within the limit."""
+        fake_extractor.delay = 0.01
+        with patch.object(settings, "batch_max_concurrency", 3):
+            response = post_batch([f"POLICY-{i}" for i in range(12)])
+
+        assert response.status_code == 200
+        assert fake_extractor.peak_in_flight == 3
+
+    def test_batch_size_limit(self, fake_extractor):
+        with patch.object(settings, "batch_max_documents", 2):
+            response = post_batch(["a", "b", "c"])
+        assert response.status_code == 413
+
+    def test_empty_batch_rejected(self, fake_extractor):
+        response = TestClient(app).post("/api/v1/validate/batch", json={"documents": []})
+        assert response.status_code == 422
+
+    def test_packing_mode(self, fake_extractor):
+        """Test that packing mode hands the whole batch to extract_many."""
+        with patch.object(settings, "ai_packing_enabled", True):
+            response = post_batch(["POLICY-1", "upstream-error", "bad-schema"])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert fake_extractor.packed_batches == 1
+        assert data["results"][0]["result"]["extracted_data"]["policy_number"] == "POLICY-1"
+        assert data["results"][1]["error"]["status_code"] == 503
+        assert data["results"][2]["error"]["status_code"] == 400
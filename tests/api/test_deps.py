@@ -0,0 +1,116 @@
+"""
+Tests for shared service dependencies and the application lifespan.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.deps import get_ai_extractor, get_document_validator
+from app.main import app
+from app.utils.exceptions import UpstreamRateLimitError
+
+
+class FakeExtractor:
+    """Test double returning a fixed extraction."""
+
+    def __init__(self):
+        self.contexts = []
+
+    async def extract(self, document_text, context=None):
+        self.contexts.append(context)
+        if context is not None:
+            context.cache_status = "BYPASS" if not context.use_cache else "MISS"
+        return {
+            "policy_number": "HM-2025-10-A4B",
+            "vessel_name": "MV Neptune",
+            "policy_start_date": "2025-11-01",
+            "policy_end_date": "2026-10-31",
+            "insured_value": 5000000
+        }
+
+
+class TestSharedServices:
+    """Tests for process-lifetime service instances."""
+
+    @pytest.mark.asyncio
+    async def test_extractor_is_shared(self):
+        """Test that the same extractor is returned for every request."""
+        first = await get_ai_extractor()
+        second = await get_ai_extractor()
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_validator_is_shared(self):
+        """Test that the vessel registry is not reloaded per request."""
+        first = await get_document_validator()
+        second = await get_document_validator()
+        assert first is second
+
+    def test_lifespan_initializes_and_shuts_down(self):
+        """Test that services are built on startup and released on shutdown."""
+        with TestClient(app):
+            assert deps._ai_extractor is not None
+            assert deps._document_validator is not None
+        assert deps._ai_extractor is None
+        assert deps._document_validator is None
+
+
+class TestDependencyOverrides:
+    """Tests for swapping in test doubles."""
+
+    def test_override_extractor(self):
+        """Test that a fake extractor can replace the shared instance."""
+        app.dependency_overrides[get_ai_extractor] = FakeExtractor
+        try:
+            response = TestClient(app).post(
+                "/api/v1/validate",
+                json={"document_text": "Sample document text"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert all(r["status"] == "PASS" for r in response.json()["validation_results"])
+        assert response.json()["registry_version"] == response.headers["X-Vessel-Registry-Version"]
+
+    def test_cache_bypass_header(self):
+        """Test that X-Cache-Bypass disables the cache lookup for one request."""
+        fake = FakeExtractor()
+        app.dependency_overrides[get_ai_extractor] = lambda: fake
+        try:
+            response = TestClient(app).post(
+                "/api/v1/validate",
+                json={"document_text": "Sample document text"},
+                headers={"X-Cache-Bypass": "true"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert fake.contexts[0].use_cache is False
+        assert response.headers["X-Cache"] == "BYPASS"
+
+
+class RateLimitedExtractor:
+    """Test double that reports an exhausted upstream rate limit."""
+
+    async def extract(self, document_text, context=None):
+        raise UpstreamRateLimitError("Upstream queue full", retry_after=2.5)
+
+
+class TestRateLimitResponses:
+    """Tests for surfacing upstream rate limits to clients."""
+
+    def test_rate_limit_returns_429(self):
+        """Test that an exhausted rate limit maps to 429 with Retry-After."""
+        app.dependency_overrides[get_ai_extractor] = RateLimitedExtractor
+        try:
+            response = TestClient(app).post(
+                "/api/v1/validate",
+                json={"document_text": "Sample document text"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,37 @@
+"""
+Tests for the asynchronous job endpoints.
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+class TestJobs:
+    """Tests for submitting and polling validation jobs."""
+
+    def test_submit_and_poll(self, sample_pass_document):
+        """Test that a submitted job is processed by the worker pool."""
+        with TestClient(app) as client:
+            response = client.post("/api/v1/jobs", json={"document_text": sample_pass_document})
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] in ("queued", "running")
+            assert response.headers["Location"] == f"/api/v1/jobs/{job['id']}"
+
+            for _ in range(200):
+                job = client.get(f"/api/v1/jobs/{job['id']}").json()
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                time.sleep(0.02)
+
+        assert job["status"] == "succeeded"
+        assert job["result"]["extracted_data"]["policy_number"] == "HM-2025-10-A4B"
+        assert len(job["result"]["validation_results"]) == 4
+
+    def test_unknown_job(self):
+        """Test that an unknown job id returns 404."""
+        with TestClient(app) as client:
+            response = client.get("/api/v1/jobs/does-not-exist")
+        assert response.status_code == 404
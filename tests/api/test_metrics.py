@@ -0,0 +1,132 @@
+"""
+Tests for the Prometheus metrics endpoint and the in-house metric types.
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, MetricsRegistry, registry
+from app.main import app
+from app.utils.exceptions import AIExtractorError
+
+client = TestClient(app)
+
+PASSING_DATA = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "MV Neptune",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": "2026-10-31",
+    "insured_value": 5000000
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test from zeroed metrics."""
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def sample(body, line_prefix):
+    for line in body.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestMetricTypes:
+    """Tests for rendering counters, gauges and histograms."""
+
+    def test_counter_renders_total(self):
+        """Test that counters get the _total suffix and escaped labels."""
+        metrics = MetricsRegistry()
+        counter = Counter("things", "Things seen.", labelnames=["kind"], registry=metrics)
+        counter.labels('a "quoted" kind').inc()
+        counter.labels('a "quoted" kind').inc(2)
+        body = metrics.render()
+        assert "# TYPE things counter" in body
+        assert 'things_total{kind="a \\"quoted\\" kind"} 3' in body
+
+    def test_gauge_track(self):
+        """Test that tracking raises the gauge only while inside the block."""
+        metrics = MetricsRegistry()
+        gauge = Gauge("busy", "Busy workers.", labelnames=["pool"], registry=metrics)
+        with gauge.track("main"):
+            assert sample(metrics.render(), 'busy{pool="main"}') == 1
+        assert sample(metrics.render(), 'busy{pool="main"}') == 0
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts, sum and count for a histogram."""
+        metrics = MetricsRegistry()
+        histogram = Histogram("latency", "Latency.", buckets=[0.1, 1.0], registry=metrics)
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        body = metrics.render()
+        assert sample(body, 'latency_bucket{le="0.1"}') == 2
+        assert sample(body, 'latency_bucket{le="1"}') == 3
+        assert sample(body, 'latency_bucket{le="+Inf"}') == 4
+        assert sample(body, "latency_sum") == pytest.approx(5.65)
+        assert sample(body, "latency_count") == 4
+
+    def test_label_count_is_checked(self):
+        """Test that the wrong number of label values is rejected."""
+        metrics = MetricsRegistry()
+        counter = Counter("things", "Things seen.", labelnames=["kind"], registry=metrics)
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+
+    def test_reset_keeps_children(self):
+        """Test that reset zeroes children held by callers instead of orphaning them."""
+        metrics = MetricsRegistry()
+        child = Histogram("latency", "Latency.", labelnames=["stage"], registry=metrics).labels("llm")
+        child.observe(0.2)
+        metrics.reset()
+        child.observe(0.3)
+        assert sample(metrics.render(), 'latency_count{stage="llm"}') == 1
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_content_type(self):
+        """Test that metrics are served in the Prometheus text format."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == CONTENT_TYPE
+        assert "# TYPE validation_stage_seconds histogram" in response.text
+
+    def test_validate_records_stages_and_outcomes(self):
+        """Test that a validation populates stage histograms and result counters."""
+        with patch("app.services.ai_extractor.AIExtractor.extract") as mock_extract:
+            mock_extract.return_value = dict(PASSING_DATA)
+            response = client.post("/api/v1/validate", json={"document_text": "Sample document text"})
+        assert response.status_code == 200
+
+        body = client.get("/metrics").text
+        for stage in ("schema", "validate", "serialize"):
+            assert sample(body, f'validation_stage_seconds_count{{stage="{stage}"}}') == 1
+        assert sample(body, 'validation_outcomes_total{outcome="passed"}') == 1
+        assert sample(body, 'validation_rule_results_total{rule="Value Check",status="PASS"}') == 1
+        assert sample(body, 'validation_requests_in_flight{endpoint="validate"}') == 0
+
+    def test_failed_rules_are_counted(self):
+        """Test that a failing rule is counted per rule name."""
+        with patch("app.services.ai_extractor.AIExtractor.extract") as mock_extract:
+            mock_extract.return_value = {**PASSING_DATA, "insured_value": -500}
+            client.post("/api/v1/validate", json={"document_text": "Sample document text"})
+
+        body = client.get("/metrics").text
+        assert sample(body, 'validation_outcomes_total{outcome="failed"}') == 1
+        assert sample(body, 'validation_rule_results_total{rule="Value Check",status="FAIL"}') == 1
+
+    def test_errors_are_counted(self):
+        """Test that extraction failures count as error outcomes."""
+        with patch("app.services.ai_extractor.AIExtractor.extract") as mock_extract:
+            mock_extract.side_effect = AIExtractorError("upstream down")
+            response = client.post("/api/v1/validate", json={"document_text": "Sample document text"})
+        assert response.status_code == 503
+
+        body = client.get("/metrics").text
+        assert sample(body, 'validation_outcomes_total{outcome="error"}') == 1
@@ -0,0 +1,160 @@
+"""
+Tests for on-demand request profiling and the admin profile endpoints.
+"""
+import pstats
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_profile_store
+from app.core.config import settings
+from app.core.metrics import IN_FLIGHT, STAGE_SECONDS
+from app.core.profiling import ProfileStore, ProfilingMiddleware
+from app.main import app
+
+ADMIN_TOKEN = "s3cret"
+
+
+def make_app(store, admin_token=ADMIN_TOKEN, sample_rate=0.0):
+    profiled = FastAPI()
+    profiled.add_middleware(ProfilingMiddleware, store=store, admin_token=admin_token, sample_rate=sample_rate)
+
+    @profiled.get("/work")
+    async def work():
+        with STAGE_SECONDS.time("validate"):
+            sum(i * i for i in range(1000))
+        return {"ok": True}
+
+    return profiled
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(tmp_path / "profiles", max_profiles=3)
+
+
+class TestProfilingMiddleware:
+    """Tests for when requests are profiled and what gets stored."""
+
+    def test_not_profiled_without_trigger(self, store):
+        """Test that ordinary requests are passed straight through."""
+        response = TestClient(make_app(store)).get("/work")
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+    def test_header_requires_admin_token(self, store):
+        """Test that the profile header is ignored without the right admin token."""
+        client = TestClient(make_app(store))
+        response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": "wrong"})
+        assert "x-profile-id" not in response.headers
+        response = client.get("/work", headers={"X-Profile": "1"})
+        assert "x-profile-id" not in response.headers
+
+    def test_header_ignored_without_configured_token(self, store):
+        """Test that header triggering is off when no admin token is configured."""
+        client = TestClient(make_app(store, admin_token=""))
+        response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": ""})
+        assert "x-profile-id" not in response.headers
+
+    def test_admin_header_profiles_request(self, store):
+        """Test that a triggered request stores a loadable profile and a summary."""
+        client = TestClient(make_app(store))
+        response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        summary = store.get(profile_id)
+        assert summary["path"] == "/work"
+        assert summary["status_code"] == 200
+        assert summary["wall_seconds"] >= summary["stages"]["validate"] > 0
+        assert summary["concurrent_requests"] == 0
+        assert "top_functions" in summary
+        assert pstats.Stats(str(store.stats_path(profile_id))).total_calls > 0
+
+    def test_records_concurrent_requests(self, store):
+        """Test that the summary flags other requests sharing the event loop."""
+        client = TestClient(make_app(store))
+        with IN_FLIGHT.track("job"):
+            response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN})
+        assert store.get(response.headers["x-profile-id"])["concurrent_requests"] == 1
+
+    def test_sample_rate(self, store):
+        """Test that a sample rate of 1 profiles every request."""
+        response = TestClient(make_app(store, admin_token="", sample_rate=1.0)).get("/work")
+        assert "x-profile-id" in response.headers
+
+    def test_old_profiles_are_pruned(self, store):
+        """Test that only the newest max_profiles profiles are kept."""
+        client = TestClient(make_app(store, sample_rate=1.0))
+        ids = [client.get("/work").headers["x-profile-id"] for _ in range(5)]
+        listed = store.list()
+        assert len(listed) == 3
+        assert len(list(store.directory.glob("*.prof"))) == 3
+        assert {summary["id"] for summary in listed} <= set(ids)
+
+
+class TestProfileStore:
+    """Tests for profile lookups."""
+
+    def test_rejects_path_traversal(self, store):
+        """Test that ids outside the expected format are never resolved."""
+        assert store.get("../../etc/passwd") is None
+        assert store.stats_path("..") is None
+
+    def test_missing_directory(self, store):
+        """Test that listing before any profile is stored is empty."""
+        assert store.list() == []
+
+
+class TestAdminEndpoints:
+    """Tests for listing and downloading stored profiles."""
+
+    @pytest.fixture
+    def client(self, store):
+        app.dependency_overrides[get_profile_store] = lambda: store
+        with patch.object(settings, "admin_token", ADMIN_TOKEN):
+            yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_disabled_without_admin_token(self, store):
+        """Test that the admin API is hidden when no admin token is configured."""
+        app.dependency_overrides[get_profile_store] = lambda: store
+        try:
+            response = TestClient(app).get("/api/v1/admin/profiles")
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 404
+
+    def test_wrong_token(self, client):
+        """Test that a wrong admin token is rejected."""
+        response = client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 403
+
+    def test_list_and_download(self, client, store):
+        """Test listing, fetching and downloading a stored profile."""
+        profile_id = TestClient(make_app(store)).get(
+            "/work", headers={"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN}
+        ).headers["x-profile-id"]
+        headers = {"X-Admin-Token": ADMIN_TOKEN}
+
+        listed = client.get("/api/v1/admin/profiles", headers=headers).json()
+        assert [summary["id"] for summary in listed] == [profile_id]
+        assert "top_functions" not in listed[0]
+
+        summary = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=headers).json()
+        assert summary["path"] == "/work"
+
+        download = client.get(f"/api/v1/admin/profiles/{profile_id}/download", headers=headers)
+        assert download.status_code == 200
+        assert download.content == store.stats_path(profile_id).read_bytes()
+
+    def test_unknown_profile(self, client):
+        """Test that unknown profile ids return 404."""
+        headers = {"X-Admin-Token": ADMIN_TOKEN}
+        assert client.get("/api/v1/admin/profiles/20250101000000-deadbeef", headers=headers).status_code == 404
+        assert client.get(
+            "/api/v1/admin/profiles/20250101000000-deadbeef/download", headers=headers
+        ).status_code == 404
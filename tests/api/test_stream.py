@@ -0,0 +1,95 @@
+"""
+Tests for the Server-Sent Events validation endpoint.
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_ai_extractor
+from app.main import app
+from app.utils.exceptions import AIExtractorError
+
+
+class StreamingExtractor:
+    """Test double that streams fields in a fixed order."""
+
+    def __init__(self, fields, error=None):
+        self.fields = fields
+        self.error = error
+
+    async def extract_stream(self, document_text, context=None):
+        for field, value in self.fields:
+            yield field, value
+        if self.error is not None:
+            raise self.error
+        if context is not None:
+            context.path = "llm"
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def stream(extractor):
+    app.dependency_overrides[get_ai_extractor] = lambda: extractor
+    try:
+        response = TestClient(app).post(
+            "/api/v1/validate/stream",
+            json={"document_text": "Sample document text"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    return response
+
+
+class TestStreamingValidation:
+    """Tests for early field and rule emission."""
+
+    def test_rules_follow_their_inputs(self):
+        """Test that each rule is emitted right after its last input field."""
+        response = stream(StreamingExtractor([
+            ("policy_start_date", "2025-11-01"),
+            ("policy_end_date", "2026-10-31"),
+            ("vessel_name", "MV Neptune"),
+            ("policy_number", "HM-2025-10-A4B"),
+            ("insured_value", 5000000),
+        ]))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        kinds = [kind for kind, _ in events]
+        assert kinds == ["field", "field", "rule", "field", "rule", "field", "rule", "field", "rule", "result"]
+        assert events[2][1]["rule"] == "Date Consistency"
+
+        result = events[-1][1]
+        assert [r["rule"] for r in result["validation_results"]] == [
+            "Date Consistency", "Value Check", "Vessel Name Match", "Completeness Check"
+        ]
+        assert all(r["status"] == "PASS" for r in result["validation_results"])
+        assert result["extraction_path"] == "llm"
+
+    def test_extraction_error_is_streamed(self):
+        """Test that an upstream failure ends the stream with an error event."""
+        response = stream(StreamingExtractor(
+            [("policy_number", "HM-2025-10-A4B")], error=AIExtractorError("boom")
+        ))
+
+        events = parse_events(response.text)
+        assert [kind for kind, _ in events] == ["field", "rule", "error"]
+        assert events[-1][1]["status_code"] == 503
+
+    def test_invalid_field_value(self):
+        """Test that an unparseable field value produces a 400 error event."""
+        response = stream(StreamingExtractor([
+            ("policy_start_date", "not a date"),
+            ("policy_end_date", "2026-10-31"),
+        ]))
+
+        events = parse_events(response.text)
+        assert events[-1][0] == "error"
+        assert events[-1][1]["status_code"] == 400
@@ -94,6 +94,19 @@ class TestVesselName:
         data = ExtractedData(vessel_name="   ")
         result = validator._validate_vessel(data)
         assert result.status == "FAIL"
+    
+    def test_case_and_prefix_insensitive(self):
+        data = ExtractedData(vessel_name="m/v NEPTUNE")
+        result = validator._validate_vessel(data)
+        assert result.status == "PASS"
+        assert result.details == {"matched_name": "MV Neptune", "similarity": 1.0}
+    
+    def test_near_match_suggested(self):
+        data = ExtractedData(vessel_name="Oceanic Voyagr")
+        result = validator._validate_vessel(data)
+        assert result.status == "FAIL"
+        assert "Oceanic Voyager" in result.message
+        assert result.details["matched_name"] == "Oceanic Voyager"
 
 
 class TestPolicyNumber:
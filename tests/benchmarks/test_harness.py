@@ -0,0 +1,98 @@
+"""
+Tests for the stub chat-completions server and the load driver.
+"""
+import random
+
+import httpx
+import pytest
+from groq import AsyncGroq
+
+from app.api.deps import get_ai_extractor
+from app.main import app
+from app.services.ai_extractor import AIExtractor
+from benchmarks.load import percentile, run_load
+from benchmarks.stub_llm import StubConfig, create_stub_app, sample_latency
+
+DOCUMENT = "Policy document with nothing the rule extractor can read"
+
+
+def stub_client(config):
+    stub = create_stub_app(config)
+    return stub, httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub")
+
+
+class TestStubServer:
+    """Tests for the stand-in chat completions API."""
+
+    @pytest.mark.asyncio
+    async def test_canned_completion(self):
+        """Test that a plain completion returns one of the canned responses."""
+        config = StubConfig(latency="fixed", latency_ms=0, responses=[{"vessel_name": "MV Neptune"}])
+        _, client = stub_client(config)
+        async with client:
+            response = await client.post(
+                "/openai/v1/chat/completions", json={"model": "m", "messages": [{"role": "user", "content": "x"}]}
+            )
+        assert response.status_code == 200
+        assert response.json()["choices"][0]["message"]["content"] == '{"vessel_name": "MV Neptune"}'
+
+    @pytest.mark.asyncio
+    async def test_rate_limited(self):
+        """Test that the 429 rate answers with Retry-After."""
+        stub, client = stub_client(StubConfig(latency="fixed", latency_ms=0, rate_limit_rate=1.0, retry_after_seconds=2))
+        async with client:
+            response = await client.post("/openai/v1/chat/completions", json={"messages": []})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert stub.state.stats.rate_limited == 1
+
+    @pytest.mark.asyncio
+    async def test_server_errors(self):
+        """Test that the error rate answers with 500."""
+        _, client = stub_client(StubConfig(latency="fixed", latency_ms=0, error_rate=1.0))
+        async with client:
+            response = await client.post("/openai/v1/chat/completions", json={"messages": []})
+        assert response.status_code == 500
+
+    def test_latency_distributions(self):
+        """Test that each distribution has roughly the configured mean."""
+        rng = random.Random(7)
+        for latency in ("fixed", "uniform", "exponential", "lognormal"):
+            config = StubConfig(latency=latency, latency_ms=200)
+            samples = [sample_latency(config, rng) for _ in range(5000)]
+            assert sum(samples) / len(samples) == pytest.approx(0.2, rel=0.1)
+            assert min(samples) >= 0
+
+
+class TestLoadDriver:
+    """Tests for the load driver against the app wired to the stub."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        ordered = [i / 100 for i in range(1, 101)]
+        assert percentile(ordered, 0.5) == 0.5
+        assert percentile(ordered, 0.99) == 0.99
+        assert percentile([], 0.5) is None
+
+    @pytest.mark.asyncio
+    async def test_end_to_end(self):
+        """Test that the driver reports throughput, latency and status codes through the stub."""
+        stub, stub_http = stub_client(StubConfig(latency="fixed", latency_ms=1, seed=1))
+        extractor = AIExtractor()
+        extractor.client = AsyncGroq(api_key="stub", base_url="http://stub", http_client=stub_http, max_retries=0)
+        extractor.rule_extractor = None
+        extractor.inflight = None
+        app.dependency_overrides[get_ai_extractor] = lambda: extractor
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as client:
+                result = await run_load(client, [DOCUMENT], concurrency=4, total=12)
+        finally:
+            app.dependency_overrides.clear()
+            await stub_http.aclose()
+
+        assert result["requests"] == 12
+        assert result["status_codes"] == {"200": 12}
+        assert result["extraction_paths"] == {"llm": 12}
+        assert result["error_rate"] == 0
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert stub.state.stats.requests == 12
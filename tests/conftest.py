@@ -14,9 +14,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 @pytest.fixture(autouse=True)
 def mock_env_variables():
     """Mock environment variables for testing."""
+    from app.core.config import settings
+
     with patch.dict(os.environ, {
         "GROQ_API_KEY": "test-api-key-mock"
-    }):
+    }), patch.object(settings, "groq_api_key", settings.groq_api_key or "test-api-key-mock"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_disk_cache(tmp_path):
+    """Keep the persistent extraction cache and job queue out of the data directory."""
+    from app.core.config import settings
+
+    with patch.object(settings, "disk_cache_file", tmp_path / "extractions.sqlite3"), \
+            patch.object(settings, "jobs_file", tmp_path / "jobs.sqlite3"):
         yield
 
 
@@ -57,3 +69,16 @@ def sample_fail_document():
 def valid_vessels():
     """Return a list of valid vessel names."""
     return ["MV Neptune", "Oceanic Voyager", "Starlight Carrier", "The Sea Serpent", "Ironclad Freighter"]
+
+
+def pytest_addoption(parser):
+    """Options for the CPU hot-path benchmarks in tests/perf."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--benchmark-update", action="store_true", default=False,
+        help="Rewrite tests/perf/baselines.json with the timings from this run"
+    )
+    group.addoption(
+        "--benchmark-threshold", type=float, default=0.5,
+        help="Allowed slowdown against the baseline before a benchmark fails (0.5 = 50%%)"
+    )
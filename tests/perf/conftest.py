@@ -0,0 +1,104 @@
+"""
+Timing fixture for the CPU hot-path benchmarks.
+
+Timings are stored relative to a fixed pure-Python calibration workload, so
+baselines recorded on one machine stay meaningful on another. Refresh them
+with ``pytest -m benchmark --benchmark-update`` after an intended change.
+"""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+REPEATS = 5
+MIN_RUN_SECONDS = 0.01
+
+
+def calibration_workload():
+    """Mix of loops, dict and string work roughly shaped like the request path."""
+    table = {}
+    for i in range(2000):
+        key = f"vessel-{i % 97}"
+        table[key] = table.get(key, 0) + len(key.upper())
+    return json.dumps(sorted(table.items()))
+
+
+def measure(func):
+    """Return the best per-call time in seconds over REPEATS runs."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_RUN_SECONDS:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best
+
+
+class Bench:
+    """Measures a callable and compares it with its stored baseline."""
+
+    def __init__(self, baselines, results, threshold, update):
+        self.baselines = baselines
+        self.results = results
+        self.threshold = threshold
+        self.update = update
+
+    def __call__(self, name, func):
+        func()
+        if self.update:
+            relative = sorted(self.measure_relative(func) for _ in range(3))[1]
+        else:
+            relative = self.measure_relative(func)
+        baseline = self.baselines.get(name)
+        if not self.update and baseline is not None and relative > baseline * (1 + self.threshold):
+            # Re-measure once so a single noisy run does not fail the suite.
+            relative = min(relative, self.measure_relative(func))
+        self.results[name] = float(f"{relative:.4g}")
+
+        if self.update or baseline is None:
+            return relative
+        slowdown = relative / baseline - 1
+        assert slowdown <= self.threshold, (
+            f"{name} regressed {slowdown:.0%} against its baseline "
+            f"({relative:.3f} vs {baseline:.3f} calibration units, threshold {self.threshold:.0%})"
+        )
+        return relative
+
+    def measure_relative(self, func):
+        """Time func against the calibration workload measured right next to it."""
+        return measure(func) / measure(calibration_workload)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    """Collect relative timings and write them out when updating baselines."""
+    results = {}
+    yield results
+    if request.config.getoption("--benchmark-update") and results:
+        stored = json.loads(BASELINES_FILE.read_text()) if BASELINES_FILE.exists() else {}
+        stored.update(results)
+        BASELINES_FILE.write_text(json.dumps(dict(sorted(stored.items())), indent=2) + "\n")
+
+
+@pytest.fixture
+def bench(request, benchmark_results):
+    """Time a callable and fail if it regressed past --benchmark-threshold."""
+    baselines = json.loads(BASELINES_FILE.read_text()) if BASELINES_FILE.exists() else {}
+    return Bench(
+        baselines,
+        benchmark_results,
+        threshold=request.config.getoption("--benchmark-threshold"),
+        update=request.config.getoption("--benchmark-update"),
+    )
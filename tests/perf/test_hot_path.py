@@ -0,0 +1,154 @@
+"""
+Benchmarks for the CPU-side request path once the LLM is cached or stubbed.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.models import ExtractedData, ValidationResponse
+from app.services.ai_extractor import AIExtractor, REQUIRED_FIELDS
+from app.services.compact_registry import compile_registry
+from app.services.json_stream import IncrementalJSONParser
+from app.services.preprocessor import DocumentPreprocessor
+from app.services.rule_extractor import RuleBasedExtractor
+from app.services.validator import DocumentValidator
+from app.services.vessel_registry import VesselRegistry
+
+pytestmark = pytest.mark.benchmark
+
+SAMPLE_DOCUMENT = (Path(__file__).parent.parent.parent / "data" / "sample_document_pass.txt").read_text()
+REGISTRY_SIZE = 100_000
+
+RAW_DATA = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "Vessel 04217",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": "2026-10-31",
+    "insured_value": 5000000
+}
+RESPONSE_TEXT = "```json\n" + json.dumps(RAW_DATA) + "\n```"
+
+FILLER_PARAGRAPH = (
+    "The assured shall take all reasonable steps to avoid or minimise any loss under this insurance. "
+    "Underwriters agree that claims will be settled in accordance with the institute clauses attached, "
+    "and that any dispute arising shall be referred to arbitration in London. "
+    "This message is confidential and intended solely for the named addressee.\n"
+)
+
+
+def large_document(paragraphs=400):
+    """A cover note buried in roughly 100 KB of clauses and boilerplate."""
+    middle = paragraphs // 2
+    return FILLER_PARAGRAPH * middle + SAMPLE_DOCUMENT + FILLER_PARAGRAPH * (paragraphs - middle)
+
+
+@pytest.fixture(scope="module")
+def vessel_names():
+    return [f"Vessel {i:05d}" for i in range(REGISTRY_SIZE)]
+
+
+@pytest.fixture(scope="module")
+def large_validator(tmp_path_factory, vessel_names):
+    path = tmp_path_factory.mktemp("registry") / "vessels.json"
+    path.write_text(json.dumps(vessel_names))
+    return DocumentValidator(VesselRegistry(path))
+
+
+@pytest.fixture(scope="module")
+def compact_validator(tmp_path_factory, vessel_names):
+    path = tmp_path_factory.mktemp("registry") / "vessels.vreg"
+    compile_registry(vessel_names, path)
+    return DocumentValidator(VesselRegistry(path))
+
+
+@pytest.fixture
+def extractor():
+    return AIExtractor()
+
+
+class TestPromptBenchmarks:
+    """Prompt construction and document preparation."""
+
+    def test_build_prompt(self, bench, extractor):
+        """Benchmark building the prompt for a typical cover note."""
+        bench("build_prompt", lambda: extractor._build_prompt(SAMPLE_DOCUMENT, REQUIRED_FIELDS))
+
+    def test_build_prompt_large_document(self, bench, extractor):
+        """Benchmark building the prompt around a 100 KB document."""
+        document = large_document()
+        bench("build_prompt_large", lambda: extractor._build_prompt(document, REQUIRED_FIELDS))
+
+    def test_preprocess_large_document(self, bench):
+        """Benchmark cleaning and windowing a 100 KB document."""
+        preprocessor = DocumentPreprocessor(token_budget=3000)
+        document = large_document()
+        bench("preprocess_large", lambda: preprocessor.process(document))
+
+    def test_rule_extraction_large_document(self, bench):
+        """Benchmark the regex fast path over a 100 KB document."""
+        rule_extractor = RuleBasedExtractor()
+        document = large_document()
+        bench("rule_extract_large", lambda: rule_extractor.extract(document))
+
+
+class TestParseBenchmarks:
+    """Turning completion text into field values."""
+
+    def test_parse_response(self, bench, extractor):
+        """Benchmark parsing a fenced completion."""
+        bench("parse_response", lambda: extractor._parse_response(RESPONSE_TEXT, REQUIRED_FIELDS))
+
+    def test_incremental_parse(self, bench):
+        """Benchmark feeding a streamed completion in 16-character deltas."""
+        deltas = [RESPONSE_TEXT[i:i + 16] for i in range(0, len(RESPONSE_TEXT), 16)]
+
+        def parse():
+            parser = IncrementalJSONParser(REQUIRED_FIELDS)
+            for delta in deltas:
+                parser.feed(delta)
+            return parser.result()
+
+        assert parse()["vessel_name"] == "Vessel 04217"
+        bench("incremental_parse", parse)
+
+
+class TestValidationBenchmarks:
+    """Schema check, rules and serialization."""
+
+    def test_schema_check(self, bench):
+        """Benchmark ExtractedData construction from raw extraction output."""
+        bench("schema_check", lambda: ExtractedData(**RAW_DATA))
+
+    def test_validate_small_registry(self, bench):
+        """Benchmark all rules against the bundled registry."""
+        validator = DocumentValidator()
+        data = ExtractedData(**{**RAW_DATA, "vessel_name": "MV Neptune"})
+        bench("validate_small_registry", lambda: validator.validate(data))
+
+    def test_validate_large_registry_exact(self, bench, large_validator):
+        """Benchmark all rules with an exact vessel hit in a 100k-name registry."""
+        data = ExtractedData(**RAW_DATA)
+        assert large_validator.validate(data)[2].status == "PASS"
+        bench("validate_large_registry_exact", lambda: large_validator.validate(data))
+
+    def test_validate_large_registry_near_miss(self, bench, large_validator):
+        """Benchmark all rules with a misspelt vessel in a 100k-name registry."""
+        data = ExtractedData(**{**RAW_DATA, "vessel_name": "Vesel 04217"})
+        bench("validate_large_registry_near_miss", lambda: large_validator.validate(data))
+
+    def test_validate_compact_registry_near_miss(self, bench, compact_validator):
+        """Benchmark all rules with a misspelt vessel in a compiled 100k-name registry."""
+        data = ExtractedData(**{**RAW_DATA, "vessel_name": "Vessel 04217x"})
+        bench("validate_compact_registry_near_miss", lambda: compact_validator.validate(data))
+
+    def test_serialize_response(self, bench):
+        """Benchmark serializing a full validation response."""
+        validator = DocumentValidator()
+        data = ExtractedData(**{**RAW_DATA, "vessel_name": "MV Neptune"})
+        response = ValidationResponse(
+            extracted_data=data,
+            validation_results=validator.validate(data),
+            registry_version="benchmark"
+        )
+        bench("serialize_response", response.model_dump_json)
@@ -0,0 +1,1160 @@
+"""
+Unit tests for the AI extractor service.
+"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from groq import APIConnectionError, RateLimitError
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services import ai_extractor as ai_extractor_module
+from app.services.ai_extractor import AIExtractor, ExtractionContext
+from app.services.structured_output import max_output_tokens
+from app.utils.exceptions import AIExtractorError, CircuitOpenError, UpstreamRateLimitError
+
+
+PASS_DATA = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "MV Neptune",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": "2026-10-31",
+    "insured_value": 5000000
+}
+
+
+def make_completion(content):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_chunk(content):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStream:
+    """Async iterator over streamed completion chunks."""
+
+    def __init__(self, pieces, body=None):
+        self.pieces = pieces
+        self.consumed = 0
+        self.closed = False
+        self.response = httpx.Response(200, stream=body) if body is not None else httpx.Response(200, content=b"")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self.pieces):
+            raise StopAsyncIteration
+        self.consumed += 1
+        await asyncio.sleep(0)
+        return make_chunk(self.pieces[self.consumed - 1])
+
+    async def close(self):
+        self.closed = True
+
+
+
+class FakeCompletions:
+    """Async stand-in for the Groq chat completions resource."""
+
+    def __init__(self, content=None, delay=0.0):
+        self.content = content if content is not None else json.dumps(PASS_DATA)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if kwargs.get("stream"):
+                return FakeStream([self.content])
+            return make_completion(self.content)
+        finally:
+            self.in_flight -= 1
+
+
+def make_extractor(completions):
+    extractor = AIExtractor()
+    extractor.client.chat.completions = completions
+    return extractor
+
+
+class TestAsyncExtraction:
+    """Tests for non-blocking extraction."""
+
+    @pytest.mark.asyncio
+    async def test_extract_parses_response(self):
+        """Test that extract awaits the async client and parses JSON."""
+        extractor = make_extractor(FakeCompletions())
+        data = await extractor.extract("Sample document text")
+        assert data == PASS_DATA
+
+    @pytest.mark.asyncio
+    async def test_extractions_run_concurrently(self):
+        """Test that several extractions overlap instead of running serially."""
+        completions = FakeCompletions(delay=0.05)
+        extractor = make_extractor(completions)
+
+        await asyncio.gather(*(extractor.extract(f"doc {i}") for i in range(8)))
+
+        assert completions.calls == 8
+        assert completions.peak_in_flight > 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that in-flight calls never exceed the configured limit."""
+        completions = FakeCompletions(delay=0.02)
+        extractor = make_extractor(completions)
+
+        with patch.object(ai_extractor_module, "_extraction_slots", asyncio.Semaphore(3)):
+            await asyncio.gather(*(extractor.extract(f"doc {i}") for i in range(10)))
+
+        assert completions.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Test that other coroutines make progress during an extraction."""
+        extractor = make_extractor(FakeCompletions(delay=0.1))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(extractor.extract("doc"), ticker())
+        assert ticks == 5
+
+    def test_default_concurrency_setting(self):
+        """Test that the concurrency limit is configurable."""
+        assert settings.ai_max_concurrency > 0
+
+
+class TestExtractionCaching:
+    """Tests for cached extraction results."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_document_hits_cache(self):
+        """Test that a resent document skips the upstream call."""
+        completions = FakeCompletions()
+        extractor = make_extractor(completions)
+
+        first_context = ExtractionContext()
+        second_context = ExtractionContext()
+        await extractor.extract("Policy HM-2025-10-A4B", context=first_context)
+        data = await extractor.extract("Policy   HM-2025-10-A4B\n", context=second_context)
+
+        assert data == PASS_DATA
+        assert completions.calls == 1
+        assert first_context.cache_status == "MISS"
+        assert second_context.cache_status == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_lookup(self):
+        """Test that a bypass request always calls upstream."""
+        completions = FakeCompletions()
+        extractor = make_extractor(completions)
+
+        await extractor.extract("doc")
+        context = ExtractionContext(use_cache=False)
+        await extractor.extract("doc", context=context)
+
+        assert completions.calls == 2
+        assert context.cache_status == "BYPASS"
+
+    @pytest.mark.asyncio
+    async def test_stats_expose_counters(self):
+        extractor = make_extractor(FakeCompletions())
+        await extractor.extract("doc")
+        await extractor.extract("doc")
+        stats = extractor.stats()["extraction_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_shared_between_instances(self):
+        """Test that a second worker reuses results persisted by the first."""
+        first = make_extractor(FakeCompletions())
+        await first.extract("doc")
+
+        completions = FakeCompletions()
+        second = make_extractor(completions)
+        context = ExtractionContext()
+        data = await second.extract("doc", context=context)
+
+        assert data == PASS_DATA
+        assert completions.calls == 0
+        assert context.cache_status == "HIT"
+
+
+class PackingCompletions(FakeCompletions):
+    """Fake that answers packed prompts with a JSON array."""
+
+    def __init__(self, packed_content=None, drop_ids=()):
+        super().__init__()
+        self.packed_content = packed_content
+        self.drop_ids = set(drop_ids)
+        self.packed_calls = 0
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        count = prompt.count("Document id=")
+        if not count:
+            return await super().create(**kwargs)
+
+        self.calls += 1
+        self.packed_calls += 1
+        if self.packed_content is not None:
+            return make_completion(self.packed_content)
+        items = [
+            dict(PASS_DATA, id=index, policy_number=f"PACKED-{index}")
+            for index in range(count) if index not in self.drop_ids
+        ]
+        return make_completion(json.dumps(items))
+
+
+class TestPackedExtraction:
+    """Tests for packing several documents into one completion."""
+
+    @pytest.mark.asyncio
+    async def test_documents_share_one_call(self):
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many([f"doc {i}" for i in range(5)])
+
+        assert completions.calls == 1
+        assert [r["policy_number"] for r in results] == [f"PACKED-{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_malformed_array_falls_back(self):
+        completions = PackingCompletions(packed_content="not json")
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many(["doc a", "doc b", "doc c"])
+
+        assert completions.packed_calls == 1
+        assert completions.calls == 4
+        assert all(r == PASS_DATA for r in results)
+
+    @pytest.mark.asyncio
+    async def test_incomplete_array_falls_back_per_document(self):
+        completions = PackingCompletions(drop_ids={1})
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many(["doc a", "doc b", "doc c"])
+
+        assert completions.calls == 2
+        assert results[0]["policy_number"] == "PACKED-0"
+        assert results[1] == PASS_DATA
+        assert results[2]["policy_number"] == "PACKED-2"
+
+    @pytest.mark.asyncio
+    async def test_item_missing_a_field_falls_back(self):
+        items = [dict(PASS_DATA, id=0, policy_number="PACKED-0"), {"id": 1, "policy_number": "PACKED-1"}]
+        completions = PackingCompletions(packed_content=json.dumps(items))
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many(["doc a", "doc b"])
+
+        assert completions.calls == 2
+        assert results == [dict(PASS_DATA, policy_number="PACKED-0"), PASS_DATA]
+
+    @pytest.mark.asyncio
+    async def test_truncated_array_is_not_repaired_into_partial_items(self):
+        """A reply cut off inside an item must not come back with that item's unread fields as None."""
+        content = json.dumps([dict(PASS_DATA, id=0, policy_number="PACKED-0")])[:-1] + ', {"id": 1, "policy_number": "P1", '
+        completions = PackingCompletions(packed_content=content)
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many(["doc a", "doc b"])
+
+        assert all(result == PASS_DATA for result in results)
+        assert extractor.stats()["parse"]["text"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_token_budget_splits_groups(self):
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+        documents = ["x" * 400 for _ in range(6)]
+        documents = [f"{i} {text}" for i, text in enumerate(documents)]
+
+        with patch.object(settings, "ai_packing_enabled", True), \
+                patch.object(settings, "ai_packing_token_budget", 250):
+            results = await extractor.extract_many(documents)
+
+        assert completions.packed_calls == 3
+        assert len(results) == 6
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_not_fanned_out(self):
+        """A throttled packed call fails its documents instead of retrying them one by one."""
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+
+        async def throttled(**kwargs):
+            completions.packed_calls += 1
+            raise make_rate_limit_error("0.01")
+
+        completions.create = throttled
+        with patch.object(settings, "ai_packing_enabled", True), \
+                patch.object(settings, "ai_rate_limit_max_retries", 0):
+            results = await extractor.extract_many(["doc a", "doc b", "doc c"])
+
+        assert completions.packed_calls == 1
+        assert all(isinstance(result, UpstreamRateLimitError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_groups_respect_batch_concurrency(self):
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+        in_flight = peak = 0
+        create = completions.create
+
+        async def slow_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.02)
+                return await create(**kwargs)
+            finally:
+                in_flight -= 1
+
+        completions.create = slow_create
+        with patch.object(settings, "ai_packing_enabled", True), \
+                patch.object(settings, "ai_packing_max_documents", 2), \
+                patch.object(settings, "batch_max_concurrency", 2):
+            results = await extractor.extract_many([f"doc {i}" for i in range(8)])
+
+        assert completions.packed_calls == 4
+        assert peak == 2
+        assert all(result["policy_number"].startswith("PACKED-") for result in results)
+
+    @pytest.mark.asyncio
+    async def test_confident_rule_fields_are_kept(self):
+        """Packed answers fill in only what the rule fast path could not read."""
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+        documents = [f"Policy Number: HM-RULE-{i}\nThe vessel sails under a hull cover." for i in range(2)]
+
+        with patch.object(settings, "ai_packing_enabled", True):
+            results = await extractor.extract_many(documents)
+
+        assert completions.packed_calls == 1
+        assert [result["policy_number"] for result in results] == ["HM-RULE-0", "HM-RULE-1"]
+        assert results[0]["vessel_name"] == PASS_DATA["vessel_name"]
+        assert extractor.stats()["extraction_paths"]["hybrid"] == 2
+
+    @pytest.mark.asyncio
+    async def test_packing_disabled_uses_single_calls(self):
+        completions = PackingCompletions()
+        extractor = make_extractor(completions)
+
+        results = await extractor.extract_many(["doc a", "doc b"])
+
+        assert completions.packed_calls == 0
+        assert completions.calls == 2
+        assert results == [PASS_DATA, PASS_DATA]
+
+
+class TestCoalescing:
+    """Tests for coalescing identical in-flight extractions."""
+
+    @pytest.mark.asyncio
+    async def test_identical_documents_share_upstream_call(self):
+        completions = FakeCompletions(delay=0.05)
+        extractor = make_extractor(completions)
+
+        results = await asyncio.gather(
+            *(extractor.extract("Policy  HM-2025-10-A4B") for _ in range(5))
+        )
+
+        assert completions.calls == 1
+        assert all(result == PASS_DATA for result in results)
+        assert extractor.stats()["singleflight"]["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_bypass_requests_are_coalesced(self):
+        completions = FakeCompletions(delay=0.05)
+        extractor = make_extractor(completions)
+
+        await asyncio.gather(
+            *(extractor.extract("doc", context=ExtractionContext(use_cache=False)) for _ in range(3))
+        )
+
+        assert completions.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_all_callers(self):
+        completions = FakeCompletions(content="not json", delay=0.02)
+        extractor = make_extractor(completions)
+
+        results = await asyncio.gather(
+            *(extractor.extract("doc") for _ in range(3)), return_exceptions=True
+        )
+
+        assert completions.calls == 1
+        assert all(isinstance(result, AIExtractorError) for result in results)
+
+
+class RecordingCompletions(FakeCompletions):
+    """Fake that records prompts and answers with the requested fields."""
+
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+        self.requests = []
+
+    async def create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][1]["content"])
+        self.requests.append(kwargs)
+        return await super().create(**kwargs)
+
+
+class TestRuleBasedFastPath:
+    """Tests for skipping or narrowing the LLM call."""
+
+    @pytest.mark.asyncio
+    async def test_unambiguous_document_skips_llm(self, sample_pass_document):
+        completions = RecordingCompletions()
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        data = await extractor.extract(sample_pass_document, context=context)
+
+        assert completions.calls == 0
+        assert context.path == "rules"
+        assert data["policy_number"] == "HM-2025-10-A4B"
+        assert extractor.stats()["extraction_paths"]["rules"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_missing_fields_sent_to_llm(self, sample_fail_document):
+        completions = RecordingCompletions()
+        completions.content = json.dumps({"policy_number": None})
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        data = await extractor.extract(sample_fail_document, context=context)
+
+        assert completions.calls == 1
+        assert context.path == "hybrid"
+        assert "- policy_number" in completions.prompts[0]
+        assert "- vessel_name" not in completions.prompts[0]
+        assert data["vessel_name"] == "The Wanderer"
+        assert data["insured_value"] == -500
+        assert data["policy_number"] is None
+
+    @pytest.mark.asyncio
+    async def test_unstructured_document_uses_llm(self):
+        completions = RecordingCompletions()
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        await extractor.extract("Sample document text", context=context)
+
+        assert context.path == "llm"
+        assert "- insured_value" in completions.prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_rules_can_be_disabled(self, sample_pass_document):
+        completions = RecordingCompletions()
+        with patch.object(settings, "rules_enabled", False):
+            extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        await extractor.extract(sample_pass_document, context=context)
+
+        assert completions.calls == 1
+        assert context.path == "llm"
+
+
+class TestPromptPreprocessing:
+    """Tests for shrinking the document before it reaches the prompt."""
+
+    @pytest.mark.asyncio
+    async def test_prompt_uses_preprocessed_text(self):
+        completions = RecordingCompletions()
+        extractor = make_extractor(completions)
+
+        await extractor.extract("From: Broker\nTo: Team\n\nSample    document\n\n\n\ntext\n\nThanks,\nAlex")
+
+        prompt = completions.prompts[0]
+        assert "Sample document\n\ntext" in prompt
+        assert "Broker" not in prompt
+        assert "Alex" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_log_reports_windowed_size(self, caplog):
+        """The before/after log covers windowing, not just cleaning."""
+        extractor = make_extractor(RecordingCompletions())
+        filler = "Underwriters agree to the institute clauses attached to this cover.\n" * 200
+        document = filler + "Policy Number: HM-2025-10-A4B\n" + filler
+
+        with patch.object(settings, "ai_chunking_enabled", False), caplog.at_level("INFO"):
+            await extractor.extract(document)
+
+        [message] = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Preprocessed document")]
+        after = int(message.split("-> ")[1].split()[0])
+        assert after <= extractor.preprocessor.token_budget
+
+
+class TestChunkedExtraction:
+    """Tests for splitting oversized documents across concurrent calls."""
+
+    @pytest.mark.asyncio
+    async def test_large_document_is_chunked_and_merged(self):
+        completions = FakeCompletions(delay=0.05)
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+        document = "\n".join(f"Clause {i}: the insurer agrees to the listed conditions." for i in range(2000))
+
+        with patch.object(settings, "ai_chunk_threshold_tokens", 2000), \
+                patch.object(settings, "ai_chunk_tokens", 1000):
+            data = await extractor.extract(document, context=context)
+
+        assert completions.calls > 1
+        assert completions.peak_in_flight > 1
+        assert context.path == "chunked"
+        assert data == PASS_DATA
+        assert context.provenance["policy_number"]["chunks"] == list(range(completions.calls))
+
+    @pytest.mark.asyncio
+    async def test_small_document_is_not_chunked(self):
+        completions = FakeCompletions()
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        await extractor.extract("Sample document text", context=context)
+
+        assert completions.calls == 1
+        assert context.path == "llm"
+
+
+def make_rate_limit_error(retry_after):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class RateLimitedCompletions(FakeCompletions):
+    """Completions that answer 429 a fixed number of times before succeeding."""
+
+    def __init__(self, failures, retry_after="0.05"):
+        super().__init__()
+        self.failures = failures
+        self.retry_after = retry_after
+
+    async def create(self, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            self.calls += 1
+            raise make_rate_limit_error(self.retry_after)
+        return await super().create(**kwargs)
+
+
+class TestRateLimiting:
+    """Tests for scheduling LLM calls around upstream rate limits."""
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self):
+        completions = RateLimitedCompletions(failures=1)
+        extractor = make_extractor(completions)
+
+        started = time.monotonic()
+        data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.calls == 2
+        assert time.monotonic() - started >= 0.05
+        assert extractor.stats()["rate_limiter"]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        completions = RateLimitedCompletions(failures=10, retry_after="0")
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_rate_limit_max_retries", 2):
+            with pytest.raises(UpstreamRateLimitError):
+                await extractor.extract("Sample document text")
+
+        assert completions.calls == 3
+
+
+class ScriptedCompletions(FakeCompletions):
+    """Completions whose per-call delay or error follows a script."""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+
+    async def create(self, **kwargs):
+        step = self.script.pop(0) if self.script else 0.0
+        if isinstance(step, Exception):
+            self.calls += 1
+            raise step
+        self.delay = step
+        return await super().create(**kwargs)
+
+
+def make_connection_error():
+    return APIConnectionError(request=httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions"))
+
+
+class TestResilience:
+    """Tests for timeouts, retries, hedging and the circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_is_retried(self):
+        completions = ScriptedCompletions([1.0, 0.0])
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_attempt_timeout_seconds", 0.05), \
+                patch.object(settings, "ai_retry_backoff_seconds", 0.0):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert extractor.stats()["upstream"]["timeouts"] == 1
+        assert extractor.stats()["upstream"]["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        completions = ScriptedCompletions([make_connection_error() for _ in range(5)])
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_max_retries", 1), \
+                patch.object(settings, "ai_retry_backoff_seconds", 0.0):
+            with pytest.raises(AIExtractorError):
+                await extractor.extract("Sample document text")
+
+        assert completions.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_fails_fast(self):
+        completions = ScriptedCompletions([make_connection_error() for _ in range(10)])
+        with patch.object(settings, "ai_circuit_failure_threshold", 2), \
+                patch.object(settings, "ai_max_retries", 0):
+            extractor = make_extractor(completions)
+            for document in ["first document", "second document"]:
+                with pytest.raises(AIExtractorError):
+                    await extractor.extract(document)
+
+            with pytest.raises(CircuitOpenError):
+                await extractor.extract("third document")
+
+        assert completions.calls == 2
+        assert extractor.stats()["upstream"]["circuit_breaker"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_over_slow_attempt(self):
+        completions = ScriptedCompletions([1.0, 0.0])
+        extractor = make_extractor(completions)
+        for _ in range(settings.ai_hedge_min_samples):
+            extractor.latency.record(0.02)
+
+        started = time.monotonic()
+        with patch.object(settings, "ai_hedging_enabled", True):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert time.monotonic() - started < 0.5
+        assert extractor.stats()["upstream"]["hedges"] == 1
+        assert extractor.stats()["upstream"]["hedge_wins"] == 1
+
+
+class ScriptedStream(FakeStream):
+    """FakeStream that waits before each piece and can fail part way."""
+
+    def __init__(self, pieces, piece_delay=0.0, fail_after=None):
+        super().__init__(pieces)
+        self.piece_delay = piece_delay
+        self.fail_after = fail_after
+
+    async def __anext__(self):
+        if self.fail_after is not None and self.consumed >= self.fail_after:
+            raise make_connection_error()
+        await asyncio.sleep(self.piece_delay)
+        return await super().__anext__()
+
+
+class StreamScriptCompletions(FakeCompletions):
+    """Completions that hand out prepared streams in order."""
+
+    def __init__(self, streams):
+        super().__init__()
+        self.streams = list(streams)
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return self.streams.pop(0)
+
+
+def pass_pieces(count=5):
+    text = json.dumps(PASS_DATA)
+    size = -(-len(text) // count)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamResilience:
+    """Tests for deadlines and retries while a completion streams."""
+
+    @pytest.mark.asyncio
+    async def test_slow_stream_body_hits_attempt_timeout(self):
+        """The attempt deadline covers reading the stream, not just opening it."""
+        completions = StreamScriptCompletions([
+            ScriptedStream(pass_pieces(), piece_delay=0.05),
+            ScriptedStream(pass_pieces()),
+        ])
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_attempt_timeout_seconds", 0.12), \
+                patch.object(settings, "ai_retry_backoff_seconds", 0.0):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.calls == 2
+        assert extractor.stats()["upstream"]["timeouts"] == 1
+        assert extractor.stats()["upstream"]["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_is_retried(self):
+        """Nothing has reached the client yet, so the whole completion is retried."""
+        completions = StreamScriptCompletions([
+            ScriptedStream(pass_pieces(), fail_after=2),
+            ScriptedStream(pass_pieces()),
+        ])
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_retry_backoff_seconds", 0.0):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.calls == 2
+        assert extractor.stats()["upstream"]["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_on_sse_is_fatal(self):
+        """Fields already sent to the client cannot be taken back."""
+        completions = StreamScriptCompletions([
+            ScriptedStream(pass_pieces(), fail_after=3),
+            ScriptedStream(pass_pieces()),
+        ])
+        extractor = make_extractor(completions)
+        events = []
+
+        with pytest.raises(AIExtractorError):
+            async for event in extractor.extract_stream("Sample document text"):
+                events.append(event)
+
+        assert events
+        assert completions.calls == 1
+
+
+class HeldBody(httpx.AsyncByteStream):
+    """Rest of a response body that only arrives once released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def __aiter__(self):
+        await self.release.wait()
+        yield b"data: [DONE]\n\n"
+
+
+class StreamingCompletions(FakeCompletions):
+    """Completions that stream a response in small pieces."""
+
+    def __init__(self, content, piece_size=3, body=None):
+        super().__init__(content)
+        self.piece_size = piece_size
+        self.body = body
+        self.streams = []
+
+    async def create(self, **kwargs):
+        if not kwargs.get("stream"):
+            return await super().create(**kwargs)
+        self.calls += 1
+        pieces = [self.content[i:i + self.piece_size] for i in range(0, len(self.content), self.piece_size)]
+        self.streams.append(FakeStream(pieces, self.body))
+        return self.streams[-1]
+
+
+class TestStreamingExtraction:
+    """Tests for emitting fields while the completion streams."""
+
+    @pytest.mark.asyncio
+    async def test_fields_arrive_in_order_and_are_cached(self):
+        completions = StreamingCompletions("```json\n" + json.dumps(PASS_DATA) + "\n```")
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        events = [event async for event in extractor.extract_stream("Sample document text", context=context)]
+
+        assert events == list(PASS_DATA.items())
+        assert context.path == "llm"
+        assert completions.streams[0].closed
+        assert await extractor.extract("Sample document text") == PASS_DATA
+
+    @pytest.mark.asyncio
+    async def test_numbers_wait_for_delimiter(self):
+        completions = StreamingCompletions(json.dumps(PASS_DATA), piece_size=1)
+        extractor = make_extractor(completions)
+
+        events = dict([event async for event in extractor.extract_stream("Sample document text")])
+
+        assert events["insured_value"] == 5000000
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", ["Sorry, I can't read this document.", '{"policy_number": "A1", "vessel'])
+    async def test_incomplete_response_is_an_error_and_not_cached(self, content):
+        completions = StreamingCompletions(content)
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "rules_enabled", False):
+            with pytest.raises(AIExtractorError, match="Invalid JSON"):
+                async for _ in extractor.extract_stream("Sample document text"):
+                    pass
+            cache_key, cached = await extractor._lookup("Sample document text", ExtractionContext())
+
+        assert cached is None
+        assert extractor.stats()["parse"]["text"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rule_fields_are_emitted_before_llm(self):
+        completions = StreamingCompletions(json.dumps({"policy_number": "HM-2025-10-A4B"}))
+        extractor = make_extractor(completions)
+        document = (
+            "Vessel: MV Neptune\nEffective date: 2025-11-01\nExpiration date: 2026-10-31\n"
+            "Insured value: $5,000,000"
+        )
+        context = ExtractionContext()
+
+        events = [event async for event in extractor.extract_stream(document, context=context)]
+
+        assert events[-1] == ("policy_number", "HM-2025-10-A4B")
+        assert dict(events) == PASS_DATA
+        assert context.path == "hybrid"
+
+
+class TestEarlyStop:
+    """Tests for cutting the completion once all fields are read."""
+
+    @pytest.mark.asyncio
+    async def test_stops_before_trailing_commentary(self):
+        content = json.dumps(PASS_DATA) + "\n\nNote: " + "the policy looks standard. " * 50
+        completions = StreamingCompletions(content, piece_size=8)
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        data = await extractor.extract("Sample document text", context=context)
+
+        stream = completions.streams[0]
+        assert data == PASS_DATA
+        assert stream.closed
+        assert stream.consumed < len(stream.pieces)
+        assert context.completion_budget_unused > 0
+        assert extractor.stats()["early_stops"] == 1
+        assert extractor.stats()["completion_budget_unused"] == context.completion_budget_unused
+
+    @pytest.mark.asyncio
+    async def test_drain_does_not_delay_the_result(self):
+        """The rest of a stopped stream is drained after the result is returned."""
+        body = HeldBody()
+        completions = StreamingCompletions(json.dumps(PASS_DATA) + "\nDone.", piece_size=8, body=body)
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_early_stop_drain_seconds", 5.0):
+            assert await extractor.extract("Sample document text") == PASS_DATA
+            stream = completions.streams[0]
+            assert not stream.closed
+
+            body.release.set()
+            await extractor.aclose()
+
+        assert stream.closed
+        assert extractor.stats()["early_stop_drains"] == {"drained": 1, "discarded": 0}
+
+    @pytest.mark.asyncio
+    async def test_disabled_reads_whole_response(self):
+        content = json.dumps(PASS_DATA) + "\nDone."
+        completions = StreamingCompletions(content, piece_size=8)
+        extractor = make_extractor(completions)
+        context = ExtractionContext()
+
+        with patch.object(settings, "ai_early_stop_enabled", False):
+            data = await extractor.extract("Sample document text", context=context)
+
+        assert data == PASS_DATA
+        assert completions.streams[0].consumed == len(completions.streams[0].pieces)
+        assert context.completion_budget_unused is None
+
+    @pytest.mark.asyncio
+    async def test_response_without_object_is_an_error(self):
+        completions = FakeCompletions(content="Sorry, I cannot help with that.")
+        extractor = make_extractor(completions)
+
+        with pytest.raises(AIExtractorError):
+            await extractor.extract("Sample document text")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", [
+        '{"policy_number": "A1", "vessel_name": "MV Ne',
+        "{not json at all}",
+        '{"policy_number": "A1" "vessel_name": "MV Neptune"}',
+    ])
+    async def test_incomplete_object_is_an_error(self, content):
+        """Output the incremental parser could not finish goes through the full parse, and fails uncached."""
+        completions = FakeCompletions(content=content)
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "rules_enabled", False):
+            for _ in range(2):
+                with pytest.raises(AIExtractorError, match="Invalid JSON"):
+                    await extractor.extract("Sample document text")
+
+        assert completions.calls == 2
+        parse = extractor.stats()["parse"]["text"]
+        assert parse["parsed"] == 0
+        assert parse["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unfinished_stream_is_repaired(self):
+        content = json.dumps(PASS_DATA).replace('"', "'")
+        completions = FakeCompletions(content=content)
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "rules_enabled", False):
+            assert await extractor.extract("Sample document text") == PASS_DATA
+            assert await extractor.extract("Sample document text") == PASS_DATA
+
+        assert completions.calls == 2
+        assert extractor.stats()["parse"]["text"]["repaired"] == 2
+
+
+class ModelCompletions(FakeCompletions):
+    """Fake that answers differently per model and records which models were called."""
+
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = answers
+        self.models = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        answer = self.answers[kwargs["model"]]
+        if isinstance(answer, Exception):
+            self.calls += 1
+            raise answer
+        self.content = json.dumps(answer)
+        return await super().create(**kwargs)
+
+
+def make_cascade_extractor(completions):
+    with patch.object(settings, "ai_cascade_enabled", True), \
+            patch.object(settings, "ai_cascade_models", "small-model"), \
+            patch.object(settings, "ai_model", "large-model"), \
+            patch.object(settings, "rules_enabled", False):
+        return make_extractor(completions)
+
+
+class TestModelCascade:
+    """Tests for trying the small model first and escalating on a low score."""
+
+    @pytest.mark.asyncio
+    async def test_confident_small_model_is_accepted(self):
+        completions = ModelCompletions({"small-model": PASS_DATA, "large-model": PASS_DATA})
+        extractor = make_cascade_extractor(completions)
+
+        data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.models == ["small-model"]
+        cascade = extractor.stats()["cascade"]
+        assert cascade["tiers"] == ["small-model", "large-model"]
+        assert cascade["accepted"] == {"small-model": 1, "large-model": 0}
+        assert cascade["escalation_rate"] == 0
+
+    @pytest.mark.asyncio
+    async def test_incomplete_answer_escalates(self):
+        sparse = {**PASS_DATA, "vessel_name": None, "insured_value": None}
+        completions = ModelCompletions({"small-model": sparse, "large-model": PASS_DATA})
+        extractor = make_cascade_extractor(completions)
+
+        data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.models == ["small-model", "large-model"]
+        cascade = extractor.stats()["cascade"]
+        assert cascade["escalated"] == 1
+        assert cascade["escalation_rate"] == 1
+        assert cascade["latency_saved_seconds"] <= 0
+
+    @pytest.mark.asyncio
+    async def test_small_model_error_escalates(self):
+        completions = ModelCompletions({"small-model": make_connection_error(), "large-model": PASS_DATA})
+        extractor = make_cascade_extractor(completions)
+
+        with patch.object(settings, "ai_max_retries", 0):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        assert completions.models == ["small-model", "large-model"]
+
+    @pytest.mark.asyncio
+    async def test_disagreement_with_local_parse_escalates(self):
+        misread = {**PASS_DATA, "insured_value": 500000}
+        completions = ModelCompletions({"small-model": misread, "large-model": PASS_DATA})
+        extractor = make_cascade_extractor(completions)
+        extractor.rule_extractor = ai_extractor_module.RuleBasedExtractor()
+
+        data = await extractor.extract("Hull cover placed for $5,000,000 with the usual clauses.")
+
+        assert completions.models == ["small-model", "large-model"]
+        assert data["insured_value"] == 5000000
+
+    @pytest.mark.asyncio
+    async def test_rule_fields_do_not_affect_the_score(self, sample_fail_document):
+        """Test that reversed dates found by the rules do not escalate the tier that only read the policy number."""
+        completions = ModelCompletions({"small-model": {"policy_number": "WND-PENDING"}, "large-model": PASS_DATA})
+        extractor = make_cascade_extractor(completions)
+        extractor.rule_extractor = ai_extractor_module.RuleBasedExtractor()
+
+        data = await extractor.extract(sample_fail_document)
+
+        assert completions.models == ["small-model"]
+        assert data["policy_number"] == "WND-PENDING"
+        assert data["policy_end_date"] < data["policy_start_date"]
+
+    @pytest.mark.asyncio
+    async def test_cascade_disabled_uses_configured_model(self):
+        completions = ModelCompletions({settings.ai_model: PASS_DATA})
+        extractor = make_extractor(completions)
+
+        await extractor.extract("Sample document text")
+
+        assert completions.models == [settings.ai_model]
+        assert extractor.stats()["cascade"] is None
+
+
+def make_structured_extractor(completions):
+    with patch.object(settings, "ai_structured_output_enabled", True), \
+            patch.object(settings, "rules_enabled", False):
+        return make_extractor(completions)
+
+
+class TestStructuredOutput:
+    """Tests for JSON mode with a schema-derived completion budget."""
+
+    @pytest.mark.asyncio
+    async def test_request_uses_json_mode_and_schema(self):
+        completions = RecordingCompletions()
+        extractor = make_structured_extractor(completions)
+
+        data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        request = completions.requests[0]
+        assert request["response_format"] == {"type": "json_object"}
+        assert not request.get("stream")
+        assert request["max_tokens"] == max_output_tokens(list(PASS_DATA))
+        assert request["max_tokens"] < settings.ai_max_tokens
+        assert '"required":["policy_number"' in request["messages"][0]["content"]
+        assert extractor.stats()["parse"]["json"]["parsed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_covers_only_requested_fields(self):
+        """Fields read by the rule fast path are left out of the schema and the budget."""
+        completions = RecordingCompletions()
+        extractor = make_structured_extractor(completions)
+        extractor.rule_extractor = ai_extractor_module.RuleBasedExtractor()
+
+        await extractor.extract("Policy Number: HM-2025-10-A4B\nThe vessel sails under a hull cover.")
+
+        request = completions.requests[0]
+        assert request["max_tokens"] < max_output_tokens(list(PASS_DATA))
+        assert '"policy_number"' not in request["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        completions = RecordingCompletions()
+        with patch.object(settings, "rules_enabled", False):
+            extractor = make_extractor(completions)
+
+        await extractor.extract("Sample document text")
+
+        request = completions.requests[0]
+        assert "response_format" not in request
+        assert request["max_tokens"] == settings.ai_max_tokens
+        assert extractor.stats()["parse"]["structured_output"] is False
+
+
+class TestParseRepair:
+    """Tests for repairing near-valid JSON instead of failing the request."""
+
+    @pytest.mark.asyncio
+    async def test_near_valid_json_is_repaired(self):
+        content = "Here you go:\n```json\n" + json.dumps(PASS_DATA)[:-1] + ",}\n```"
+        extractor = make_extractor(FakeCompletions(content))
+
+        with patch.object(settings, "ai_hedging_enabled", True), patch.object(settings, "rules_enabled", False):
+            data = await extractor.extract("Sample document text")
+
+        assert data == PASS_DATA
+        parse = extractor.stats()["parse"]["text"]
+        assert parse["repaired"] == 1
+        assert parse["repair_rate"] == 1.0
+        assert parse["failure_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_repaired_result_is_not_cached(self):
+        completions = FakeCompletions(json.dumps(PASS_DATA)[:-1] + ",}")
+        extractor = make_extractor(completions)
+
+        with patch.object(settings, "ai_hedging_enabled", True), patch.object(settings, "rules_enabled", False):
+            assert await extractor.extract("Sample document text") == PASS_DATA
+            assert await extractor.extract("Sample document text") == PASS_DATA
+
+        assert completions.calls == 2
+        assert extractor.stats()["parse"]["text"]["repaired"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", ["{", '{"policy_number": "AB', json.dumps(PASS_DATA)[:-8]])
+    async def test_repair_that_loses_fields_fails(self, content):
+        """Truncated output is an error, not an answer with the lost fields set to None."""
+        completions = FakeCompletions(content)
+        extractor = make_structured_extractor(completions)
+
+        for _ in range(2):
+            with pytest.raises(AIExtractorError, match="Invalid JSON"):
+                await extractor.extract("Sample document text")
+
+        assert completions.calls == 2
+        assert extractor.stats()["parse"]["json"]["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unrepairable_response_is_counted(self):
+        extractor = make_structured_extractor(FakeCompletions("No policy details found."))
+
+        with pytest.raises(AIExtractorError, match="Invalid JSON"):
+            await extractor.extract("Sample document text")
+
+        parse = extractor.stats()["parse"]["json"]
+        assert parse["failed"] == 1
+        assert parse["failure_rate"] == 1.0
@@ -0,0 +1,79 @@
+"""
+Unit tests for the in-memory extraction cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.cache import ExtractionCache, make_cache_key, normalize_document
+
+
+VALUE = {"policy_number": "HM-1", "vessel_name": "MV Neptune"}
+
+
+class TestCacheKey:
+    """Tests for content-addressed cache keys."""
+
+    def test_whitespace_is_normalized(self):
+        """Test that whitespace-only differences share a key."""
+        first = make_cache_key("Policy  HM-1\n\nVessel", "model", 0.1, "1")
+        second = make_cache_key(" Policy HM-1 Vessel ", "model", 0.1, "1")
+        assert first == second
+
+    def test_key_depends_on_model_temperature_and_prompt(self):
+        """Test that model, temperature and prompt version change the key."""
+        base = make_cache_key("doc", "model", 0.1, "1")
+        assert base != make_cache_key("doc", "other-model", 0.1, "1")
+        assert base != make_cache_key("doc", "model", 0.2, "1")
+        assert base != make_cache_key("doc", "model", 0.1, "2")
+
+    def test_normalize_document(self):
+        assert normalize_document("  a \t b\n c ") == "a b c"
+
+
+class TestExtractionCache:
+    """Tests for LRU and TTL behaviour."""
+
+    def test_hit_and_miss_counters(self):
+        cache = ExtractionCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+        assert cache.get("k") is None
+        cache.set("k", VALUE)
+        assert cache.get("k") == VALUE
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_returned_value_is_a_copy(self):
+        cache = ExtractionCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+        cache.set("k", VALUE)
+        cache.get("k")["vessel_name"] = "Changed"
+        assert cache.get("k")["vessel_name"] == "MV Neptune"
+
+    def test_lru_eviction_by_entry_count(self):
+        cache = ExtractionCache(max_entries=2, max_bytes=10_000, ttl_seconds=60)
+        cache.set("a", VALUE)
+        cache.set("b", VALUE)
+        cache.get("a")
+        cache.set("c", VALUE)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_memory(self):
+        cache = ExtractionCache(max_entries=100, max_bytes=200, ttl_seconds=60)
+        for i in range(10):
+            cache.set(f"key-{i}", VALUE)
+        assert cache.stats()["bytes"] <= 200
+        assert cache.stats()["evictions"] > 0
+
+    def test_oversized_entry_is_skipped(self):
+        cache = ExtractionCache(max_entries=100, max_bytes=10, ttl_seconds=60)
+        cache.set("k", VALUE)
+        assert len(cache) == 0
+
+    def test_ttl_expiry(self):
+        cache = ExtractionCache(max_entries=10, max_bytes=10_000, ttl_seconds=5)
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("k", VALUE)
+        with patch("app.services.cache.time.monotonic", return_value=106.0):
+            assert cache.get("k") is None
+        assert cache.stats()["expirations"] == 1
@@ -0,0 +1,72 @@
+"""
+Unit tests for scoring small-model extractions in the model cascade.
+"""
+import pytest
+
+from app.services.cascade import parse_tiers, score_extraction
+
+FIELDS = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
+
+GOOD = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "MV Neptune",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": "2026-10-31",
+    "insured_value": 5000000
+}
+
+
+class TestParseTiers:
+    """Tests for building the tier list from settings."""
+
+    def test_final_model_is_last(self):
+        assert parse_tiers("small, medium", "large") == ["small", "medium", "large"]
+
+    def test_final_model_not_repeated(self):
+        assert parse_tiers("small,large,", "large") == ["small", "large"]
+
+
+class TestScoreExtraction:
+    """Tests for the confidence checks."""
+
+    def test_complete_answer_scores_one(self):
+        result = score_extraction(GOOD, FIELDS)
+        assert result.score == 1.0
+        assert result.reasons == []
+
+    def test_schema_failure_scores_zero(self):
+        result = score_extraction({**GOOD, "insured_value": "five million"}, FIELDS)
+        assert result.score == 0.0
+        assert result.reasons[0].startswith("schema")
+
+    def test_missing_fields_lower_the_score(self):
+        result = score_extraction({**GOOD, "policy_number": None}, FIELDS)
+        assert result.score == pytest.approx(0.8)
+        assert result.reasons == ["missing: policy_number"]
+
+    def test_only_requested_fields_count(self):
+        result = score_extraction({**GOOD, "policy_number": None}, ["vessel_name"])
+        assert result.score == 1.0
+
+    def test_reversed_dates_are_left_to_validation(self):
+        result = score_extraction({**GOOD, "policy_start_date": "2027-01-01"}, FIELDS)
+        assert result.score == 1.0
+
+    def test_fields_outside_the_tier_are_ignored(self):
+        data = {**GOOD, "policy_end_date": "2926-10-31", "insured_value": "five million"}
+        assert score_extraction(data, ["policy_number", "vessel_name"]).score == 1.0
+
+    def test_implausible_year_scores_zero(self):
+        result = score_extraction({**GOOD, "policy_end_date": "2926-10-31"}, FIELDS)
+        assert result.score == 0.0
+        assert "implausible date" in result.reasons[0]
+
+    def test_agreement_with_hints(self):
+        hints = {"vessel_name": "M/V NEPTUNE", "insured_value": 5000000, "policy_number": None}
+        assert score_extraction(GOOD, FIELDS, hints).score == 1.0
+
+    def test_disagreement_with_hints(self):
+        hints = {"vessel_name": "Oceanic Voyager", "insured_value": 5000000}
+        result = score_extraction(GOOD, FIELDS, hints)
+        assert result.score == pytest.approx(0.5)
+        assert result.reasons == ["disagrees with local parse: vessel_name"]
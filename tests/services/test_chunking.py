@@ -0,0 +1,81 @@
+"""
+Unit tests for chunk splitting and merging.
+"""
+import pytest
+
+from app.services.chunking import merge_chunk_results, split_into_chunks
+
+
+FIELDS = ["policy_number", "vessel_name", "insured_value"]
+
+
+class TestSplitIntoChunks:
+    """Tests for overlapping chunk boundaries."""
+
+    def test_short_text_is_one_chunk(self):
+        assert split_into_chunks("short text", chunk_tokens=100, overlap_tokens=10) == ["short text"]
+
+    def test_chunks_cover_text_with_overlap(self):
+        words = [f"word{i}" for i in range(2000)]
+        text = " ".join(words)
+
+        chunks = split_into_chunks(text, chunk_tokens=500, overlap_tokens=50)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 500 * 4 for chunk in chunks)
+        assert chunks[0].split()[0] == "word0"
+        assert chunks[-1].split()[-1] == "word1999"
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous
+
+    def test_chunks_break_on_whitespace(self):
+        text = " ".join(["alpha"] * 1000)
+        chunks = split_into_chunks(text, chunk_tokens=100, overlap_tokens=10)
+        assert all(chunk.startswith("alpha") and chunk.endswith("alpha") for chunk in chunks)
+
+
+class TestMergeChunkResults:
+    """Tests for the conflict-resolution policies."""
+
+    def test_majority_vote(self):
+        results = [
+            {"policy_number": "A-1", "vessel_name": None, "insured_value": 100},
+            {"policy_number": "B-2", "vessel_name": "MV Neptune", "insured_value": 200},
+            {"policy_number": "B-2", "vessel_name": "mv  neptune", "insured_value": None},
+        ]
+
+        merged, provenance = merge_chunk_results(results, FIELDS, "vote")
+
+        assert merged == {"policy_number": "B-2", "vessel_name": "MV Neptune", "insured_value": 100}
+        assert provenance["policy_number"] == {"chunks": [1, 2], "candidates": 2}
+        assert provenance["vessel_name"]["chunks"] == [1, 2]
+
+    def test_vote_tie_prefers_earliest_chunk(self):
+        results = [{"policy_number": "A-1"}, {"policy_number": "B-2"}]
+        merged, _ = merge_chunk_results(results, ["policy_number"], "vote")
+        assert merged["policy_number"] == "A-1"
+
+    def test_first_non_null(self):
+        results = [
+            {"policy_number": None},
+            {"policy_number": "B-2"},
+            {"policy_number": "C-3"},
+            {"policy_number": "C-3"},
+        ]
+        merged, provenance = merge_chunk_results(results, ["policy_number"], "first")
+        assert merged["policy_number"] == "B-2"
+        assert provenance["policy_number"]["chunks"] == [1]
+
+    def test_failed_chunks_are_skipped(self):
+        merged, provenance = merge_chunk_results([None, {"policy_number": "A-1"}], ["policy_number"])
+        assert merged["policy_number"] == "A-1"
+        assert provenance["policy_number"]["chunks"] == [1]
+
+    def test_missing_everywhere(self):
+        merged, provenance = merge_chunk_results([{"policy_number": None}], ["policy_number"])
+        assert merged["policy_number"] is None
+        assert provenance["policy_number"]["candidates"] == 0
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            merge_chunk_results([], FIELDS, "random")
@@ -0,0 +1,132 @@
+"""
+Unit tests for the compiled, memory-mapped vessel registry.
+"""
+import json
+import os
+
+from app.cli import main as cli_main
+from app.services.compact_registry import MappedVesselIndex, compile_registry, load_names, read_version
+from app.services.vessel_index import VesselIndex
+from app.services.vessel_registry import VesselRegistry
+
+
+def compile_to(tmp_path, names, filename="vessels.vreg"):
+    path = tmp_path / filename
+    compile_registry(names, path)
+    return path
+
+
+class TestMappedVesselIndex:
+    """Tests for lookups over the mapped buffer."""
+
+    def test_exact_lookup_is_normalized(self, tmp_path):
+        index = MappedVesselIndex(compile_to(tmp_path, ["MV Neptune", "The Wanderer", "Sea Breeze"]))
+
+        match = index.lookup("m.v. NEPTUNE")
+
+        assert match.exact
+        assert match.canonical == "MV Neptune"
+        assert len(index) == 3
+
+    def test_duplicates_keep_first_canonical(self, tmp_path):
+        index = MappedVesselIndex(compile_to(tmp_path, ["MV Neptune", "Neptune"]))
+        assert len(index) == 1
+        assert index.lookup("neptune").canonical == "MV Neptune"
+
+    def test_near_match_and_miss(self, tmp_path):
+        index = MappedVesselIndex(compile_to(tmp_path, ["MV Neptune", "The Wanderer"]))
+
+        near = index.lookup("Neptunr")
+        assert not near.exact
+        assert near.canonical == "MV Neptune"
+
+        assert index.lookup("Completely Different").canonical is None
+
+    def test_empty_registry(self, tmp_path):
+        index = MappedVesselIndex(compile_to(tmp_path, []))
+        assert len(index) == 0
+        assert index.lookup("Neptune").canonical is None
+
+    def test_agrees_with_in_memory_index(self, tmp_path):
+        names = [f"Vessel {i:05d}" for i in range(5000)]
+        mapped = MappedVesselIndex(compile_to(tmp_path, names))
+        memory = VesselIndex(names)
+
+        for probe in ["vessel 00042", "MV Vessel 04999", "Vessel 04999x", "Unrelated Name"]:
+            assert mapped.lookup(probe).canonical == memory.lookup(probe).canonical
+
+    def test_names_and_unicode(self, tmp_path):
+        index = MappedVesselIndex(compile_to(tmp_path, ["Ærø Star", "Østersøen"]))
+        assert sorted(index.names) == ["Ærø Star", "Østersøen"]
+        assert index.lookup("ærø star").exact
+
+
+class TestLoadNames:
+    """Tests for reading compiler input."""
+
+    def test_json(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        path.write_text(json.dumps(["MV Neptune"]))
+        assert load_names(path) == ["MV Neptune"]
+
+    def test_csv_with_name_column(self, tmp_path):
+        path = tmp_path / "vessels.csv"
+        path.write_text("imo,vessel_name\n1234567,MV Neptune\n7654321,The Wanderer\n")
+        assert load_names(path) == ["MV Neptune", "The Wanderer"]
+
+    def test_csv_without_header(self, tmp_path):
+        path = tmp_path / "vessels.csv"
+        path.write_text("MV Neptune\nThe Wanderer\n")
+        assert load_names(path) == ["MV Neptune", "The Wanderer"]
+
+
+class TestCompactRegistry:
+    """Tests for serving a compiled file through the registry."""
+
+    def test_registry_maps_compiled_file(self, tmp_path):
+        path = compile_to(tmp_path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+
+        assert isinstance(registry.snapshot.index, MappedVesselIndex)
+        assert registry.snapshot.version == read_version(path)
+        assert registry.snapshot.names == ["MV Neptune"]
+
+    def test_recompile_swaps_snapshot(self, tmp_path):
+        path = compile_to(tmp_path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        old = registry.snapshot
+
+        compile_registry(["MV Neptune", "The Wanderer"], path)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+
+        assert registry.reload_if_changed()
+        assert registry.snapshot.index.lookup("the wanderer").exact
+        assert old.index.lookup("MV Neptune").exact
+
+    def test_invalid_file_keeps_previous_snapshot(self, tmp_path):
+        path = compile_to(tmp_path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        old = registry.snapshot
+
+        path.write_bytes(b"not a registry" * 4)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+
+        assert not registry.reload_if_changed()
+        assert registry.snapshot is old
+
+
+class TestRegistryCli:
+    """Tests for the registry compile and lookup commands."""
+
+    def test_compile_and_lookup(self, tmp_path, capsys):
+        source = tmp_path / "vessels.json"
+        source.write_text(json.dumps(["MV Neptune", "The Wanderer"]))
+        output = tmp_path / "vessels.vreg"
+
+        assert cli_main(["registry", "compile", str(source), str(output)]) == 0
+        assert cli_main(["registry", "lookup", str(output), "neptune"]) == 0
+        assert cli_main(["registry", "lookup", str(output), "Titanic"]) == 1
+
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert "Compiled 2 names" in lines[0]
+        assert json.loads(lines[1])["canonical"] == "MV Neptune"
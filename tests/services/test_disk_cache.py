@@ -0,0 +1,128 @@
+"""
+Unit tests for the persistent extraction cache.
+"""
+import multiprocessing
+
+import pytest
+
+from app.cli import main as cli_main
+from app.services.disk_cache import DiskExtractionCache
+
+
+VALUE = {"policy_number": "HM-1", "vessel_name": "MV Neptune", "policy_start_date": "2025-11-01"}
+
+
+def make_cache(tmp_path, max_bytes=1_000_000, ttl_seconds=None):
+    return DiskExtractionCache(path=tmp_path / "cache.sqlite3", max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+
+
+def age_entry(cache, key, seconds):
+    cache._connect().execute("UPDATE entries SET created_at = created_at - ? WHERE key = ?", (seconds, key))
+
+
+def write_entries(path, worker, count):
+    cache = DiskExtractionCache(path=path, max_bytes=1_000_000)
+    for i in range(count):
+        cache.set(f"{worker}-{i}", VALUE, "model", "1")
+        cache.get(f"{worker}-{i}")
+    cache.close()
+
+
+class TestDiskExtractionCache:
+    """Tests for the SQLite-backed cache."""
+
+    def test_round_trip(self, tmp_path):
+        cache = make_cache(tmp_path)
+        assert cache.get("k") is None
+        cache.set("k", VALUE, "model", "1")
+        assert cache.get("k") == VALUE
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_survives_reopen(self, tmp_path):
+        """Test that entries persist across processes and restarts."""
+        make_cache(tmp_path).set("k", VALUE, "model", "1")
+        assert make_cache(tmp_path).get("k") == VALUE
+
+    def test_uses_wal_mode(self, tmp_path):
+        cache = make_cache(tmp_path)
+        mode = cache._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_size_tracking_on_overwrite(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.set("k", VALUE, "model", "1")
+        size = cache.total_bytes()
+        cache.set("k", VALUE, "model", "1")
+        assert cache.total_bytes() == size
+
+    def test_size_based_eviction(self, tmp_path):
+        cache = make_cache(tmp_path, max_bytes=1000)
+        for i in range(50):
+            cache.set(f"key-{i}", VALUE, "model", "1")
+        assert cache.total_bytes() <= 1000
+        assert cache.stats()["evictions"] > 0
+        assert cache.get("key-49") == VALUE
+
+    def test_prune_by_version(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.set("old", VALUE, "model", "1")
+        cache.set("new", VALUE, "model", "2")
+        assert cache.prune(prompt_version="1") == 1
+        assert cache.get("old") is None
+        assert cache.get("new") == VALUE
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test that entries older than the TTL are dropped even if recently read."""
+        cache = make_cache(tmp_path, ttl_seconds=60)
+        cache.set("k", VALUE, "model", "1")
+        age_entry(cache, "k", 30)
+        assert cache.get("k") == VALUE
+
+        age_entry(cache, "k", 31)
+        assert cache.get("k") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_prune_removes_expired(self, tmp_path):
+        cache = make_cache(tmp_path, ttl_seconds=60)
+        cache.set("old", VALUE, "model", "1")
+        cache.set("new", VALUE, "model", "1")
+        age_entry(cache, "old", 120)
+        assert cache.prune() == 1
+        assert cache.get("new") == VALUE
+
+    def test_no_ttl_keeps_entries(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.set("k", VALUE, "model", "1")
+        age_entry(cache, "k", 10 * 365 * 86400)
+        assert cache.get("k") == VALUE
+
+    def test_concurrent_writers_across_processes(self, tmp_path):
+        """Test that several processes can write the same file at once."""
+        path = tmp_path / "cache.sqlite3"
+        make_cache(tmp_path)
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=write_entries, args=(path, w, 25)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+        assert make_cache(tmp_path).stats()["entries"] == 100
+
+
+class TestCacheCli:
+    """Tests for the cache CLI."""
+
+    def test_stats_and_prune(self, tmp_path, capsys):
+        path = tmp_path / "cache.sqlite3"
+        cache = DiskExtractionCache(path=path, max_bytes=1_000_000)
+        cache.set("k", VALUE, "model", "1")
+
+        assert cli_main(["cache", "--path", str(path), "stats"]) == 0
+        assert '"entries": 1' in capsys.readouterr().out
+
+        assert cli_main(["cache", "--path", str(path), "prune", "--model", "model"]) == 0
+        assert "Removed 1 entries" in capsys.readouterr().out
@@ -0,0 +1,156 @@
+"""
+Tests for the shared LLM connection pool.
+"""
+import asyncio
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import uvicorn
+
+from app.core.config import settings
+from app.services import http_pool
+from app.services.ai_extractor import AIExtractor
+from app.services.http_pool import LLMConnectionPool
+from benchmarks.stub_llm import StubConfig, create_stub_app
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """Serve the stub chat completions API on a real local socket."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        create_stub_app(StubConfig(latency="fixed", latency_ms=0)), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def make_pool(**overrides):
+    options = dict(
+        max_connections=10, max_keepalive_connections=10, keepalive_expiry=30.0, connect_timeout=5.0, read_timeout=10.0
+    )
+    options.update(overrides)
+    return LLMConnectionPool(**options)
+
+
+class TestConnectionReuse:
+    """Tests for keep-alive reuse and its counters."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_share_a_connection(self, stub_url):
+        """Requests after the first reuse the kept-alive connection."""
+        pool = make_pool()
+        try:
+            for _ in range(3):
+                response = await pool.client.get(f"{stub_url}/stats")
+                assert response.status_code == 200
+        finally:
+            await pool.aclose()
+
+        stats = pool.stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["reused_requests"] == 2
+        assert stats["tls_handshakes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections(self, stub_url):
+        """Pre-warmed connections are reused by later requests."""
+        pool = make_pool()
+        try:
+            assert await pool.prewarm(stub_url, 3) == 3
+            await pool.client.get(f"{stub_url}/stats")
+        finally:
+            await pool.aclose()
+
+        stats = pool.stats()
+        assert stats["prewarmed"] == 3
+        assert stats["connections_opened"] == 3
+        assert stats["reused_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_is_not_fatal(self):
+        """An unreachable provider only logs a warning."""
+        pool = make_pool(connect_timeout=0.5)
+        try:
+            assert await pool.prewarm("http://127.0.0.1:1", 2) == 0
+        finally:
+            await pool.aclose()
+
+    def test_http2_falls_back_without_h2(self):
+        """HTTP/2 is switched off when h2 is not installed."""
+        with patch.object(http_pool, "http2_available", return_value=False):
+            pool = make_pool(http2=True)
+        assert pool.stats()["http2"] is False
+
+
+class TestSharedPool:
+    """Tests for sharing one pool between extractors."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_pool(self):
+        http_pool._pool = None
+        yield
+        http_pool._pool = None
+
+    async def extract_repeatedly(self, stub_url, early_stop=True, count=2):
+        with patch.object(settings, "groq_base_url", stub_url), patch.object(settings, "rules_enabled", False):
+            first = AIExtractor()
+            second = AIExtractor()
+        first.inflight = second.inflight = None
+
+        with patch.object(settings, "ai_early_stop_enabled", early_stop):
+            await first.extract("Document one")
+            await first.aclose()
+            for index in range(1, count):
+                await second.extract(f"Document {index + 1}")
+                # Early-stopped streams are drained in the background; let that finish before the next call.
+                await asyncio.gather(*second._drains)
+
+        assert first.http_pool is second.http_pool
+        stats = second.stats()
+        await http_pool.close_http_pool()
+        return stats
+
+    @pytest.mark.asyncio
+    async def test_extractors_share_the_pool(self, stub_url):
+        """A second extractor reuses the connection left open by the first."""
+        stats = (await self.extract_repeatedly(stub_url, early_stop=False))["http_pool"]
+        assert stats["requests"] == 2
+        assert stats["connections_opened"] == 1
+        assert stats["reuse_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_early_stop_keeps_the_connection(self, stub_url):
+        """A stream stopped early is drained after the result returns, so its connection goes back to the pool."""
+        stats = await self.extract_repeatedly(stub_url, count=6)
+        assert stats["early_stops"] == 5
+        assert stats["early_stop_drains"] == {"drained": 5, "discarded": 0}
+        assert stats["http_pool"]["requests"] == 6
+        assert stats["http_pool"]["connections_opened"] == 1
+
+    @pytest.mark.asyncio
+    async def test_early_stop_over_drain_budget_gives_up_the_connection(self, stub_url):
+        """A stream with more left than the drain budget is closed, discarding its connection."""
+        with patch.object(settings, "ai_early_stop_drain_bytes", 0):
+            stats = await self.extract_repeatedly(stub_url)
+        assert stats["early_stop_drains"] == {"drained": 0, "discarded": 1}
+        assert stats["http_pool"]["connections_opened"] == 2
+
+    def test_pool_can_be_disabled(self):
+        """Each extractor gets its own client when pooling is off."""
+        with patch.object(settings, "ai_http_pool_enabled", False):
+            extractor = AIExtractor()
+        assert extractor.http_pool is None
+        assert extractor.stats()["http_pool"] is None
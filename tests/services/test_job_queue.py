@@ -0,0 +1,242 @@
+"""
+Unit tests for the SQLite-backed job queue and worker pool.
+"""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.services.job_queue import FAILED, QUEUED, RUNNING, SCHEMA, SUCCEEDED, JobQueue
+from app.services.job_worker import JobWorkerPool
+from app.utils.exceptions import JobProcessingError
+
+
+def make_queue(tmp_path, lease_seconds=60.0, max_attempts=3):
+    return JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+
+class TestJobQueue:
+    """Tests for enqueueing, leasing and finishing jobs."""
+
+    def test_claim_is_exclusive(self, tmp_path):
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document")
+
+        job = queue.claim("worker-a")
+        assert job["id"] == job_id
+        assert job["status"] == RUNNING
+        assert job["attempts"] == 1
+        assert queue.claim("worker-b") is None
+
+    def test_claims_in_submission_order(self, tmp_path):
+        queue = make_queue(tmp_path)
+        first = queue.enqueue("first")
+        second = queue.enqueue("second")
+        assert [queue.claim("w")["id"], queue.claim("w")["id"]] == [first, second]
+
+    def test_only_lease_owner_can_complete(self, tmp_path):
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document")
+        queue.claim("worker-a")
+
+        assert not queue.complete(job_id, "worker-b", {"ok": True})
+        assert queue.complete(job_id, "worker-a", {"ok": True})
+
+        job = queue.get(job_id)
+        assert job["status"] == SUCCEEDED
+        assert job["result"] == {"ok": True}
+
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        queue = make_queue(tmp_path, lease_seconds=-1)
+        job_id = queue.enqueue("document")
+        queue.claim("worker-a")
+
+        job = queue.claim("worker-b")
+        assert job["id"] == job_id
+        assert job["attempts"] == 2
+        assert not queue.complete(job_id, "worker-a", {})
+
+    def test_expired_lease_fails_after_max_attempts(self, tmp_path):
+        queue = make_queue(tmp_path, lease_seconds=-1, max_attempts=1)
+        job_id = queue.enqueue("document")
+        queue.claim("worker-a")
+
+        assert queue.claim("worker-b") is None
+        assert queue.get(job_id)["status"] == FAILED
+
+    def test_retryable_failure_is_requeued(self, tmp_path):
+        queue = make_queue(tmp_path, max_attempts=2)
+        job_id = queue.enqueue("document")
+
+        queue.claim("w")
+        queue.fail(job_id, "w", 503, "busy", retry=True)
+        assert queue.get(job_id)["status"] == QUEUED
+
+        queue.claim("w")
+        queue.fail(job_id, "w", 503, "busy", retry=True)
+        job = queue.get(job_id)
+        assert job["status"] == FAILED
+        assert job["error"] == {"status_code": 503, "detail": "busy"}
+
+    def test_delayed_retry_is_not_claimed_early(self, tmp_path):
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document")
+
+        queue.claim("w")
+        queue.fail(job_id, "w", 429, "throttled", retry=True, delay_seconds=60)
+        assert queue.get(job_id)["status"] == QUEUED
+        assert queue.stats()["delayed"] == 1
+        assert queue.claim("w") is None
+
+        queue._connect().execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+        assert queue.claim("w")["id"] == job_id
+
+    def test_adds_available_at_to_existing_queue(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "jobs.sqlite3")
+        conn.executescript(SCHEMA.replace("available_at REAL NOT NULL DEFAULT 0,", ""))
+        conn.close()
+
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document")
+        assert queue.claim("w")["id"] == job_id
+
+    def test_release_returns_job_without_spending_an_attempt(self, tmp_path):
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document")
+        queue.claim("w")
+
+        assert queue.release(job_id, "w")
+        job = queue.get(job_id)
+        assert job["status"] == QUEUED
+        assert job["attempts"] == 0
+
+    def test_jobs_survive_reopen(self, tmp_path):
+        queue = make_queue(tmp_path)
+        job_id = queue.enqueue("document", use_cache=False)
+        queue.close()
+
+        job = make_queue(tmp_path).claim("w")
+        assert job["id"] == job_id
+        assert job["use_cache"] is False
+        assert job["document_text"] == "document"
+
+
+class TestJobWorkerPool:
+    """Tests for processing queued jobs concurrently."""
+
+    async def wait_for(self, queue, job_id, statuses):
+        for _ in range(200):
+            job = queue.get(job_id)
+            if job["status"] in statuses:
+                return job
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"Job {job_id} stuck in {job['status']}")
+
+    @pytest.mark.asyncio
+    async def test_processes_jobs(self, tmp_path):
+        queue = make_queue(tmp_path)
+        seen = []
+
+        async def process(document_text, use_cache):
+            seen.append(document_text)
+            return {"text": document_text}
+
+        pool = JobWorkerPool(queue, process, concurrency=2, poll_seconds=0.01)
+        job_ids = [queue.enqueue(f"document {i}") for i in range(5)]
+        await pool.start()
+        try:
+            jobs = [await self.wait_for(queue, job_id, {SUCCEEDED}) for job_id in job_ids]
+        finally:
+            await pool.stop()
+
+        assert [job["result"]["text"] for job in jobs] == [f"document {i}" for i in range(5)]
+        assert sorted(seen) == sorted(f"document {i}" for i in range(5))
+        assert pool.stats()["processed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure(self, tmp_path):
+        queue = make_queue(tmp_path)
+
+        async def process(document_text, use_cache):
+            raise JobProcessingError(400, "Invalid data")
+
+        pool = JobWorkerPool(queue, process, concurrency=1, poll_seconds=0.01)
+        job_id = queue.enqueue("document")
+        await pool.start()
+        try:
+            job = await self.wait_for(queue, job_id, {FAILED})
+        finally:
+            await pool.stop()
+
+        assert job["attempts"] == 1
+        assert job["error"]["status_code"] == 400
+
+    @pytest.mark.asyncio
+    async def test_stop_releases_running_job(self, tmp_path):
+        queue = make_queue(tmp_path)
+        started = asyncio.Event()
+
+        async def process(document_text, use_cache):
+            started.set()
+            await asyncio.sleep(10)
+
+        pool = JobWorkerPool(queue, process, concurrency=1, poll_seconds=0.01)
+        job_id = queue.enqueue("document")
+        await pool.start()
+        await asyncio.wait_for(started.wait(), timeout=2)
+        await pool.stop()
+
+        assert queue.get(job_id)["status"] == QUEUED
+
+    @pytest.mark.asyncio
+    async def test_retry_waits_for_retry_after(self, tmp_path):
+        queue = make_queue(tmp_path)
+        attempts = []
+
+        async def process(document_text, use_cache):
+            attempts.append(document_text)
+            raise JobProcessingError(429, "Upstream queue full", retry_after=30)
+
+        pool = JobWorkerPool(queue, process, concurrency=1, poll_seconds=0.01, retry_backoff_seconds=0.01)
+        job_id = queue.enqueue("document")
+        await pool.start()
+        try:
+            await self.wait_for(queue, job_id, {QUEUED})
+            await asyncio.sleep(0.1)
+        finally:
+            await pool.stop()
+
+        assert attempts == ["document"]
+        assert queue.get(job_id)["attempts"] == 1
+        assert pool.stats()["delayed"] == 1
+
+    def test_retry_delay_backs_off(self, tmp_path):
+        pool = JobWorkerPool(
+            make_queue(tmp_path), None, concurrency=1, poll_seconds=0.01,
+            retry_backoff_seconds=1.0, retry_backoff_max_seconds=5.0
+        )
+
+        assert 1.0 <= pool._retry_delay(1, None) <= 2.0
+        assert 1.0 <= pool._retry_delay(10, None) <= 5.0
+        assert pool._retry_delay(1, 30.0) == 30.0
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_queue_calls(self, tmp_path):
+        queue = make_queue(tmp_path)
+        claim = queue.claim
+        entered = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_claim(owner):
+            loop.call_soon_threadsafe(entered.set)
+            time.sleep(0.1)
+            return claim(owner)
+
+        queue.claim = slow_claim
+        pool = JobWorkerPool(queue, None, concurrency=1, poll_seconds=0.01)
+        await pool.start()
+        await asyncio.wait_for(entered.wait(), timeout=2)
+        await pool.stop()
+
+        assert not pool._calls
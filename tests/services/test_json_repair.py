@@ -0,0 +1,48 @@
+"""
+Unit tests for the local repair pass over near-valid JSON completions.
+"""
+from app.services.json_repair import repair_json
+
+
+class TestRepairJSON:
+    """Tests for recovering JSON the model nearly got right."""
+
+    def test_trailing_commas(self):
+        assert repair_json('{"a": 1, "b": [1, 2,],}') == {"a": 1, "b": [1, 2]}
+
+    def test_fenced_with_commentary(self):
+        text = 'Here is the data:\n```json\n{"a": "x"}\n```\nLet me know if you need more.'
+        assert repair_json(text) == {"a": "x"}
+
+    def test_prose_around_object(self):
+        assert repair_json('Sure! {"a": "x"} Hope that helps.') == {"a": "x"}
+
+    def test_python_literals_and_single_quotes(self):
+        assert repair_json("{'a': None, 'b': True, 'c': 'O\\'Brien \"Jr\"'}") == {
+            "a": None, "b": True, "c": "O'Brien \"Jr\""
+        }
+
+    def test_unquoted_keys(self):
+        assert repair_json('{policy_number: "X-1", insured_value: 5}') == {"policy_number": "X-1", "insured_value": 5}
+
+    def test_truncated_member_is_rejected(self):
+        """A value cut off by max_tokens fails the repair rather than silently losing the field."""
+        assert repair_json('{"a": 1, "b": "Vess') is None
+        assert repair_json('{"a": 1, "b": 12') is None
+        assert repair_json('{"policy_number": "AB') is None
+
+    def test_truncated_between_members_is_closed(self):
+        assert repair_json('{"a": 1, "b": 2,') == {"a": 1, "b": 2}
+        assert repair_json("{") == {}
+
+    def test_truncated_array(self):
+        assert repair_json('[{"id": 0, "a": 1}, {"id": 1, "a"') is None
+        assert repair_json('[{"id": 0, "a": 1},') == [{"id": 0, "a": 1}]
+
+    def test_escaped_quotes_survive(self):
+        assert repair_json('{"a": "b\\"c", "d": 2,}') == {"a": 'b"c', "d": 2}
+
+    def test_hopeless_input(self):
+        assert repair_json("I could not find any policy details.") is None
+        assert repair_json('{"a": 1]') is None
+        assert repair_json('{"a": 5,000,000}') is None
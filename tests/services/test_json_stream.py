@@ -0,0 +1,85 @@
+"""
+Unit tests for the incremental JSON parser used on streamed completions.
+"""
+import json
+
+from app.services.json_stream import IncrementalJSONParser
+
+FIELDS = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
+
+DATA = {
+    "policy_number": "HM-2025-10-A4B",
+    "vessel_name": "MV \"Neptune\"",
+    "policy_start_date": "2025-11-01",
+    "policy_end_date": None,
+    "insured_value": 5000000,
+}
+
+
+def feed_all(parser, text, piece_size=1):
+    events = []
+    for i in range(0, len(text), piece_size):
+        events.extend(parser.feed(text[i:i + piece_size]))
+    return events
+
+
+class TestIncrementalJSONParser:
+    """Tests for emitting fields from partial JSON text."""
+
+    def test_character_by_character(self):
+        parser = IncrementalJSONParser(FIELDS)
+        events = feed_all(parser, json.dumps(DATA))
+        assert events == list(DATA.items())
+        assert parser.done
+
+    def test_leading_fence_and_trailing_commentary(self):
+        parser = IncrementalJSONParser(FIELDS)
+        text = "```json\n" + json.dumps(DATA, indent=2) + "\n```\nLet me know if you need anything else."
+        events = feed_all(parser, text, piece_size=4)
+        assert dict(events) == DATA
+
+    def test_done_before_object_closes(self):
+        parser = IncrementalJSONParser(FIELDS)
+        text = json.dumps(DATA)
+        parser.feed(text[:-1] + " ")
+        assert parser.done
+        assert not parser.closed
+
+    def test_number_waits_for_delimiter(self):
+        parser = IncrementalJSONParser(["insured_value"])
+        assert parser.feed('{"insured_value": 500') == []
+        assert parser.feed("0000}") == [("insured_value", 5000000)]
+
+    def test_unknown_and_nested_keys_are_skipped(self):
+        parser = IncrementalJSONParser(["vessel_name"])
+        events = feed_all(parser, '{"notes": {"vessel_name": "wrong"}, "vessel_name": "MV Neptune"}')
+        assert events == [("vessel_name", "MV Neptune")]
+
+    def test_closing_brace_ends_parsing(self):
+        parser = IncrementalJSONParser(FIELDS)
+        parser.feed('{"policy_number": "HM-1"} {"vessel_name": "x"}')
+        assert parser.closed
+        assert parser.done
+        assert parser.result()["vessel_name"] is None
+
+    def test_missing_comma_stops_parsing(self):
+        parser = IncrementalJSONParser(FIELDS)
+        events = feed_all(parser, '{"policy_number": "A1" "vessel_name": "MV Neptune"}')
+        assert events == [("policy_number", "A1")]
+        assert not parser.done
+
+    def test_no_object(self):
+        parser = IncrementalJSONParser(FIELDS)
+        parser.feed("I could not find any policy details.")
+        assert not parser.started
+        assert not parser.done
+
+    def test_reset_discards_partial_state(self):
+        parser = IncrementalJSONParser(FIELDS)
+        feed_all(parser, json.dumps(DATA)[:40])
+        parser.reset()
+        assert not parser.started
+        assert parser.values == {}
+
+        feed_all(parser, json.dumps(DATA))
+        assert parser.result() == DATA
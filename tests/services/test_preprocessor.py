@@ -0,0 +1,91 @@
+"""
+Unit tests for document pre-processing.
+"""
+from app.services.preprocessor import DocumentPreprocessor, WINDOW_GAP_MARKER
+from app.utils.tokens import estimate_tokens
+
+
+preprocessor = DocumentPreprocessor(token_budget=3000)
+
+
+class TestClean:
+    """Tests for whitespace normalization and boilerplate removal."""
+
+    def test_collapses_whitespace(self):
+        text = "Policy   Number:\tHM-1\n\n\n\n  Vessel:  MV Neptune  "
+        assert preprocessor.clean(text) == "Policy Number: HM-1\n\nVessel: MV Neptune"
+
+    def test_strips_email_headers(self):
+        text = "To: Underwriting\nFrom: Broker\nCc: Ops\nSubject: Policy HM-1\n\nVessel: MV Neptune"
+        cleaned = preprocessor.clean(text)
+        assert cleaned.startswith("Subject: Policy HM-1")
+        assert "Broker" not in cleaned
+
+    def test_strips_signature(self):
+        text = "Insured Value: $5,000,000\n\nThanks,\nAlex\nSenior Broker"
+        assert preprocessor.clean(text) == "Insured Value: $5,000,000"
+
+    def test_keeps_signature_like_line_followed_by_values(self):
+        text = "Regards,\nPolicy Number: HM-2025-10-A4B"
+        assert "HM-2025-10-A4B" in preprocessor.clean(text)
+
+    def test_strips_legal_boilerplate(self):
+        text = (
+            "Vessel: MV Neptune\n"
+            "This email is confidential and intended solely for the addressee.\n"
+            "If you have received this message in error please delete it."
+        )
+        assert preprocessor.clean(text) == "Vessel: MV Neptune"
+
+    def test_keeps_boilerplate_lines_with_values(self):
+        text = "Confidential: policy HM-2025-10-A4B for vessel 'MV Neptune'"
+        assert preprocessor.clean(text) == text
+
+    def test_sample_documents_keep_fields(self, sample_pass_document, sample_fail_document):
+        cleaned = preprocessor.clean(sample_pass_document)
+        for value in ["HM-2025-10-A4B", "MV Neptune", "November 1st, 2025", "October 31st, 2026", "$5,000,000"]:
+            assert value in cleaned
+        assert "terms and conditions" not in cleaned
+
+        cleaned = preprocessor.clean(sample_fail_document)
+        for value in ["The Wanderer", "Jan 1, 2026", "Dec 31, 2025", "-500"]:
+            assert value in cleaned
+        assert "Junior Analyst" not in cleaned
+        assert "Alex" not in cleaned
+
+
+class TestWindow:
+    """Tests for windowing long documents to a token budget."""
+
+    def test_short_document_unchanged(self):
+        text = "Policy Number: HM-1"
+        assert preprocessor.window(text) == text
+
+    def test_long_document_fits_budget_and_keeps_fields(self):
+        filler = ["Lorem ipsum dolor sit amet, consectetur adipiscing elit."] * 400
+        lines = filler[:200] + [
+            "Policy Number: HM-2025-10-A4B",
+            "Insured Value: $5,000,000",
+        ] + filler[200:]
+        small = DocumentPreprocessor(token_budget=200)
+
+        windowed = small.window("\n".join(lines))
+
+        assert estimate_tokens(windowed) <= 220
+        assert "HM-2025-10-A4B" in windowed
+        assert "$5,000,000" in windowed
+        assert WINDOW_GAP_MARKER in windowed
+
+    def test_single_long_paragraph_is_segmented(self):
+        filler = "Lorem ipsum dolor sit amet consectetur. " * 300
+        text = filler + "The vessel named 'MV Neptune' is covered. " + filler
+        small = DocumentPreprocessor(token_budget=100)
+
+        windowed = small.window(text)
+
+        assert "MV Neptune" in windowed
+        assert estimate_tokens(windowed) <= 110
+
+    def test_process_reduces_tokens(self, sample_fail_document):
+        processed = preprocessor.process(sample_fail_document)
+        assert estimate_tokens(processed) < estimate_tokens(sample_fail_document)
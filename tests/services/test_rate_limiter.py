@@ -0,0 +1,84 @@
+"""
+Unit tests for the upstream rate-limit scheduler.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.rate_limiter import RateLimitScheduler, TokenBucket
+from app.utils.exceptions import UpstreamRateLimitError
+
+
+class TestTokenBucket:
+    """Tests for per-minute token buckets."""
+
+    def test_unlimited_bucket_never_waits(self):
+        bucket = TokenBucket(0)
+        bucket.consume(10**6)
+        assert bucket.wait_time(10**6) == 0.0
+
+    def test_wait_time_after_burst(self):
+        bucket = TokenBucket(60)
+        bucket.consume(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_oversized_request_is_capped_to_capacity(self):
+        bucket = TokenBucket(60)
+        assert bucket.wait_time(1000) == 0.0
+
+
+class TestRateLimitScheduler:
+    """Tests for pacing, backpressure and retry-after handling."""
+
+    @pytest.mark.asyncio
+    async def test_paces_requests_per_minute(self):
+        scheduler = RateLimitScheduler(requests_per_minute=1200, tokens_per_minute=0, max_queue=100)
+        scheduler.requests.tokens = 0.0
+        started = time.monotonic()
+
+        await asyncio.gather(*(scheduler.acquire(1) for _ in range(4)))
+
+        assert time.monotonic() - started >= 0.15
+        assert scheduler.stats()["delayed"] == 4
+        assert scheduler.stats()["max_queue_depth"] == 4
+
+    @pytest.mark.asyncio
+    async def test_paces_tokens_per_minute(self):
+        scheduler = RateLimitScheduler(requests_per_minute=0, tokens_per_minute=60000, max_queue=100)
+        scheduler.tokens.tokens = 0.0
+        started = time.monotonic()
+
+        await scheduler.acquire(100)
+
+        assert time.monotonic() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        scheduler = RateLimitScheduler(requests_per_minute=60, tokens_per_minute=0, max_queue=1)
+        scheduler.requests.tokens = 0.0
+        waiter = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(UpstreamRateLimitError):
+            await scheduler.acquire(1)
+
+        waiter.cancel()
+        assert scheduler.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_penalize_pauses_admission(self):
+        scheduler = RateLimitScheduler(requests_per_minute=0, tokens_per_minute=0, max_queue=10)
+        scheduler.penalize(0.1)
+        started = time.monotonic()
+
+        await scheduler.acquire(1)
+
+        assert time.monotonic() - started >= 0.09
+        assert scheduler.stats()["throttled"] == 1
+
+    def test_settle_charges_actual_usage(self):
+        scheduler = RateLimitScheduler(requests_per_minute=0, tokens_per_minute=6000, max_queue=10)
+        scheduler.tokens.consume(500)
+        scheduler.settle(500, 1500)
+        assert scheduler.tokens.tokens == pytest.approx(4500, abs=5)
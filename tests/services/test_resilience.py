@@ -0,0 +1,80 @@
+"""
+Unit tests for upstream latency tracking and the circuit breaker.
+"""
+import time
+
+import pytest
+
+from app.services.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LatencyTracker, jittered_backoff
+from app.utils.exceptions import CircuitOpenError
+
+
+class TestLatencyTracker:
+    """Tests for rolling latency percentiles."""
+
+    def test_no_percentile_until_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record(0.1)
+        assert tracker.percentile(0.95) is None
+
+    def test_percentile(self):
+        tracker = LatencyTracker(min_samples=1)
+        for i in range(1, 101):
+            tracker.record(i / 100)
+        assert tracker.percentile(0.95) == pytest.approx(0.96)
+        assert tracker.stats()["samples"] == 100
+
+
+class TestJitteredBackoff:
+    """Tests for full-jitter exponential backoff."""
+
+    def test_bounds(self):
+        for attempt in range(10):
+            delay = jittered_backoff(attempt, 0.5, 4.0)
+            assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+        for _ in range(3):
+            breaker.check()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.check()
+        assert error.value.retry_after > 0
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.check()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.check()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.stats()["opened"] == 2
@@ -0,0 +1,75 @@
+"""
+Unit tests for the rule-based pre-extractor.
+"""
+from datetime import date
+
+from app.services.rule_extractor import RuleBasedExtractor, parse_amount, parse_date
+
+
+extractor = RuleBasedExtractor()
+
+
+class TestParsers:
+    """Tests for the date and amount parsers."""
+
+    def test_parse_iso_date(self):
+        assert parse_date("2025-11-01") == date(2025, 11, 1)
+
+    def test_parse_long_date(self):
+        assert parse_date("November 1st, 2025") == date(2025, 11, 1)
+        assert parse_date("Sept 3 2025") == date(2025, 9, 3)
+
+    def test_parse_day_first_date(self):
+        assert parse_date("31 December 2025") == date(2025, 12, 31)
+
+    def test_parse_invalid_date(self):
+        assert parse_date("February 30th, 2025") is None
+        assert parse_date("11/01/2025") is None
+
+    def test_parse_amounts(self):
+        assert parse_amount("$5,000,000") == 5000000
+        assert parse_amount("-$500") == -500
+        assert parse_amount("$2.5 million") == 2500000
+
+
+class TestRuleBasedExtractor:
+    """Tests for per-field extraction and confidence."""
+
+    def test_pass_document_fully_resolved(self, sample_pass_document):
+        result = extractor.extract(sample_pass_document)
+        assert result.data == {
+            "policy_number": "HM-2025-10-A4B",
+            "vessel_name": "MV Neptune",
+            "policy_start_date": "2025-11-01",
+            "policy_end_date": "2026-10-31",
+            "insured_value": 5000000
+        }
+        assert result.missing_fields(0.9) == []
+
+    def test_fail_document_missing_policy_number(self, sample_fail_document):
+        result = extractor.extract(sample_fail_document)
+        assert result.data["vessel_name"] == "The Wanderer"
+        assert result.data["insured_value"] == -500
+        assert "policy_number" in result.missing_fields(0.9)
+
+    def test_labeled_lines(self):
+        result = extractor.extract(
+            "Policy Number: HM-2025-10-A4B\nVessel: MV Neptune\n"
+            "Start Date: 2025-11-01\nEnd Date: 2026-10-31\nInsured Value: $5,000,000"
+        )
+        assert result.missing_fields(0.9) == []
+        assert result.data["vessel_name"] == "MV Neptune"
+
+    def test_conflicting_values_are_ambiguous(self):
+        result = extractor.extract("Policy Number: AB-1234. Later policy number: CD-5678.")
+        assert result.data["policy_number"] is None
+        assert 0 < result.confidence["policy_number"] < 0.9
+
+    def test_unlabeled_amount_has_low_confidence(self):
+        result = extractor.extract("The cover is worth $1,000,000 in total.")
+        assert result.data["insured_value"] == 1000000
+        assert result.confidence["insured_value"] < 0.9
+
+    def test_empty_document(self):
+        result = extractor.extract("")
+        assert len(result.missing_fields(0.9)) == 5
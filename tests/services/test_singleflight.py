@@ -0,0 +1,81 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+import asyncio
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for sharing one upstream call between identical callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"value": 1}
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == {"value": 1} for result in results)
+        assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            *(flight.do("key", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(flight.do("a", work), flight.do("b", work))
+        assert flight.stats()["executed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        flight = SingleFlight()
+
+        async def work():
+            return 1
+
+        await flight.do("key", work)
+        await flight.do("key", work)
+        assert flight.stats()["executed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that a disconnecting client leaves the shared call running."""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
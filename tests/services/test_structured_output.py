@@ -0,0 +1,52 @@
+"""
+Unit tests for the schema-derived structured output settings.
+"""
+import json
+
+from app.models.schemas import ExtractedData
+from app.services.structured_output import field_schema, max_output_tokens, system_prompt
+
+FIELDS = ["policy_number", "vessel_name", "policy_start_date", "policy_end_date", "insured_value"]
+
+
+class TestFieldSchema:
+    """Tests for the schema sent to the model."""
+
+    def test_requested_fields_only(self):
+        schema = field_schema(["vessel_name", "insured_value"])
+        assert list(schema["properties"]) == ["vessel_name", "insured_value"]
+        assert schema["required"] == ["vessel_name", "insured_value"]
+        assert schema["additionalProperties"] is False
+
+    def test_types_follow_extracted_data(self):
+        properties = field_schema(FIELDS)["properties"]
+        assert {"type": "string", "format": "date"} in properties["policy_start_date"]["anyOf"]
+        assert {"type": "integer"} in properties["insured_value"]["anyOf"]
+        assert "title" not in properties["vessel_name"]
+
+    def test_system_prompt_embeds_schema(self):
+        prompt = system_prompt("Extract.", ["vessel_name"])
+        assert prompt.startswith("Extract. ")
+        assert json.dumps(field_schema(["vessel_name"]), separators=(",", ":")) in prompt
+
+
+class TestMaxOutputTokens:
+    """Tests for the completion budget derived from the schema."""
+
+    def test_tighter_than_fixed_budget(self):
+        assert max_output_tokens(FIELDS) < 500
+
+    def test_scales_with_fields(self):
+        assert max_output_tokens(["insured_value"]) < max_output_tokens(FIELDS)
+
+    def test_fits_a_worst_case_answer(self):
+        """A pretty-printed answer with long values stays well inside the budget."""
+        data = ExtractedData(
+            policy_number="HM-2025-10-A4B-" + "9" * 20,
+            vessel_name="MV " + "Very Long Vessel Name " * 2,
+            policy_start_date="2025-11-01",
+            policy_end_date="2026-10-31",
+            insured_value=250_000_000_000,
+        )
+        text = json.dumps(data.model_dump(mode="json"), indent=2)
+        assert len(text) / 3 < max_output_tokens(FIELDS)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the vessel registry index.
+"""
+import random
+import string
+import time
+
+from app.services.vessel_index import (
+    VesselIndex,
+    bounded_levenshtein,
+    normalize_vessel_name,
+)
+
+
+VESSELS = ["MV Neptune", "Oceanic Voyager", "Starlight Carrier", "The Sea Serpent", "Ironclad Freighter"]
+
+
+def random_names(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).capitalize()
+            for _ in range(rng.randint(1, 3))
+        )
+        for _ in range(count)
+    ]
+
+
+class TestNormalization:
+    """Tests for vessel name normalization."""
+
+    def test_prefixes_and_punctuation(self):
+        for name in ["MV Neptune", "M/V Neptune", "m.v. neptune", "NEPTUNE", " Neptune. "]:
+            assert normalize_vessel_name(name) == "neptune"
+
+    def test_other_prefixes(self):
+        assert normalize_vessel_name("MT Ironclad") == "ironclad"
+        assert normalize_vessel_name("SS Sea-Serpent") == "sea serpent"
+
+    def test_names_starting_with_m_are_kept(self):
+        assert normalize_vessel_name("Mystic Dawn") == "mystic dawn"
+
+
+class TestBoundedLevenshtein:
+    """Tests for the bounded edit distance."""
+
+    def test_distance_within_bound(self):
+        assert bounded_levenshtein("neptune", "neptun", 2) == 1
+        assert bounded_levenshtein("voyager", "voyagre", 2) == 2
+
+    def test_distance_over_bound(self):
+        assert bounded_levenshtein("neptune", "carrier", 2) is None
+        assert bounded_levenshtein("a", "abcd", 2) is None
+
+
+class TestVesselIndex:
+    """Tests for exact and fuzzy lookups."""
+
+    def test_exact_match(self):
+        match = VesselIndex(VESSELS).lookup("m/v NEPTUNE")
+        assert match.exact
+        assert match.canonical == "MV Neptune"
+        assert match.score == 1.0
+
+    def test_fuzzy_suggestion(self):
+        match = VesselIndex(VESSELS).lookup("Oceanic Voyagr")
+        assert not match.exact
+        assert match.canonical == "Oceanic Voyager"
+        assert 0.9 < match.score < 1.0
+
+    def test_no_match(self):
+        match = VesselIndex(VESSELS).lookup("The Wanderer")
+        assert match.canonical is None
+        assert match.score == 0.0
+
+    def test_empty_name(self):
+        assert VesselIndex(VESSELS).lookup("  ").canonical is None
+
+    def test_registry_scale_lookups(self):
+        """Test that lookups stay fast with a large registry."""
+        names = random_names(100_000)
+        index = VesselIndex(names)
+        target = names[54321]
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            match = index.lookup(target.upper())
+        exact_elapsed = (time.perf_counter() - start) / 1000
+
+        start = time.perf_counter()
+        fuzzy = index.lookup(target[:-1])
+        fuzzy_elapsed = time.perf_counter() - start
+
+        assert match.canonical == target
+        assert fuzzy.canonical is not None
+        assert exact_elapsed < 0.001
+        assert fuzzy_elapsed < 0.1
@@ -0,0 +1,111 @@
+"""
+Unit tests for the hot-reloading vessel registry.
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.models import ExtractedData
+from app.services.validator import DocumentValidator
+from app.services.vessel_registry import EMPTY_VERSION, VesselRegistry
+
+
+def write_registry(path, names, mtime_offset=0):
+    path.write_text(json.dumps(names))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+class TestVesselRegistry:
+    """Tests for loading and swapping registry snapshots."""
+
+    def test_initial_load(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+
+        registry = VesselRegistry(path)
+
+        assert registry.snapshot.names == ["MV Neptune"]
+        assert registry.snapshot.version != EMPTY_VERSION
+
+    def test_missing_file(self, tmp_path):
+        registry = VesselRegistry(tmp_path / "missing.json")
+        assert registry.snapshot.names == []
+        assert registry.snapshot.version == EMPTY_VERSION
+
+    def test_reload_on_change(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        old = registry.snapshot
+
+        write_registry(path, ["MV Neptune", "The Wanderer"], mtime_offset=10**9)
+
+        assert registry.reload_if_changed()
+        assert registry.snapshot.version != old.version
+        assert registry.snapshot.index.lookup("the wanderer").exact
+        assert old.names == ["MV Neptune"]
+
+    def test_touch_without_content_change_keeps_version(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        old = registry.snapshot
+
+        write_registry(path, ["MV Neptune"], mtime_offset=10**9)
+
+        assert not registry.reload_if_changed()
+        assert registry.snapshot is old
+
+    def test_invalid_file_keeps_previous_snapshot(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        old = registry.snapshot
+
+        path.write_text("{not json")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+
+        assert not registry.reload_if_changed()
+        assert registry.snapshot is old
+
+    @pytest.mark.asyncio
+    async def test_background_reload(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+        registry = VesselRegistry(path)
+        loads = registry.loads
+        await registry.start(poll_seconds=0.01)
+        try:
+            write_registry(path, ["The Wanderer"], mtime_offset=10**9)
+            for _ in range(100):
+                if registry.loads > loads:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await registry.stop()
+
+        assert registry.snapshot.names == ["The Wanderer"]
+
+
+class TestValidatorSnapshots:
+    """Tests for consistent snapshots during validation."""
+
+    def test_validation_uses_given_snapshot(self, tmp_path):
+        path = tmp_path / "vessels.json"
+        write_registry(path, ["MV Neptune"])
+        validator = DocumentValidator(VesselRegistry(path))
+        snapshot = validator.snapshot()
+
+        write_registry(path, ["The Wanderer"], mtime_offset=10**9)
+        validator.registry.reload_if_changed()
+
+        results = validator.validate(ExtractedData(vessel_name="MV Neptune"), snapshot)
+        vessel = next(r for r in results if r.rule == "Vessel Name Match")
+        assert vessel.status == "PASS"
+
+        results = validator.validate(ExtractedData(vessel_name="MV Neptune"))
+        vessel = next(r for r in results if r.rule == "Vessel Name Match")
+        assert vessel.status == "FAIL"